@@ -1,6 +1,7 @@
 """Base classes for ACI tools."""
 
 import json
+import os
 import subprocess
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
@@ -11,6 +12,20 @@ from rich.console import Console
 
 console = Console()
 
+# Environment overrides that trim sf CLI cold start: no update/version checks
+# and no telemetry child process on each invocation
+SF_CLI_FAST_ENV = {
+    "SF_AUTOUPDATE_DISABLE": "true",
+    "SF_DISABLE_AUTOUPDATE": "true",
+    "SF_SKIP_NEW_VERSION_CHECK": "true",
+    "SF_DISABLE_TELEMETRY": "true",
+}
+
+
+def sf_cli_env() -> dict[str, str]:
+    """Get the environment to run the sf CLI with (user-set values win)."""
+    return {**SF_CLI_FAST_ENV, **os.environ}
+
 
 @dataclass
 class ACIToolResult:
@@ -82,6 +97,7 @@ class ACITool(ABC):
                 text=True,
                 cwd=cwd or self.project_dir,
                 timeout=600,  # 10 minute timeout
+                env=sf_cli_env(),
             )
 
             raw_output = result.stdout + result.stderr
@@ -17,7 +17,7 @@ class SFDeploy(ACITool):
 
     def execute(
         self,
-        source_path: str = "force-app",
+        source_path: str | Path = "force-app",
         wait_minutes: int = 10,
         ignore_warnings: bool = False,
         ignore_conflicts: bool = True,
@@ -28,7 +28,8 @@ class SFDeploy(ACITool):
         Deploy metadata to Salesforce.
 
         Args:
-            source_path: Path to source directory (default: force-app)
+            source_path: Path to source directory, relative to the project or
+                already resolved (default: force-app)
             wait_minutes: Minutes to wait for deployment (default: 10)
             ignore_warnings: Whether to ignore warnings (default: False)
             ignore_conflicts: Whether to ignore conflicts (default: True)
@@ -42,7 +43,7 @@ class SFDeploy(ACITool):
             "deploy",
             "start",
             "--source-dir",
-            source_path,
+            str(source_path),
             "--wait",
             str(wait_minutes),
         ]
@@ -5,7 +5,7 @@ from sf_agentbench.agents.claude import ClaudeAgent
 from sf_agentbench.agents.openai import OpenAIAgent
 from sf_agentbench.agents.gemini import GeminiAgent
 from sf_agentbench.agents.kimi import KimiAgent
-from sf_agentbench.config import AgentConfig, MODEL_REGISTRY, ModelProvider
+from sf_agentbench.config import AgentConfig, ModelProvider, get_model_registry
 
 
 def create_agent(config: AgentConfig, verbose: bool = False) -> BaseAgent:
@@ -19,11 +19,11 @@ def create_agent(config: AgentConfig, verbose: bool = False) -> BaseAgent:
     Returns:
         Configured agent instance
     """
-    model_meta = MODEL_REGISTRY.get_model(config.model)
+    model_meta = get_model_registry().get_model(config.model)
     
     # Determine provider from model metadata or config type
     if model_meta:
-        provider = model_meta["provider"]
+        provider = model_meta.provider
     else:
         # Fallback to config.type
         provider_map = {
@@ -41,7 +41,7 @@ def create_agent(config: AgentConfig, verbose: bool = False) -> BaseAgent:
     # Get API key env
     api_key_env = config.api_key_env
     if not api_key_env and model_meta:
-        api_key_env = model_meta.get("api_key_env")
+        api_key_env = model_meta.api_key_env
     
     # Create appropriate agent
     if provider == ModelProvider.ANTHROPIC:
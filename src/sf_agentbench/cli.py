@@ -1,6 +1,8 @@
 """Command-line interface for SF-AgentBench."""
 
 import json
+import selectors
+import sys
 from pathlib import Path
 
 import click
@@ -11,7 +13,7 @@ from sf_agentbench import __version__
 from sf_agentbench.config import (
     BenchmarkConfig,
     load_config,
-    MODEL_REGISTRY,
+    get_model_registry,
     ModelProvider,
     BUILTIN_MODELS,
 )
@@ -521,12 +523,6 @@ def list_tasks(ctx: click.Context) -> None:
     """List all available benchmark tasks."""
     config: BenchmarkConfig = ctx.obj["config"]
     loader = TaskLoader(config.tasks_dir)
-    tasks = loader.discover_tasks()
-
-    if not tasks:
-        console.print(f"[yellow]No tasks found in {config.tasks_dir}[/yellow]")
-        console.print("Run 'sf-agentbench init' to create sample tasks.")
-        return
 
     table = Table(title="Available Benchmark Tasks")
     table.add_column("ID", style="cyan")
@@ -535,7 +531,8 @@ def list_tasks(ctx: click.Context) -> None:
     table.add_column("Categories", style="blue")
     table.add_column("Time Limit")
 
-    for task in tasks:
+    count = 0
+    for task in loader.discover_tasks():
         # Handle both enum and string categories
         if task.categories:
             cat_list = [c.value if hasattr(c, 'value') else str(c) for c in task.categories]
@@ -549,9 +546,15 @@ def list_tasks(ctx: click.Context) -> None:
             categories,
             f"{task.time_limit_minutes}m",
         )
+        count += 1
+
+    if not count:
+        console.print(f"[yellow]No tasks found in {config.tasks_dir}[/yellow]")
+        console.print("Run 'sf-agentbench init' to create sample tasks.")
+        return
 
     console.print(table)
-    console.print(f"\nTotal: {len(tasks)} tasks")
+    console.print(f"\nTotal: {count} tasks")
 
 
 @main.command()
@@ -578,8 +581,8 @@ def show_task(ctx: click.Context, task_id: str) -> None:
         console.print(f"[bold]Categories:[/bold] {cats}")
 
     console.print(f"\n[bold]Description:[/bold]")
-    readme = loader.get_task_readme(task)
-    console.print(readme[:2000])  # Truncate long READMEs
+    readme = loader.get_task_readme(task, max_chars=2000)  # Truncate long READMEs
+    console.print(readme)
 
 
 @main.command()
@@ -603,7 +606,6 @@ def run(
     if no_cleanup:
         config.cleanup_orgs = False
 
-    harness = BenchmarkHarness(config)
     loader = TaskLoader(config.tasks_dir)
     task = loader.get_task(task_id)
 
@@ -611,6 +613,8 @@ def run(
         console.print(f"[red]Task not found: {task_id}[/red]")
         return
 
+    harness = BenchmarkHarness(config)
+
     # For manual runs, we'll use a placeholder agent callback
     # Real usage would integrate with Claude Code, Codex, etc.
     def manual_agent_callback(task, org_info, work_dir):
@@ -618,9 +622,9 @@ def run(
         console.print(f"Work directory: {work_dir}")
         console.print(f"Scratch Org: {org_info.username}")
         console.print(f"\nTask: {task.name}")
-        console.print(loader.get_task_readme(task)[:1000])
+        console.print(loader.get_task_readme(task, max_chars=1000))
         console.print("\n[bold]Complete the task in the scratch org, then press Enter...[/bold]")
-        input()
+        _wait_for_enter()
         return "Manual completion"
 
     result = harness.run_task(task, manual_agent_callback, agent)
@@ -646,6 +650,22 @@ def run_all(
     if devhub:
         config.devhub_username = devhub
 
+    # Make sure there is something to run before paying for harness setup
+    loader = TaskLoader(config.tasks_dir)
+    if tier:
+        try:
+            tier_enum = TaskTier(tier)
+        except ValueError:
+            console.print(f"[red]Unknown tier: {tier}[/red]")
+            return
+        has_tasks = any(t.tier == tier_enum for t in loader.iter_tasks())
+    else:
+        has_tasks = next(loader.iter_tasks(), None) is not None
+
+    if not has_tasks:
+        console.print(f"[yellow]No tasks found in {config.tasks_dir}[/yellow]")
+        return
+
     harness = BenchmarkHarness(config)
 
     # Placeholder callback - real implementation would use actual agent
@@ -706,7 +726,7 @@ def list_models(ctx: click.Context, provider: str | None) -> None:
     table.add_column("Context", style="dim")
     table.add_column("Active", style="magenta")
     
-    models = MODEL_REGISTRY.all_models
+    models = get_model_registry().all_models
     
     # Group by provider
     providers_order = [ModelProvider.ANTHROPIC, ModelProvider.OPENAI, ModelProvider.GOOGLE, ModelProvider.CUSTOM]
@@ -715,20 +735,20 @@ def list_models(ctx: click.Context, provider: str | None) -> None:
         if provider and p.value != provider:
             continue
             
-        provider_models = [(mid, meta) for mid, meta in models.items() if meta["provider"] == p]
+        provider_models = [(mid, meta) for mid, meta in models.items() if meta.provider == p]
         if not provider_models:
             continue
             
         for model_id, meta in sorted(provider_models):
             is_current = "✓" if model_id == current_model else ""
             style = "bold" if model_id == current_model else ""
-            ctx_size = f"{meta.get('context_window', 0) // 1000}K"
+            ctx_size = f"{meta.context_window // 1000}K"
             
             table.add_row(
                 f"[{style}]{model_id}[/{style}]" if style else model_id,
-                meta.get("name", "-"),
-                meta["provider"].value,
-                meta.get("api_key_env", "-") or "-",
+                meta.name or "-",
+                meta.provider.value,
+                meta.api_key_env or "-",
                 ctx_size,
                 is_current,
             )
@@ -1584,6 +1604,29 @@ def validate(ctx: click.Context) -> None:
         console.print("\n[green]All checks passed![/green]")
 
 
+def _wait_for_enter(heartbeat_seconds: float = 30.0) -> str:
+    """Wait for a line on stdin without blocking the process indefinitely.
+
+    Wakes up every ``heartbeat_seconds`` to print a keepalive so the user
+    can tell the harness is still alive. Falls back to ``input()`` where
+    stdin cannot be polled (e.g. Windows consoles or redirected streams).
+    """
+    sel = selectors.DefaultSelector()
+    try:
+        sel.register(sys.stdin, selectors.EVENT_READ)
+    except (ValueError, OSError):
+        sel.close()
+        return input()
+
+    try:
+        while True:
+            if sel.select(heartbeat_seconds):
+                return sys.stdin.readline()
+            console.print("[dim]...still waiting[/dim]")
+    finally:
+        sel.close()
+
+
 def _create_sample_tasks(tasks_dir: Path, force: bool = False) -> None:
     """Create sample benchmark tasks."""
     # Tier 1: Validation Rule + Flow
@@ -1,11 +1,17 @@
 """Configuration management for SF-AgentBench."""
 
+import os
+import threading
+from collections import ChainMap, defaultdict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from types import ModuleType
 from typing import Any
 from enum import Enum
 
-from pydantic import BaseModel, Field, model_validator
-import yaml
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
 
 # ============================================================================
@@ -21,155 +27,71 @@ class ModelProvider(str, Enum):
     CUSTOM = "custom"
 
 
+# Value -> member lookup so provider strings resolve without scanning the enum
+_PROVIDERS_BY_VALUE: dict[str, ModelProvider] = {p.value: p for p in ModelProvider}
+
+
+def _coerce_provider(provider: str) -> ModelProvider:
+    """Resolve a provider string, falling back to CUSTOM for unknown values."""
+    return _PROVIDERS_BY_VALUE.get(provider, ModelProvider.CUSTOM)
+
+
+@dataclass(slots=True, frozen=True)
+class ModelMeta:
+    """Metadata for a supported model."""
+
+    provider: ModelProvider
+    name: str
+    api_key_env: str | None
+    context_window: int
+    # Accepts a strict JSON Schema for its reply (RubricConfig.structured_output)
+    structured_output: bool = True
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            "provider": self.provider,
+            "name": self.name,
+            "api_key_env": self.api_key_env,
+            "context_window": self.context_window,
+            "structured_output": self.structured_output,
+        }
+
+
 # Built-in supported models with their metadata
-BUILTIN_MODELS: dict[str, dict[str, Any]] = {
+BUILTIN_MODELS: dict[str, ModelMeta] = {
     # Anthropic Claude models
-    "claude-opus-4-20250514": {
-        "provider": ModelProvider.ANTHROPIC,
-        "name": "Claude Opus 4",
-        "api_key_env": "ANTHROPIC_API_KEY",
-        "context_window": 200000,
-    },
-    "claude-sonnet-4-20250514": {
-        "provider": ModelProvider.ANTHROPIC,
-        "name": "Claude Sonnet 4",
-        "api_key_env": "ANTHROPIC_API_KEY",
-        "context_window": 200000,
-    },
+    "claude-opus-4-20250514": ModelMeta(ModelProvider.ANTHROPIC, "Claude Opus 4", "ANTHROPIC_API_KEY", 200000),
+    "claude-sonnet-4-20250514": ModelMeta(ModelProvider.ANTHROPIC, "Claude Sonnet 4", "ANTHROPIC_API_KEY", 200000),
     # Note: Claude 3.x models (claude-3-5-sonnet, claude-3-opus) have been
     # deprecated by Anthropic. Use Claude 4 models (claude-sonnet-4, claude-opus-4) instead.
     # OpenAI models
-    "gpt-4o": {
-        "provider": ModelProvider.OPENAI,
-        "name": "GPT-4o",
-        "api_key_env": "OPENAI_API_KEY",
-        "context_window": 128000,
-    },
-    "gpt-4o-mini": {
-        "provider": ModelProvider.OPENAI,
-        "name": "GPT-4o Mini",
-        "api_key_env": "OPENAI_API_KEY",
-        "context_window": 128000,
-    },
-    "gpt-4-turbo": {
-        "provider": ModelProvider.OPENAI,
-        "name": "GPT-4 Turbo",
-        "api_key_env": "OPENAI_API_KEY",
-        "context_window": 128000,
-    },
-    "o1": {
-        "provider": ModelProvider.OPENAI,
-        "name": "OpenAI o1",
-        "api_key_env": "OPENAI_API_KEY",
-        "context_window": 200000,
-    },
-    "o1-mini": {
-        "provider": ModelProvider.OPENAI,
-        "name": "OpenAI o1-mini",
-        "api_key_env": "OPENAI_API_KEY",
-        "context_window": 128000,
-    },
-    "o3-mini": {
-        "provider": ModelProvider.OPENAI,
-        "name": "OpenAI o3-mini",
-        "api_key_env": "OPENAI_API_KEY",
-        "context_window": 200000,
-    },
+    "gpt-4o": ModelMeta(ModelProvider.OPENAI, "GPT-4o", "OPENAI_API_KEY", 128000),
+    "gpt-4o-mini": ModelMeta(ModelProvider.OPENAI, "GPT-4o Mini", "OPENAI_API_KEY", 128000),
+    "gpt-4-turbo": ModelMeta(ModelProvider.OPENAI, "GPT-4 Turbo", "OPENAI_API_KEY", 128000, structured_output=False),
+    "o1": ModelMeta(ModelProvider.OPENAI, "OpenAI o1", "OPENAI_API_KEY", 200000),
+    "o1-mini": ModelMeta(ModelProvider.OPENAI, "OpenAI o1-mini", "OPENAI_API_KEY", 128000, structured_output=False),
+    "o3-mini": ModelMeta(ModelProvider.OPENAI, "OpenAI o3-mini", "OPENAI_API_KEY", 200000),
     # GPT-5 series
-    "gpt-5.2-very-high": {
-        "provider": ModelProvider.OPENAI,
-        "name": "GPT-5.2 Very High",
-        "api_key_env": "OPENAI_API_KEY",
-        "context_window": 256000,
-    },
-    "gpt-5.2": {
-        "provider": ModelProvider.OPENAI,
-        "name": "GPT-5.2",
-        "api_key_env": "OPENAI_API_KEY",
-        "context_window": 256000,
-    },
-    "gpt-5": {
-        "provider": ModelProvider.OPENAI,
-        "name": "GPT-5",
-        "api_key_env": "OPENAI_API_KEY",
-        "context_window": 256000,
-    },
+    "gpt-5.2-very-high": ModelMeta(ModelProvider.OPENAI, "GPT-5.2 Very High", "OPENAI_API_KEY", 256000),
+    "gpt-5.2": ModelMeta(ModelProvider.OPENAI, "GPT-5.2", "OPENAI_API_KEY", 256000),
+    "gpt-5": ModelMeta(ModelProvider.OPENAI, "GPT-5", "OPENAI_API_KEY", 256000),
     # Google Gemini models
-    "gemini-2.0-flash": {
-        "provider": ModelProvider.GOOGLE,
-        "name": "Gemini 2.0 Flash",
-        "api_key_env": "GOOGLE_API_KEY",
-        "context_window": 1000000,
-    },
-    "gemini-2.0-flash-thinking": {
-        "provider": ModelProvider.GOOGLE,
-        "name": "Gemini 2.0 Flash Thinking",
-        "api_key_env": "GOOGLE_API_KEY",
-        "context_window": 1000000,
-    },
-    "gemini-1.5-pro": {
-        "provider": ModelProvider.GOOGLE,
-        "name": "Gemini 1.5 Pro",
-        "api_key_env": "GOOGLE_API_KEY",
-        "context_window": 2000000,
-    },
-    "gemini-1.5-flash": {
-        "provider": ModelProvider.GOOGLE,
-        "name": "Gemini 1.5 Flash",
-        "api_key_env": "GOOGLE_API_KEY",
-        "context_window": 1000000,
-    },
+    "gemini-2.0-flash": ModelMeta(ModelProvider.GOOGLE, "Gemini 2.0 Flash", "GOOGLE_API_KEY", 1000000),
+    "gemini-2.0-flash-thinking": ModelMeta(ModelProvider.GOOGLE, "Gemini 2.0 Flash Thinking", "GOOGLE_API_KEY", 1000000),
+    "gemini-1.5-pro": ModelMeta(ModelProvider.GOOGLE, "Gemini 1.5 Pro", "GOOGLE_API_KEY", 2000000),
+    "gemini-1.5-flash": ModelMeta(ModelProvider.GOOGLE, "Gemini 1.5 Flash", "GOOGLE_API_KEY", 1000000),
     # Gemini 2.5 models
-    "gemini-2.5-pro": {
-        "provider": ModelProvider.GOOGLE,
-        "name": "Gemini 2.5 Pro",
-        "api_key_env": "GOOGLE_API_KEY",
-        "context_window": 1000000,
-    },
-    "gemini-2.5-flash": {
-        "provider": ModelProvider.GOOGLE,
-        "name": "Gemini 2.5 Flash",
-        "api_key_env": "GOOGLE_API_KEY",
-        "context_window": 1000000,
-    },
+    "gemini-2.5-pro": ModelMeta(ModelProvider.GOOGLE, "Gemini 2.5 Pro", "GOOGLE_API_KEY", 1000000),
+    "gemini-2.5-flash": ModelMeta(ModelProvider.GOOGLE, "Gemini 2.5 Flash", "GOOGLE_API_KEY", 1000000),
     # Gemini 3.0 models
-    "gemini-3.0-thinking": {
-        "provider": ModelProvider.GOOGLE,
-        "name": "Gemini 3.0 Thinking",
-        "api_key_env": "GOOGLE_API_KEY",
-        "context_window": 2000000,
-    },
-    "gemini-3.0-pro": {
-        "provider": ModelProvider.GOOGLE,
-        "name": "Gemini 3.0 Pro",
-        "api_key_env": "GOOGLE_API_KEY",
-        "context_window": 2000000,
-    },
-    "gemini-3-flash-preview": {
-        "provider": ModelProvider.GOOGLE,
-        "name": "Gemini 3 Flash Preview",
-        "api_key_env": "GOOGLE_API_KEY",
-        "context_window": 1000000,
-    },
+    "gemini-3.0-thinking": ModelMeta(ModelProvider.GOOGLE, "Gemini 3.0 Thinking", "GOOGLE_API_KEY", 2000000),
+    "gemini-3.0-pro": ModelMeta(ModelProvider.GOOGLE, "Gemini 3.0 Pro", "GOOGLE_API_KEY", 2000000),
+    "gemini-3-flash-preview": ModelMeta(ModelProvider.GOOGLE, "Gemini 3 Flash Preview", "GOOGLE_API_KEY", 1000000),
     # Kimi (Moonshot AI) models
-    "kimi-k2": {
-        "provider": ModelProvider.KIMI,
-        "name": "Kimi K2",
-        "api_key_env": "KIMI_API_KEY",
-        "context_window": 128000,
-    },
-    "kimi-k2-0905": {
-        "provider": ModelProvider.KIMI,
-        "name": "Kimi K2 (0905)",
-        "api_key_env": "KIMI_API_KEY",
-        "context_window": 128000,
-    },
-    "kimi-k2-thinking": {
-        "provider": ModelProvider.KIMI,
-        "name": "Kimi K2 Thinking",
-        "api_key_env": "KIMI_API_KEY",
-        "context_window": 128000,
-    },
+    "kimi-k2": ModelMeta(ModelProvider.KIMI, "Kimi K2", "KIMI_API_KEY", 128000),
+    "kimi-k2-0905": ModelMeta(ModelProvider.KIMI, "Kimi K2 (0905)", "KIMI_API_KEY", 128000),
+    "kimi-k2-thinking": ModelMeta(ModelProvider.KIMI, "Kimi K2 Thinking", "KIMI_API_KEY", 128000),
 }
 
 
@@ -178,17 +100,27 @@ class ModelRegistry:
     
     def __init__(self):
         self._models = dict(BUILTIN_MODELS)
-        self._custom_models: dict[str, dict[str, Any]] = {}
+        self._custom_models: dict[str, ModelMeta] = {}
+        # Live view over both maps; custom models shadow builtins
+        self._all = ChainMap(self._custom_models, self._models)
+        # Provider -> model IDs, kept in sync by add_custom_model
+        self._by_provider: dict[ModelProvider, list[str]] = defaultdict(list)
+        for model_id, meta in self._models.items():
+            self._by_provider[meta.provider].append(model_id)
     
     @property
-    def all_models(self) -> dict[str, dict[str, Any]]:
-        """Get all registered models (builtin + custom)."""
-        return {**self._models, **self._custom_models}
+    def all_models(self) -> Mapping[str, ModelMeta]:
+        """Get all registered models (builtin + custom).
+
+        This is a read-only view, not a copy; use ``dict(...)`` if a
+        snapshot is needed.
+        """
+        return self._all
     
     @property
     def model_ids(self) -> list[str]:
         """Get list of all model IDs."""
-        return list(self.all_models.keys())
+        return list(self._all)
     
     def add_custom_model(
         self,
@@ -199,36 +131,73 @@ class ModelRegistry:
         context_window: int = 128000,
     ) -> None:
         """Add a custom model to the registry."""
-        self._custom_models[model_id] = {
-            "provider": provider,
-            "name": name,
-            "api_key_env": api_key_env,
-            "context_window": context_window,
-        }
+        previous = self._all.get(model_id)
+        if previous is not None and previous.provider != provider:
+            self._by_provider[previous.provider].remove(model_id)
+        if previous is None or previous.provider != provider:
+            self._by_provider[provider].append(model_id)
+
+        self._custom_models[model_id] = ModelMeta(
+            provider=provider,
+            name=name,
+            api_key_env=api_key_env,
+            context_window=context_window,
+        )
+        _resolve_api_key_env.cache_clear()
     
-    def get_model(self, model_id: str) -> dict[str, Any] | None:
+    def get_model(self, model_id: str) -> ModelMeta | None:
         """Get model metadata by ID."""
-        return self.all_models.get(model_id)
+        return self._all.get(model_id)
     
     def is_valid(self, model_id: str) -> bool:
         """Check if a model ID is valid."""
-        return model_id in self.all_models
+        return model_id in self._all
     
     def list_by_provider(self, provider: ModelProvider) -> list[str]:
         """List all models for a given provider."""
-        return [
-            mid for mid, meta in self.all_models.items()
-            if meta["provider"] == provider
-        ]
+        return list(self._by_provider.get(provider, ()))
+
+
+# Global model registry instance, built on first access (see __getattr__)
+_registry: ModelRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the global model registry, creating it on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
+
 
+def __getattr__(name: str) -> Any:
+    # Keep ``from sf_agentbench.config import MODEL_REGISTRY`` working while
+    # deferring registry construction until something actually needs it.
+    if name == "MODEL_REGISTRY":
+        return get_model_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Global model registry instance
-MODEL_REGISTRY = ModelRegistry()
+
+def _yaml() -> ModuleType:
+    """Import yaml on demand; most CLI commands never read or write YAML."""
+    import yaml
+
+    return yaml
+
+
+@lru_cache(maxsize=128)
+def _resolve_api_key_env(model: str) -> str | None:
+    """Look up the API key env var for a model (cleared when models are added)."""
+    model_meta = get_model_registry().get_model(model)
+    return model_meta.api_key_env if model_meta else None
 
 
 def get_supported_models() -> list[str]:
     """Get list of all supported model IDs."""
-    return MODEL_REGISTRY.model_ids
+    return get_model_registry().model_ids
 
 
 def add_custom_model(
@@ -238,10 +207,10 @@ def add_custom_model(
     api_key_env: str | None = None,
 ) -> None:
     """Add a custom model to the registry."""
-    MODEL_REGISTRY.add_custom_model(
+    get_model_registry().add_custom_model(
         model_id=model_id,
         name=name,
-        provider=ModelProvider(provider) if provider in [p.value for p in ModelProvider] else ModelProvider.CUSTOM,
+        provider=_coerce_provider(provider),
         api_key_env=api_key_env,
     )
 
@@ -300,6 +269,31 @@ class RubricConfig(BaseModel):
     timeout_seconds: int = Field(default=120, description="API call timeout")
     fallback_to_heuristic: bool = Field(default=True, description="Use heuristic if LLM fails")
     provider: str = Field(default="auto", description="LLM provider: auto, anthropic, google, openai")
+    max_prompt_chars: int = Field(default=10000, description="Code characters sent to the judge")
+    chunk_tokens: int | None = Field(
+        default=None, description="Judge code over this many tokens in separate chunks"
+    )
+    max_concurrency: int = Field(default=8, description="Concurrent async judge requests")
+    fallback_models: list[str] = Field(
+        default_factory=list, description="Models to try, in order, when the judge model fails"
+    )
+    stream: bool = Field(
+        default=True, description="Stream judge replies, stopping once the verdict is complete"
+    )
+    structured_output: bool = Field(
+        default=True, description="Constrain judge replies to the verdict JSON Schema"
+    )
+    use_batch_api: bool = Field(
+        default=False, description="Judge evaluate_batch through the provider Batch API"
+    )
+    batch_poll_seconds: float = Field(default=30.0, description="Batch API status poll interval")
+    batch_timeout_seconds: float = Field(
+        default=3600.0, description="Cancel Batch API jobs still running after this long"
+    )
+    cache_enabled: bool = Field(default=False, description="Reuse verdicts for identical prompts")
+    cache_dir: Path | None = Field(
+        default=None, description="Verdict cache (default ~/.sf-agentbench/cache/rubric)"
+    )
 
 
 class CustomModelConfig(BaseModel):
@@ -348,22 +342,30 @@ class AgentConfig(BaseModel):
         description="Custom system prompt for the agent",
     )
     
+    _model_meta: tuple[str, ModelMeta | None] | None = PrivateAttr(default=None)
+    
     @model_validator(mode="after")
     def resolve_api_key_env(self) -> "AgentConfig":
         """Auto-detect API key env from model if not explicitly set."""
         if self.api_key_env is None:
-            model_meta = MODEL_REGISTRY.get_model(self.model)
-            if model_meta:
-                self.api_key_env = model_meta.get("api_key_env")
+            self.api_key_env = _resolve_api_key_env(self.model)
+        self._model_meta = (self.model, get_model_registry().get_model(self.model))
         return self
     
-    def get_model_info(self) -> dict[str, Any] | None:
+    def get_model_info(self) -> ModelMeta | None:
         """Get metadata for the configured model."""
-        return MODEL_REGISTRY.get_model(self.model)
+        # Only hits are reused: custom models may be registered after this
+        # config was validated, and ``model`` may be reassigned
+        cached = self._model_meta
+        if cached is not None and cached[0] == self.model and cached[1] is not None:
+            return cached[1]
+        model_meta = get_model_registry().get_model(self.model)
+        self._model_meta = (self.model, model_meta)
+        return model_meta
     
     def is_model_supported(self) -> bool:
         """Check if the configured model is in the registry."""
-        return MODEL_REGISTRY.is_valid(self.model)
+        return self.get_model_info() is not None
 
 
 class BenchmarkConfig(BaseModel):
@@ -397,6 +399,10 @@ class BenchmarkConfig(BaseModel):
 
     # Execution settings
     parallel_runs: int = Field(default=1, ge=1, le=10)
+    parallel_layers: bool = Field(
+        default=False,
+        description="Run static analysis, metadata diff and rubric layers concurrently",
+    )
     timeout_minutes: int = Field(default=60)
     cleanup_orgs: bool = Field(default=True, description="Delete scratch orgs after run")
 
@@ -408,10 +414,10 @@ class BenchmarkConfig(BaseModel):
     def register_custom_models(self) -> "BenchmarkConfig":
         """Register any custom models defined in the config."""
         for cm in self.custom_models:
-            MODEL_REGISTRY.add_custom_model(
+            get_model_registry().add_custom_model(
                 model_id=cm.id,
                 name=cm.name,
-                provider=ModelProvider(cm.provider) if cm.provider in [p.value for p in ModelProvider] else ModelProvider.CUSTOM,
+                provider=_coerce_provider(cm.provider),
                 api_key_env=cm.api_key_env,
                 context_window=cm.context_window,
             )
@@ -420,14 +426,19 @@ class BenchmarkConfig(BaseModel):
     @classmethod
     def from_yaml(cls, path: Path) -> "BenchmarkConfig":
         """Load configuration from a YAML file."""
-        with open(path) as f:
-            data = yaml.safe_load(f)
+        yaml = _yaml()
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        # Binary stream lets the (C) parser detect the encoding itself
+        with open(path, "rb") as f:
+            data = yaml.load(f, Loader=loader)
         return cls(**data)
 
     def to_yaml(self, path: Path) -> None:
         """Save configuration to a YAML file."""
+        yaml = _yaml()
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
         with open(path, "w") as f:
-            yaml.dump(self.model_dump(), f, default_flow_style=False)
+            yaml.dump(self.model_dump(mode="json"), f, Dumper=dumper, default_flow_style=False)
 
     @classmethod
     def default(cls) -> "BenchmarkConfig":
@@ -440,16 +451,23 @@ def load_config(config_path: Path | None = None) -> BenchmarkConfig:
     if config_path and config_path.exists():
         return BenchmarkConfig.from_yaml(config_path)
 
-    # Check for default config locations
-    default_paths = [
-        Path("sf-agentbench.yaml"),
-        Path("sf-agentbench.yml"),
-        Path(".sf-agentbench.yaml"),
-        Path(".sf-agentbench.yml"),
-    ]
-
-    for path in default_paths:
-        if path.exists():
-            return BenchmarkConfig.from_yaml(path)
+    # Check for default config locations (in priority order) with a single
+    # directory listing instead of one stat per candidate
+    default_names = (
+        "sf-agentbench.yaml",
+        "sf-agentbench.yml",
+        ".sf-agentbench.yaml",
+        ".sf-agentbench.yml",
+    )
+
+    try:
+        with os.scandir(".") as it:
+            present = {e.name for e in it if e.name in default_names and e.is_file()}
+    except OSError:
+        present = set()
+
+    for name in default_names:
+        if name in present:
+            return BenchmarkConfig.from_yaml(Path(name))
 
     return BenchmarkConfig.default()
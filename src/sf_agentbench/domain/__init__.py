@@ -12,6 +12,7 @@ from sf_agentbench.domain.models import (
     Agent,
     WorkUnit,
     WorkUnitStatus,
+    WorkQueue,
     Result,
     Cost,
     CostProfile,
@@ -28,6 +29,7 @@ __all__ = [
     "Agent",
     "WorkUnit",
     "WorkUnitStatus",
+    "WorkQueue",
     "Result",
     "Cost",
     "CostProfile",
@@ -3,34 +3,42 @@
 Provides unified cost tracking across all models and test types.
 """
 
-from dataclasses import dataclass, field
+import os
+from array import array
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
 from sf_agentbench.domain.models import Cost, CostProfile
 
 
 # Cost per 1M tokens (input/output) - pricing as of Jan 2026
-MODEL_COSTS: dict[str, CostProfile] = {
+_RAW_COSTS: tuple[tuple[str, float, float], ...] = (
     # Gemini models
-    "gemini-2.0-flash": CostProfile(input_cost_per_million=0.075, output_cost_per_million=0.30),
-    "gemini-2.5-pro": CostProfile(input_cost_per_million=1.25, output_cost_per_million=5.00),
-    "gemini-1.5-pro": CostProfile(input_cost_per_million=1.25, output_cost_per_million=5.00),
-    "gemini-1.5-flash": CostProfile(input_cost_per_million=0.075, output_cost_per_million=0.30),
+    ("gemini-2.0-flash", 0.075, 0.30),
+    ("gemini-2.5-pro", 1.25, 5.00),
+    ("gemini-1.5-pro", 1.25, 5.00),
+    ("gemini-1.5-flash", 0.075, 0.30),
     
     # Claude models
-    "sonnet": CostProfile(input_cost_per_million=3.00, output_cost_per_million=15.00),
-    "claude-sonnet-4": CostProfile(input_cost_per_million=3.00, output_cost_per_million=15.00),
-    "claude-sonnet-4-20250514": CostProfile(input_cost_per_million=3.00, output_cost_per_million=15.00),
-    "opus": CostProfile(input_cost_per_million=15.00, output_cost_per_million=75.00),
-    "claude-opus-4": CostProfile(input_cost_per_million=15.00, output_cost_per_million=75.00),
-    "claude-opus-4-20250514": CostProfile(input_cost_per_million=15.00, output_cost_per_million=75.00),
-    "haiku": CostProfile(input_cost_per_million=0.25, output_cost_per_million=1.25),
+    ("sonnet", 3.00, 15.00),
+    ("claude-sonnet-4", 3.00, 15.00),
+    ("claude-sonnet-4-20250514", 3.00, 15.00),
+    ("opus", 15.00, 75.00),
+    ("claude-opus-4", 15.00, 75.00),
+    ("claude-opus-4-20250514", 15.00, 75.00),
+    ("haiku", 0.25, 1.25),
     
     # OpenAI models
-    "gpt-4o": CostProfile(input_cost_per_million=2.50, output_cost_per_million=10.00),
-    "gpt-4o-mini": CostProfile(input_cost_per_million=0.15, output_cost_per_million=0.60),
-    "gpt-4-turbo": CostProfile(input_cost_per_million=10.00, output_cost_per_million=30.00),
+    ("gpt-4o", 2.50, 10.00),
+    ("gpt-4o-mini", 0.15, 0.60),
+    ("gpt-4-turbo", 10.00, 30.00),
+)
+
+MODEL_COSTS: dict[str, CostProfile] = {
+    model: CostProfile(input_cost_per_million=i, output_cost_per_million=o)
+    for model, i, o in _RAW_COSTS
 }
 
 # Default cost profile for unknown models
@@ -40,14 +48,44 @@ DEFAULT_COST_PROFILE = CostProfile(
 )
 
 
+@lru_cache(maxsize=256)
 def get_cost_profile(model: str) -> CostProfile:
-    """Get cost profile for a model, with fallback to default."""
+    """Get cost profile for a model, with fallback to default.
+
+    Lookups are memoized; call ``get_cost_profile.cache_clear()`` after
+    changing ``MODEL_COSTS`` at runtime.
+    """
     return MODEL_COSTS.get(model, DEFAULT_COST_PROFILE)
 
 
+# Opt-in exact token counts via tiktoken; the encoder is loaded on first use
+_USE_TIKTOKEN = os.environ.get("SF_AGENTBENCH_USE_TIKTOKEN") == "1"
+_tokenizer: Any = None
+
+
+def _get_tokenizer() -> Any:
+    global _tokenizer, _USE_TIKTOKEN
+    if _tokenizer is None:
+        try:
+            import tiktoken
+        except ImportError:
+            _USE_TIKTOKEN = False
+            return None
+        _tokenizer = tiktoken.get_encoding("cl100k_base")
+    return _tokenizer
+
+
 def estimate_tokens(text: str) -> int:
-    """Estimate token count from text (rough: 4 chars per token)."""
-    return len(text) // 4
+    """Estimate token count from text (rough: 4 chars per token).
+
+    Set ``SF_AGENTBENCH_USE_TIKTOKEN=1`` to count with tiktoken instead,
+    when it is installed.
+    """
+    if _USE_TIKTOKEN:
+        tokenizer = _get_tokenizer()
+        if tokenizer is not None:
+            return len(tokenizer.encode(text))
+    return len(text) >> 2
 
 
 def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
@@ -56,13 +94,23 @@ def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
     return profile.estimate(input_tokens, output_tokens)
 
 
-@dataclass
+@dataclass(slots=True)
 class CostTracker:
-    """Tracks costs across multiple operations."""
+    """Tracks costs across multiple operations.
+    
+    Entries are stored column-wise in flat arrays; ``Cost`` objects are only
+    built when ``costs`` is read.
+    """
     
     model: str
-    costs: list[Cost] = field(default_factory=list)
     _profile: CostProfile | None = None
+    _input_tokens: array = field(default_factory=lambda: array("q"), init=False, repr=False)
+    _output_tokens: array = field(default_factory=lambda: array("q"), init=False, repr=False)
+    _usd: array = field(default_factory=lambda: array("d"), init=False, repr=False)
+    # Running totals, updated by add()
+    _sum_input: int = field(default=0, init=False, repr=False)
+    _sum_output: int = field(default=0, init=False, repr=False)
+    _sum_usd: float = field(default=0.0, init=False, repr=False)
     
     def __post_init__(self):
         self._profile = get_cost_profile(self.model)
@@ -73,46 +121,60 @@ class CostTracker:
         output_tokens: int = 0,
         input_text: str | None = None,
         output_text: str | None = None,
-    ) -> Cost:
-        """Add a cost entry from tokens or text."""
+    ) -> float:
+        """Add a cost entry from tokens or text.
+        
+        Returns:
+            Estimated cost of the entry in USD
+        """
+        # Inline the 4-chars-per-token heuristic unless tiktoken is enabled
         if input_text:
-            input_tokens = estimate_tokens(input_text)
+            input_tokens = estimate_tokens(input_text) if _USE_TIKTOKEN else len(input_text) >> 2
         if output_text:
-            output_tokens = estimate_tokens(output_text)
+            output_tokens = estimate_tokens(output_text) if _USE_TIKTOKEN else len(output_text) >> 2
         
         estimated_usd = self._profile.estimate(input_tokens, output_tokens)
         
-        cost = Cost(
-            input_tokens=input_tokens,
-            output_tokens=output_tokens,
-            estimated_usd=estimated_usd,
-        )
-        self.costs.append(cost)
-        return cost
+        self._input_tokens.append(input_tokens)
+        self._output_tokens.append(output_tokens)
+        self._usd.append(estimated_usd)
+        self._sum_input += input_tokens
+        self._sum_output += output_tokens
+        self._sum_usd += estimated_usd
+        return estimated_usd
+    
+    @property
+    def costs(self) -> list[Cost]:
+        """Get individual cost entries."""
+        return [
+            Cost(input_tokens=i, output_tokens=o, estimated_usd=u)
+            for i, o, u in zip(self._input_tokens, self._output_tokens, self._usd)
+        ]
     
     @property
     def total(self) -> Cost:
         """Get total cost across all entries."""
-        total = Cost()
-        for cost in self.costs:
-            total = total.add(cost)
-        return total
+        return Cost(
+            input_tokens=self._sum_input,
+            output_tokens=self._sum_output,
+            estimated_usd=self._sum_usd,
+        )
     
     @property
     def total_input_tokens(self) -> int:
-        return sum(c.input_tokens for c in self.costs)
+        return self._sum_input
     
     @property
     def total_output_tokens(self) -> int:
-        return sum(c.output_tokens for c in self.costs)
+        return self._sum_output
     
     @property
     def total_usd(self) -> float:
-        return sum(c.estimated_usd for c in self.costs)
+        return self._sum_usd
     
     @property
     def entry_count(self) -> int:
-        return len(self.costs)
+        return len(self._usd)
     
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -125,26 +187,29 @@ class CostTracker:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class CostSummary:
     """Summary of costs across multiple models."""
     
     by_model: dict[str, Cost] = field(default_factory=dict)
     started_at: datetime = field(default_factory=datetime.utcnow)
+    _total: Cost = field(default_factory=Cost, init=False, repr=False)
+    
+    def __post_init__(self):
+        for cost in self.by_model.values():
+            self._total = self._total.add(cost)
     
     def add(self, model: str, cost: Cost) -> None:
         """Add a cost entry for a model."""
         if model not in self.by_model:
             self.by_model[model] = Cost()
         self.by_model[model] = self.by_model[model].add(cost)
+        self._total = self._total.add(cost)
     
     @property
     def total(self) -> Cost:
         """Get total cost across all models."""
-        total = Cost()
-        for cost in self.by_model.values():
-            total = total.add(cost)
-        return total
+        return replace(self._total)
     
     @property
     def total_usd(self) -> float:
@@ -152,11 +217,10 @@ class CostSummary:
     
     def format_breakdown(self) -> str:
         """Format a breakdown of costs by model."""
-        lines = ["Cost Breakdown:"]
-        for model, cost in sorted(self.by_model.items(), key=lambda x: -x[1].estimated_usd):
-            lines.append(
-                f"  {model}: ${cost.estimated_usd:.4f} "
-                f"({cost.input_tokens:,} in / {cost.output_tokens:,} out)"
-            )
-        lines.append(f"  Total: ${self.total_usd:.4f}")
-        return "\n".join(lines)
+        items = sorted(self.by_model.items(), key=lambda x: -x[1].estimated_usd)
+        body = "".join(
+            f"  {model}: ${cost.estimated_usd:.4f} "
+            f"({cost.input_tokens:,} in / {cost.output_tokens:,} out)\n"
+            for model, cost in items
+        )
+        return f"Cost Breakdown:\n{body}  Total: ${self._total.estimated_usd:.4f}"
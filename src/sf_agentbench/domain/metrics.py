@@ -3,21 +3,63 @@
 Provides unified metrics tracking for latency, throughput, and accuracy.
 """
 
+from bisect import insort
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
-import statistics
+import math
 
 
-@dataclass
+@dataclass(slots=True)
 class LatencyMetrics:
     """Latency measurements for operations."""
     
     samples: list[float] = field(default_factory=list)
+    # Samples kept in ascending order as they arrive, so order statistics
+    # never need a sort at read time, plus a running total and Welford
+    # mean/M2 so stdev stays accurate when samples share a large offset
+    _sorted: list[float] = field(init=False, repr=False, compare=False)
+    _sum: float = field(default=0.0, init=False, repr=False, compare=False)
+    _mean: float = field(default=0.0, init=False, repr=False, compare=False)
+    _m2: float = field(default=0.0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._resync()
     
     def add(self, duration_seconds: float) -> None:
         """Add a latency sample."""
+        self._ordered()
+        insort(self._sorted, duration_seconds)
+        self._sum += duration_seconds
         self.samples.append(duration_seconds)
+        self._welford(duration_seconds, len(self.samples))
+    
+    def _resync(self) -> None:
+        self._sorted = sorted(self.samples)
+        self._sum = sum(self.samples)
+        self._mean = self._m2 = 0.0
+        for n, x in enumerate(self.samples, 1):
+            self._welford(x, n)
+    
+    def _welford(self, x: float, n: int) -> None:
+        """Fold the ``n``-th sample into the running mean and M2."""
+        delta = x - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (x - self._mean)
+    
+    def _ordered(self) -> list[float]:
+        """Get the samples in ascending order."""
+        # Resync if ``samples`` was modified directly
+        if len(self._sorted) != len(self.samples):
+            self._resync()
+        return self._sorted
+    
+    def _percentile(self, fraction: float) -> float:
+        if not self.samples:
+            return 0.0
+        sorted_samples = self._ordered()
+        idx = int(len(sorted_samples) * fraction)
+        return sorted_samples[min(idx, len(sorted_samples) - 1)]
     
     @property
     def count(self) -> int:
@@ -25,55 +67,54 @@ class LatencyMetrics:
     
     @property
     def total(self) -> float:
-        return sum(self.samples)
+        self._ordered()
+        return self._sum
     
     @property
     def mean(self) -> float:
         if not self.samples:
             return 0.0
-        return statistics.mean(self.samples)
+        return self.total / len(self.samples)
     
     @property
     def median(self) -> float:
         if not self.samples:
             return 0.0
-        return statistics.median(self.samples)
+        sorted_samples = self._ordered()
+        mid = len(sorted_samples) // 2
+        if len(sorted_samples) % 2:
+            return sorted_samples[mid]
+        return (sorted_samples[mid - 1] + sorted_samples[mid]) / 2
     
     @property
     def min(self) -> float:
         if not self.samples:
             return 0.0
-        return min(self.samples)
+        return self._ordered()[0]
     
     @property
     def max(self) -> float:
         if not self.samples:
             return 0.0
-        return max(self.samples)
+        return self._ordered()[-1]
     
     @property
     def stdev(self) -> float:
-        if len(self.samples) < 2:
+        n = len(self.samples)
+        if n < 2:
             return 0.0
-        return statistics.stdev(self.samples)
+        self._ordered()
+        return math.sqrt(self._m2 / (n - 1))
     
     @property
     def p95(self) -> float:
         """95th percentile latency."""
-        if not self.samples:
-            return 0.0
-        sorted_samples = sorted(self.samples)
-        idx = int(len(sorted_samples) * 0.95)
-        return sorted_samples[min(idx, len(sorted_samples) - 1)]
+        return self._percentile(0.95)
     
     @property
     def p99(self) -> float:
         """99th percentile latency."""
-        if not self.samples:
-            return 0.0
-        sorted_samples = sorted(self.samples)
-        idx = int(len(sorted_samples) * 0.99)
-        return sorted_samples[min(idx, len(sorted_samples) - 1)]
+        return self._percentile(0.99)
     
     def to_dict(self) -> dict[str, float]:
         return {
@@ -89,7 +130,7 @@ class LatencyMetrics:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AccuracyMetrics:
     """Accuracy measurements for test results."""
     
@@ -135,7 +176,7 @@ class AccuracyMetrics:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ThroughputMetrics:
     """Throughput measurements."""
     
@@ -167,7 +208,7 @@ class ThroughputMetrics:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Comprehensive performance metrics for a benchmark run."""
     
@@ -206,31 +247,30 @@ class PerformanceMetrics:
         self.latency.add(duration)
         
         # Update accuracy
-        if correct:
-            self.accuracy.add_correct()
-        else:
-            self.accuracy.add_incorrect()
+        self._bump(self.accuracy, correct)
         
         # Update throughput
         self.throughput.add(1, duration)
         
-        # Update domain breakdown
+        # Update domain and tier breakdowns
         if domain:
-            if domain not in self.by_domain:
-                self.by_domain[domain] = AccuracyMetrics()
-            if correct:
-                self.by_domain[domain].add_correct()
-            else:
-                self.by_domain[domain].add_incorrect()
-        
-        # Update tier breakdown
+            self._bump_bucket(self.by_domain, domain, correct)
         if tier:
-            if tier not in self.by_tier:
-                self.by_tier[tier] = AccuracyMetrics()
-            if correct:
-                self.by_tier[tier].add_correct()
-            else:
-                self.by_tier[tier].add_incorrect()
+            self._bump_bucket(self.by_tier, tier, correct)
+    
+    @staticmethod
+    def _bump(metrics: AccuracyMetrics, correct: bool) -> None:
+        if correct:
+            metrics.correct += 1
+        else:
+            metrics.incorrect += 1
+    
+    @classmethod
+    def _bump_bucket(cls, bucket: dict[str, AccuracyMetrics], key: str, correct: bool) -> None:
+        metrics = bucket.get(key)
+        if metrics is None:
+            metrics = bucket[key] = AccuracyMetrics()
+        cls._bump(metrics, correct)
     
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -257,9 +297,9 @@ class PerformanceMetrics:
         
         if self.by_domain:
             lines.append("  By Domain:")
-            for domain, metrics in sorted(self.by_domain.items()):
-                lines.append(
-                    f"    {domain}: {metrics.correct}/{metrics.total} ({metrics.accuracy_percent:.1f}%)"
-                )
+            lines.extend(
+                f"    {domain}: {metrics.correct}/{metrics.total} ({metrics.accuracy_percent:.1f}%)"
+                for domain, metrics in sorted(self.by_domain.items())
+            )
         
         return "\n".join(lines)
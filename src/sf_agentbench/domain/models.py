@@ -3,12 +3,18 @@
 Defines the unified domain model for benchmarks, tests, agents, and results.
 """
 
+from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
+from functools import lru_cache
+from itertools import count
 from pathlib import Path
-from typing import Any
-import uuid
+from typing import Any, Iterable, Iterator
+import heapq
+import secrets
+import sys
+import time
 
 
 class TestType(str, Enum):
@@ -32,7 +38,30 @@ class WorkUnitStatus(str, Enum):
     TIMEOUT = "timeout"  # Exceeded time limit
 
 
-@dataclass
+# States a work unit never leaves
+TERMINAL_STATUSES = frozenset({
+    WorkUnitStatus.COMPLETED,
+    WorkUnitStatus.FAILED,
+    WorkUnitStatus.CANCELLED,
+    WorkUnitStatus.TIMEOUT,
+})
+
+
+@lru_cache(maxsize=4096)
+def timestamp_to_iso(ts: float) -> str:
+    """Format an epoch timestamp as a naive UTC ISO string."""
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def iso_to_timestamp(value: str) -> float:
+    """Parse an ISO string written by ``timestamp_to_iso`` (naive = UTC)."""
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+@dataclass(slots=True)
 class CostProfile:
     """Cost profile for a model (per 1M tokens)."""
     
@@ -46,7 +75,7 @@ class CostProfile:
         return input_cost + output_cost
 
 
-@dataclass
+@dataclass(slots=True)
 class Cost:
     """Cost tracking for a single execution."""
     
@@ -65,9 +94,25 @@ class Cost:
             output_tokens=self.output_tokens + other.output_tokens,
             estimated_usd=self.estimated_usd + other.estimated_usd,
         )
+    
+    def iadd(self, other: "Cost") -> None:
+        """Add another cost to this one in place."""
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.estimated_usd += other.estimated_usd
+
+
+@lru_cache(maxsize=None)
+def _make_display_name(cli_id: str, model: str) -> str:
+    return sys.intern(f"{cli_id}/{model}")
+
 
+@lru_cache(maxsize=None)
+def _make_agent_id(cli_id: str, model: str) -> str:
+    return sys.intern(f"{cli_id}-{model}")
 
-@dataclass
+
+@dataclass(slots=True)
 class Agent:
     """An AI agent configuration for benchmarking."""
     
@@ -79,19 +124,19 @@ class Agent:
     
     def __post_init__(self):
         if not self.display_name:
-            self.display_name = f"{self.cli_id}/{self.model}"
+            self.display_name = _make_display_name(self.cli_id, self.model)
     
     @classmethod
     def from_cli(cls, cli_id: str, model: str) -> "Agent":
         """Create an agent from CLI and model."""
         return cls(
-            id=f"{cli_id}-{model}",
+            id=_make_agent_id(cli_id, model),
             cli_id=cli_id,
             model=model,
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Test:
     """Base class for all test types."""
     
@@ -103,10 +148,10 @@ class Test:
     
     def __post_init__(self):
         if not self.id:
-            self.id = str(uuid.uuid4())[:12]
+            self.id = secrets.token_hex(6)
 
 
-@dataclass
+@dataclass(slots=True)
 class QATest(Test):
     """A Q&A knowledge test."""
     
@@ -116,14 +161,15 @@ class QATest(Test):
     
     def __post_init__(self):
         self.type = TestType.QA
-        super().__post_init__()
+        # Explicit base call: zero-arg super() breaks in slotted dataclasses
+        Test.__post_init__(self)
     
     @property
     def question_count(self) -> int:
         return len(self.questions)
 
 
-@dataclass
+@dataclass(slots=True)
 class CodingTest(Test):
     """A Salesforce coding task test."""
     
@@ -134,10 +180,10 @@ class CodingTest(Test):
     
     def __post_init__(self):
         self.type = TestType.CODING
-        super().__post_init__()
+        Test.__post_init__(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Benchmark:
     """A versioned collection of tests."""
     
@@ -146,30 +192,50 @@ class Benchmark:
     version: str = "1.0.0"
     description: str = ""
     tests: list[Test] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: float = field(default_factory=time.time)  # epoch seconds
+    _by_type: dict[TestType, list[Test]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _bucketed: int = field(default=0, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if not self.id:
-            self.id = str(uuid.uuid4())[:12]
+            self.id = secrets.token_hex(6)
+        self._resync()
+    
+    def _resync(self) -> None:
+        self._by_type = defaultdict(list)
+        for test in self.tests:
+            self._by_type[test.type].append(test)
+        self._bucketed = len(self.tests)
+    
+    def _buckets(self) -> dict[TestType, list[Test]]:
+        """Get the tests bucketed by type."""
+        # Resync if ``tests`` was modified directly
+        if self._bucketed != len(self.tests):
+            self._resync()
+        return self._by_type
     
     def add_test(self, test: Test) -> None:
         """Add a test to the benchmark."""
+        self._buckets()[test.type].append(test)
         self.tests.append(test)
+        self._bucketed += 1
     
     def get_tests_by_type(self, test_type: TestType) -> list[Test]:
         """Get all tests of a specific type."""
-        return [t for t in self.tests if t.type == test_type]
+        return list(self._buckets().get(test_type, ()))
     
     @property
     def qa_tests(self) -> list[QATest]:
-        return [t for t in self.tests if isinstance(t, QATest)]
+        return self.get_tests_by_type(TestType.QA)
     
     @property
     def coding_tests(self) -> list[CodingTest]:
-        return [t for t in self.tests if isinstance(t, CodingTest)]
+        return self.get_tests_by_type(TestType.CODING)
 
 
-@dataclass
+@dataclass(slots=True)
 class Result:
     """Result from executing a work unit."""
     
@@ -201,7 +267,26 @@ class Result:
         return self.error is None and self.score > 0
 
 
-@dataclass
+# Serialized field order shared by WorkUnit.to_dict and WorkUnit.to_records
+WORK_UNIT_COLUMNS = (
+    "id",
+    "test_id",
+    "test_type",
+    "agent_id",
+    "status",
+    "created_at",
+    "started_at",
+    "completed_at",
+    "duration_seconds",
+    "score",
+    "error",
+    "scratch_org",
+    "priority",
+    "retry_count",
+)
+
+
+@dataclass(slots=True)
 class WorkUnit:
     """A single unit of work: one test executed by one agent."""
     
@@ -211,10 +296,10 @@ class WorkUnit:
     status: WorkUnitStatus = WorkUnitStatus.PENDING
     result: Result | None = None
     
-    # Timing
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    started_at: datetime | None = None
-    completed_at: datetime | None = None
+    # Timing (epoch seconds; see timestamp_to_iso for display)
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    completed_at: float | None = None
     
     # Execution context
     scratch_org: str | None = None
@@ -227,23 +312,23 @@ class WorkUnit:
     
     def __post_init__(self):
         if not self.id:
-            self.id = str(uuid.uuid4())[:12]
+            self.id = secrets.token_hex(6)
     
     def start(self) -> None:
         """Mark work unit as started."""
         self.status = WorkUnitStatus.RUNNING
-        self.started_at = datetime.utcnow()
+        self.started_at = time.time()
     
     def complete(self, result: Result) -> None:
         """Mark work unit as completed."""
         self.status = WorkUnitStatus.COMPLETED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = time.time()
         self.result = result
     
     def fail(self, error: str) -> None:
         """Mark work unit as failed."""
         self.status = WorkUnitStatus.FAILED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = time.time()
         if self.result is None:
             self.result = Result()
         self.result.error = error
@@ -260,27 +345,22 @@ class WorkUnit:
     
     def cancel(self) -> None:
         """Cancel the work unit."""
-        if self.status in (WorkUnitStatus.PENDING, WorkUnitStatus.RUNNING, WorkUnitStatus.PAUSED):
+        if self.status not in TERMINAL_STATUSES:
             self.status = WorkUnitStatus.CANCELLED
-            self.completed_at = datetime.utcnow()
+            self.completed_at = time.time()
     
     @property
     def duration_seconds(self) -> float:
         """Calculate duration in seconds."""
         if self.started_at is None:
             return 0.0
-        end = self.completed_at or datetime.utcnow()
-        return (end - self.started_at).total_seconds()
+        end = self.completed_at if self.completed_at is not None else time.time()
+        return end - self.started_at
     
     @property
     def is_terminal(self) -> bool:
         """Check if work unit is in a terminal state."""
-        return self.status in (
-            WorkUnitStatus.COMPLETED,
-            WorkUnitStatus.FAILED,
-            WorkUnitStatus.CANCELLED,
-            WorkUnitStatus.TIMEOUT,
-        )
+        return self.status in TERMINAL_STATUSES
     
     def can_retry(self) -> bool:
         """Check if work unit can be retried."""
@@ -289,21 +369,89 @@ class WorkUnit:
             and self.retry_count < self.max_retries
         )
     
+    def _row(self) -> tuple:
+        """Get the serialized values in ``WORK_UNIT_COLUMNS`` order."""
+        result = self.result
+        return (
+            self.id,
+            self.test.id,
+            self.test.type.value,
+            self.agent.id,
+            self.status.value,
+            timestamp_to_iso(self.created_at),
+            timestamp_to_iso(self.started_at) if self.started_at else None,
+            timestamp_to_iso(self.completed_at) if self.completed_at else None,
+            self.duration_seconds,
+            result.score if result else None,
+            result.error if result else None,
+            self.scratch_org,
+            self.priority,
+            self.retry_count,
+        )
+    
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization."""
+        return dict(zip(WORK_UNIT_COLUMNS, self._row()))
+    
+    @staticmethod
+    def to_records(work_units: Iterable["WorkUnit"]) -> dict[str, list]:
+        """Serialize many work units column-wise (one list per field)."""
+        rows = [unit._row() for unit in work_units]
+        if not rows:
+            return {column: [] for column in WORK_UNIT_COLUMNS}
         return {
-            "id": self.id,
-            "test_id": self.test.id,
-            "test_type": self.test.type.value,
-            "agent_id": self.agent.id,
-            "status": self.status.value,
-            "created_at": self.created_at.isoformat(),
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
-            "duration_seconds": self.duration_seconds,
-            "score": self.result.score if self.result else None,
-            "error": self.result.error if self.result else None,
-            "scratch_org": self.scratch_org,
-            "priority": self.priority,
-            "retry_count": self.retry_count,
+            column: list(values)
+            for column, values in zip(WORK_UNIT_COLUMNS, zip(*rows))
         }
+    
+    @staticmethod
+    def cost_totals(work_units: Iterable["WorkUnit"]) -> Cost:
+        """Total the result costs of many work units in one pass."""
+        input_tokens = output_tokens = 0
+        usd = 0.0
+        for unit in work_units:
+            if unit.result is not None:
+                cost = unit.result.cost
+                input_tokens += cost.input_tokens
+                output_tokens += cost.output_tokens
+                usd += cost.estimated_usd
+        return Cost(input_tokens, output_tokens, usd)
+
+
+class WorkQueue:
+    """Priority queue of work units.
+    
+    Higher ``priority`` pops first; equal priorities pop in insertion order.
+    Priority is read when a unit is pushed.
+    """
+    
+    def __init__(self, work_units: Iterable[WorkUnit] = (), counter: Iterator[int] | None = None):
+        """Initialize the queue.
+        
+        Args:
+            work_units: Work units to enqueue
+            counter: Insertion sequence, shared by queues whose heads are compared
+        """
+        self._heap: list[tuple[int, int, WorkUnit]] = []
+        self._counter = counter if counter is not None else count()
+        for work_unit in work_units:
+            self.push(work_unit)
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def push(self, work_unit: WorkUnit) -> None:
+        """Add a work unit."""
+        heapq.heappush(self._heap, (-work_unit.priority, next(self._counter), work_unit))
+    
+    def pop(self) -> WorkUnit:
+        """Remove and return the highest-priority work unit."""
+        return heapq.heappop(self._heap)[2]
+    
+    def peek(self) -> WorkUnit:
+        """Return the highest-priority work unit without removing it."""
+        return self._heap[0][2]
+    
+    def head_key(self) -> tuple[int, int]:
+        """Get the ordering key of the head unit (lower pops first)."""
+        return self._heap[0][:2]
@@ -1,14 +1,28 @@
 """Layer 1: Deployment Validation Evaluator."""
 
+import asyncio
+import os
+import re
 import subprocess
-import json
+import threading
 import time
+from itertools import islice
 from pathlib import Path
-from typing import Any
 
 from rich.console import Console
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # optional speedup; stdlib json also accepts bytes
+    from json import loads as _json_loads
+
+try:
+    import ijson
+except ImportError:  # optional; without it the report is read to EOF
+    ijson = None
+
 from sf_agentbench.aci import SFDeploy
+from sf_agentbench.aci.base import ACIToolResult, sf_cli_env
 from sf_agentbench.models import (
     DeploymentResult,
     DeploymentStatus,
@@ -28,6 +42,83 @@ TRANSIENT_ERROR_PATTERNS = [
     "socket hang up",
 ]
 
+# All transient patterns folded into one case-insensitive scan
+TRANSIENT_ERROR_RE = re.compile(
+    "|".join(re.escape(p) for p in TRANSIENT_ERROR_PATTERNS), re.IGNORECASE
+)
+
+# Seconds a positive deployment status check stays valid
+STATUS_CACHE_TTL_SECONDS = 60.0
+
+# Lines in raw sf output that describe a failure
+_ERROR_LINE_RE = re.compile("error|failed", re.IGNORECASE)
+
+# Timeout for the ``sf project deploy report`` status check
+STATUS_CHECK_TIMEOUT_SECONDS = 30.0
+
+# (target_org, work_dir, latest force-app mtime) -> time the deployment was confirmed.
+# Only confirmed deployments are cached; a negative result is always re-checked.
+_STATUS_CACHE: dict[tuple[str, str, int], float] = {}
+
+
+def _latest_mtime_ns(root: str) -> int:
+    """Get the most recent mtime of ``root`` or anything below it."""
+    try:
+        latest = os.stat(root).st_mtime_ns
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    latest = max(latest, _latest_mtime_ns(entry.path))
+                else:
+                    latest = max(latest, entry.stat(follow_symlinks=False).st_mtime_ns)
+    except OSError:
+        return 0
+    return latest
+
+
+def _error_messages(result: ACIToolResult) -> list[str]:
+    """Get the messages of a failed deployment's errors."""
+    return [str(e.get("message", "")) for e in result.errors]
+
+
+def _read_report_status(cmd: list[str], cwd: Path) -> str:
+    """Run an ``sf ... --json`` report and return its ``result.status``.
+
+    With ijson installed the output is parsed as it streams and the process
+    is stopped as soon as the status is known. Returns "" when the command
+    failed or reported no status.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        cwd=cwd,
+        env=sf_cli_env(),
+    )
+    watchdog = threading.Timer(STATUS_CHECK_TIMEOUT_SECONDS, proc.kill)
+    watchdog.start()
+    try:
+        if ijson is None:
+            stdout = proc.stdout.read()
+            if proc.wait() != 0:
+                return ""
+            return (_json_loads(stdout).get("result") or {}).get("status", "")
+        
+        # sf writes the top-level exit status ahead of the result payload
+        exit_status = None
+        for prefix, event, value in ijson.parse(proc.stdout):
+            if prefix == "status" and event == "number":
+                exit_status = value
+            elif prefix == "result.status" and event == "string":
+                return value if exit_status == 0 else ""
+        return ""
+    finally:
+        watchdog.cancel()
+        if proc.poll() is None:
+            proc.terminate()
+        proc.stdout.close()
+        proc.wait()
+
 
 class DeploymentEvaluator:
     """Evaluates whether agent's solution can be successfully deployed."""
@@ -48,25 +139,33 @@ class DeploymentEvaluator:
         self.skip_if_deployed = skip_if_deployed
         self.max_retries = max_retries
 
+    def _status_cache_key(self, work_dir: Path) -> tuple[str, str, int]:
+        return (
+            self.target_org or "",
+            str(work_dir),
+            _latest_mtime_ns(str(work_dir / "force-app")),
+        )
+
     def _check_deployment_status(self, work_dir: Path) -> bool:
         """Check if metadata is already deployed by verifying org has the components."""
         if not self.target_org:
             return False
         
+        # Reuse a recent confirmation if the source has not changed since
+        key = self._status_cache_key(work_dir)
+        confirmed_at = _STATUS_CACHE.get(key)
+        if confirmed_at is not None and time.monotonic() - confirmed_at < STATUS_CACHE_TTL_SECONDS:
+            return True
+        
         try:
             # Quick check - list deployed source to see if components exist
-            result = subprocess.run(
+            status = _read_report_status(
                 [self.sf_cli_path, "project", "deploy", "report", "--json"],
-                capture_output=True,
-                text=True,
-                cwd=work_dir,
-                timeout=30,
+                work_dir,
             )
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                status = data.get("result", {}).get("status", "")
-                if status in ["Succeeded", "SucceededPartial"]:
-                    return True
+            if status in ["Succeeded", "SucceededPartial"]:
+                _STATUS_CACHE[key] = time.monotonic()
+                return True
         except Exception:
             pass
         
@@ -74,12 +173,7 @@ class DeploymentEvaluator:
 
     def _is_transient_error(self, error_msgs: list[str]) -> bool:
         """Check if errors are transient SF CLI issues."""
-        for msg in error_msgs:
-            msg_lower = msg.lower()
-            for pattern in TRANSIENT_ERROR_PATTERNS:
-                if pattern.lower() in msg_lower:
-                    return True
-        return False
+        return any(TRANSIENT_ERROR_RE.search(msg) for msg in error_msgs)
 
     def evaluate(self, task: Task, work_dir: Path) -> tuple[DeploymentResult, float]:
         """
@@ -96,50 +190,102 @@ class DeploymentEvaluator:
 
         # Check if already deployed (skip redundant re-deployment)
         if self.skip_if_deployed and self._check_deployment_status(work_dir):
-            console.print("    [green]✓ Deployment already verified[/green]")
-            return DeploymentResult(
-                status=DeploymentStatus.SUCCESS,
-                deployed_count=1,
-                failed_count=0,
-                errors=[],
-                duration_seconds=0.0,
-            ), 1.0
+            return self._already_deployed()
+
+        deployer, source_path = self._make_deployer(work_dir)
+        result = None
+        
+        # Retry loop with exponential backoff for transient errors
+        for attempt in range(self.max_retries):
+            result = self._deploy(deployer, source_path)
+            wait_time = self._retry_delay(attempt, result)
+            if wait_time is None:
+                break
+            time.sleep(wait_time)
+
+        return self._finish(result, work_dir)
 
+    async def evaluate_async(self, task: Task, work_dir: Path) -> tuple[DeploymentResult, float]:
+        """
+        Evaluate deployment without blocking the event loop.
+
+        Same as ``evaluate``, but sf CLI calls run in worker threads and the
+        retry backoff is an ``asyncio.sleep``, so deployments to several orgs
+        can be awaited together.
+
+        Args:
+            task: The benchmark task
+            work_dir: Working directory with agent's solution
+
+        Returns:
+            Tuple of (DeploymentResult, score)
+        """
+        console.print("  [dim]Layer 1: Deployment Validation[/dim]")
+
+        if self.skip_if_deployed and await asyncio.to_thread(
+            self._check_deployment_status, work_dir
+        ):
+            return self._already_deployed()
+
+        deployer, source_path = self._make_deployer(work_dir)
+        result = None
+        
+        for attempt in range(self.max_retries):
+            result = await asyncio.to_thread(self._deploy, deployer, source_path)
+            wait_time = self._retry_delay(attempt, result)
+            if wait_time is None:
+                break
+            await asyncio.sleep(wait_time)
+
+        return self._finish(result, work_dir)
+
+    def _already_deployed(self) -> tuple[DeploymentResult, float]:
+        console.print("    [green]✓ Deployment already verified[/green]")
+        return DeploymentResult(
+            status=DeploymentStatus.SUCCESS,
+            deployed_count=1,
+            failed_count=0,
+            errors=[],
+            duration_seconds=0.0,
+        ), 1.0
+
+    def _make_deployer(self, work_dir: Path) -> tuple[SFDeploy, Path]:
         deployer = SFDeploy(
             sf_cli_path=self.sf_cli_path,
             target_org=self.target_org,
             project_dir=work_dir,
             verbose=self.verbose,
         )
+        # Resolve once; retries deploy the same unchanged source tree
+        return deployer, (work_dir / "force-app").resolve()
 
-        result = None
-        last_error_msgs = []
+    def _deploy(self, deployer: SFDeploy, source_path: Path) -> ACIToolResult:
+        return deployer.execute(
+            source_path=source_path,
+            wait_minutes=10,
+            ignore_warnings=True,  # More lenient
+            ignore_conflicts=True,
+        )
+
+    def _retry_delay(self, attempt: int, result: ACIToolResult) -> int | None:
+        """Get the backoff before the next attempt, or None to stop retrying."""
+        if result.success:
+            return None
         
-        # Retry loop with exponential backoff for transient errors
-        for attempt in range(self.max_retries):
-            result = deployer.execute(
-                source_path="force-app",
-                wait_minutes=10,
-                ignore_warnings=True,  # More lenient
-                ignore_conflicts=True,
-            )
-            
-            if result.success:
-                break
-            
-            # Check for transient errors
-            last_error_msgs = [str(e.get("message", "")) for e in result.errors]
-            
-            if self._is_transient_error(last_error_msgs):
-                if attempt < self.max_retries - 1:
-                    wait_time = (attempt + 1) * 2  # 2s, 4s, 6s
-                    console.print(f"    [yellow]⟳ Transient error, retrying in {wait_time}s...[/yellow]")
-                    time.sleep(wait_time)
-                    continue
-            else:
-                # Real deployment error, don't retry
-                break
+        # Real deployment errors are not retried
+        if not self._is_transient_error(_error_messages(result)):
+            return None
+        if attempt >= self.max_retries - 1:
+            return None
+        
+        wait_time = (attempt + 1) * 2  # 2s, 4s, 6s
+        console.print(f"    [yellow]⟳ Transient error, retrying in {wait_time}s...[/yellow]")
+        return wait_time
 
+    def _finish(
+        self, result: ACIToolResult | None, work_dir: Path
+    ) -> tuple[DeploymentResult, float]:
+        """Build the evaluation from the last deployment attempt."""
         if result and result.success:
             deployment = DeploymentResult(
                 status=DeploymentStatus.SUCCESS,
@@ -150,9 +296,11 @@ class DeploymentEvaluator:
             )
             score = 1.0
             console.print("    [green]✓ Deployment successful[/green]")
+            if self.target_org:
+                _STATUS_CACHE[self._status_cache_key(work_dir)] = time.monotonic()
         else:
             # Check if it's still a transient error after all retries
-            if self._is_transient_error(last_error_msgs):
+            if result and self._is_transient_error(_error_messages(result)):
                 # Assume deployment is OK if it's just a transient CLI bug
                 console.print("    [yellow]⚠ SF CLI transient error, assuming deployment OK[/yellow]")
                 return DeploymentResult(
@@ -167,39 +315,46 @@ class DeploymentEvaluator:
             if result:
                 # Handle both structured errors and raw error messages
                 if result.errors:
+                    # Failed deploys often repeat the same error per component;
+                    # share one DeploymentError per distinct error
+                    seen: dict[tuple, DeploymentError] = {}
                     for e in result.errors:
                         if isinstance(e, dict):
-                            errors.append(
-                                DeploymentError(
-                                    component_type=e.get("component_type", "Unknown"),
-                                    component_name=e.get("component_name", "Unknown"),
-                                    line=e.get("line"),
-                                    column=e.get("column"),
-                                    message=e.get("message", str(e)),
-                                    error_code=e.get("error_code"),
-                                )
+                            key = (
+                                e.get("component_type", "Unknown"),
+                                e.get("component_name", "Unknown"),
+                                e.get("line"),
+                                e.get("column"),
+                                e.get("message", str(e)),
+                                e.get("error_code"),
                             )
                         else:
                             # Handle string errors
-                            errors.append(
-                                DeploymentError(
-                                    component_type="Unknown",
-                                    component_name="Unknown",
-                                    message=str(e),
-                                )
+                            key = ("Unknown", "Unknown", None, None, str(e), None)
+                        error = seen.get(key)
+                        if error is None:
+                            error = seen[key] = DeploymentError(
+                                component_type=key[0],
+                                component_name=key[1],
+                                line=key[2],
+                                column=key[3],
+                                message=key[4],
+                                error_code=key[5],
                             )
+                        errors.append(error)
 
                 # If no errors but deployment failed, check raw output for clues
                 if not errors and result.raw_output:
                     # Extract error info from raw output
-                    raw_lower = result.raw_output.lower()
-                    if "error" in raw_lower or "failed" in raw_lower:
+                    if _ERROR_LINE_RE.search(result.raw_output):
                         # Try to extract meaningful error from raw output
-                        error_lines = [
-                            line.strip() for line in result.raw_output.split('\n')
-                            if 'error' in line.lower() or 'failed' in line.lower()
-                        ]
-                        error_msg = error_lines[0] if error_lines else "Deployment failed (check raw output)"
+                        error_msg = next(
+                            (
+                                line.strip() for line in result.raw_output.split('\n')
+                                if _ERROR_LINE_RE.search(line)
+                            ),
+                            "Deployment failed (check raw output)",
+                        )
                         errors.append(
                             DeploymentError(
                                 component_type="Unknown",
@@ -220,8 +375,17 @@ class DeploymentEvaluator:
             console.print(f"    [red]✗ Deployment failed ({error_count} errors)[/red]")
 
             if self.verbose:
-                for error in errors[:5]:
-                    console.print(f"      [dim]{error.component_name}: {error.message}[/dim]")
+                if errors:
+                    # One render for all lines; messages are printed literally
+                    console.print(
+                        "\n".join(
+                            f"      {error.component_name}: {error.message}"
+                            for error in islice(errors, 5)
+                        ),
+                        style="dim",
+                        markup=False,
+                        highlight=False,
+                    )
                 # Also show raw output excerpt if no structured errors
                 if not errors and result and result.raw_output:
                     console.print(f"      [dim]Raw output: {result.raw_output[:200]}...[/dim]")
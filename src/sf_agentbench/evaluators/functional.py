@@ -1,6 +1,7 @@
 """Layer 2: Functional Testing Evaluator."""
 
 from pathlib import Path
+from typing import Any
 
 from rich.console import Console
 
@@ -14,6 +15,22 @@ from sf_agentbench.models import (
 
 console = Console()
 
+# Runner outcomes are lowercased ("pass", "fail", "compilefail", ...)
+_STATUS = {s.value: s for s in TestStatus}
+
+
+def _test_method_fields(t: dict[str, Any]) -> dict[str, Any]:
+    """Get TestMethodResult fields from one normalized runner record."""
+    return {
+        "class_name": t.get("class_name", "Unknown"),
+        "method_name": t.get("method_name", "Unknown"),
+        # Anything that is not a pass or skip (e.g. a compile failure) failed
+        "status": _STATUS.get(t.get("status", "fail"), TestStatus.FAIL),
+        "message": t.get("message"),
+        "stack_trace": t.get("stack_trace"),
+        "duration_ms": float(t.get("duration_ms") or 0),
+    }
+
 
 class FunctionalTestEvaluator:
     """Evaluates agent's solution using Apex tests."""
@@ -24,11 +41,15 @@ class FunctionalTestEvaluator:
         target_org: str | None = None,
         project_dir: Path | None = None,
         verbose: bool = False,
+        trust_runner_output: bool = True,
     ):
         self.sf_cli_path = sf_cli_path
         self.target_org = target_org
         self.project_dir = project_dir
         self.verbose = verbose
+        # SFRunApexTests already normalizes its records, so by default they
+        # are not re-validated one model at a time
+        self.trust_runner_output = trust_runner_output
 
     def evaluate(self, task: Task, work_dir: Path) -> tuple[ApexTestResult, float]:
         """
@@ -64,17 +85,12 @@ class FunctionalTestEvaluator:
 
         if result.success and result.data:
             data = result.data
-            test_results = [
-                TestMethodResult(
-                    class_name=t.get("class_name", "Unknown"),
-                    method_name=t.get("method_name", "Unknown"),
-                    status=TestStatus(t.get("status", "fail")),
-                    message=t.get("message"),
-                    stack_trace=t.get("stack_trace"),
-                    duration_ms=t.get("duration_ms", 0),
-                )
-                for t in data.get("test_results", [])
-            ]
+            make = (
+                TestMethodResult.model_construct
+                if self.trust_runner_output
+                else TestMethodResult
+            )
+            test_results = [make(**_test_method_fields(t)) for t in data.get("test_results", [])]
 
             apex_result = ApexTestResult(
                 total_tests=data.get("total_tests", 0),
@@ -109,7 +125,11 @@ class FunctionalTestEvaluator:
             console.print("    [red]✗ Test execution failed[/red]")
 
             if self.verbose and result.errors:
-                for error in result.errors[:3]:
-                    console.print(f"      [dim]{error}[/dim]")
+                console.print(
+                    "\n".join(f"      {error}" for error in result.errors[:3]),
+                    style="dim",
+                    markup=False,
+                    highlight=False,
+                )
 
         return apex_result, score
@@ -1,17 +1,59 @@
 """Layer 4: Metadata Configuration Diffing Evaluator."""
 
+import hashlib
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from itertools import zip_longest
 from pathlib import Path
 from typing import Any
 
-from deepdiff import DeepDiff
 from lxml import etree
 from rich.console import Console
 
+try:
+    from xxhash import xxh3_128_digest as _raw_hash
+except ImportError:  # optional speedup
+    def _raw_hash(data: bytes) -> bytes:
+        return hashlib.blake2b(data, digest_size=16).digest()
+
 from sf_agentbench.aci import SFRetrieve
 from sf_agentbench.models import MetadataDiffResult, Task
 
 console = Console()
 
+# Cap on reported differences per file
+MAX_DIFFS_PER_FILE = 50
+
+# Below this many common files a thread pool costs more than it saves
+PARALLEL_COMPARE_MIN_FILES = 64
+
+# Pairs at least this large (combined bytes) are parsed on two threads
+PARALLEL_PARSE_MIN_BYTES = 256 * 1024
+
+# Metadata XML needs no DTDs, entities or network access; comments and
+# blank text carry no configuration
+_PARSER_OPTIONS = dict(
+    remove_blank_text=True,
+    remove_comments=True,
+    resolve_entities=False,
+    no_network=True,
+    huge_tree=False,
+    collect_ids=False,
+)
+
+# lxml parsers must not be shared between threads
+_parsers = threading.local()
+
+# Pool for parsing the second file of a pair concurrently, created on first use
+_parse_pool_executor: ThreadPoolExecutor | None = None
+_parse_pool_lock = threading.Lock()
+
+_XMLNS_RE = re.compile(rb'\s+xmlns(?::[\w.-]+)?="[^"]*"')
+
 
 class MetadataDiffEvaluator:
     """Evaluates metadata configuration against expected golden state."""
@@ -78,8 +120,11 @@ class MetadataDiffEvaluator:
 
             if self.verbose and diff_result.missing_components:
                 console.print("      [dim]Missing:[/dim]")
-                for comp in diff_result.missing_components[:5]:
-                    console.print(f"        - {comp}")
+                console.print(
+                    "\n".join(f"        - {comp}" for comp in diff_result.missing_components[:5]),
+                    markup=False,
+                    highlight=False,
+                )
 
         return diff_result, diff_result.accuracy_score
 
@@ -91,9 +136,16 @@ class MetadataDiffEvaluator:
         extra = []
         differences: dict[str, Any] = {}
 
-        # Get all expected metadata files
-        expected_files = self._get_metadata_files(expected_path)
-        actual_files = self._get_metadata_files(actual_path)
+        # Get expected and actual metadata files, walking both trees at once
+        # when both are directories; otherwise one side needs no walk at all
+        if expected_path.is_dir() and actual_path.is_dir():
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                expected_future = pool.submit(_get_metadata_files, expected_path)
+                actual_files = _get_metadata_files(actual_path)
+                expected_files = expected_future.result()
+        else:
+            expected_files = _get_metadata_files(expected_path)
+            actual_files = _get_metadata_files(actual_path)
 
         expected_names = set(expected_files.keys())
         actual_names = set(actual_files.keys())
@@ -103,19 +155,24 @@ class MetadataDiffEvaluator:
         extra = list(actual_names - expected_names)
 
         # Compare common files
-        common = expected_names & actual_names
+        common = list(expected_names & actual_names)
+        pairs = [(expected_files[name], actual_files[name]) for name in common]
         match_count = 0
 
-        for name in common:
-            expected_file = expected_files[name]
-            actual_file = actual_files[name]
+        if len(pairs) >= PARALLEL_COMPARE_MIN_FILES:
+            # Each pair is independent and lxml releases the GIL while it
+            # parses; threads (unlike forked processes) are safe to start from
+            # the pipeline's layer threads and share the digest caches
+            with ThreadPoolExecutor(thread_name_prefix="xml-compare") as pool:
+                results = list(pool.map(_compare_one, pairs))
+        else:
+            results = [_compare_one(pair) for pair in pairs]
 
-            if self._compare_xml_files(expected_file, actual_file):
+        for name, diff in zip(common, results):
+            if diff is None:
                 match_count += 1
-            else:
-                diff = self._get_xml_diff(expected_file, actual_file)
-                if diff:
-                    differences[name] = diff
+            elif diff:
+                differences[name] = diff
 
         # Calculate accuracy
         total_expected = len(expected_names)
@@ -134,102 +191,247 @@ class MetadataDiffEvaluator:
             differences=differences,
         )
 
-    def _get_metadata_files(self, path: Path) -> dict[str, Path]:
-        """Get all metadata XML files from a path."""
-        files = {}
-        if path.is_file():
-            files[path.name] = path
-        else:
-            for f in path.rglob("*-meta.xml"):
-                relative = f.relative_to(path)
-                files[str(relative)] = f
-            for f in path.rglob("*.xml"):
-                if "-meta.xml" not in f.name:
-                    relative = f.relative_to(path)
-                    files[str(relative)] = f
-        return files
-
-    def _compare_xml_files(self, expected: Path, actual: Path) -> bool:
-        """Compare two XML files semantically."""
-        try:
-            expected_tree = etree.parse(str(expected))
-            actual_tree = etree.parse(str(actual))
-
-            # Normalize and compare
-            expected_str = etree.tostring(
-                expected_tree, pretty_print=True, encoding="unicode"
-            )
-            actual_str = etree.tostring(
-                actual_tree, pretty_print=True, encoding="unicode"
-            )
 
-            # Remove whitespace differences
-            expected_normalized = self._normalize_xml(expected_str)
-            actual_normalized = self._normalize_xml(actual_str)
-
-            return expected_normalized == actual_normalized
-
-        except Exception:
-            # Fall back to text comparison
-            return expected.read_text() == actual.read_text()
-
-    def _normalize_xml(self, xml_str: str) -> str:
-        """Normalize XML string for comparison."""
-        # Remove xmlns declarations (they often vary)
-        import re
-        normalized = re.sub(r'\s*xmlns[^"]*"[^"]*"', "", xml_str)
-        # Normalize whitespace
-        normalized = re.sub(r"\s+", " ", normalized)
-        return normalized.strip()
-
-    def _get_xml_diff(self, expected: Path, actual: Path) -> dict[str, Any]:
-        """Get differences between two XML files."""
-        try:
-            expected_dict = self._xml_to_dict(expected)
-            actual_dict = self._xml_to_dict(actual)
-
-            diff = DeepDiff(expected_dict, actual_dict, ignore_order=True)
-            return dict(diff) if diff else {}
-
-        except Exception as e:
-            return {"error": str(e)}
-
-    def _xml_to_dict(self, path: Path) -> dict[str, Any]:
-        """Convert XML file to dictionary for comparison."""
-        tree = etree.parse(str(path))
-        root = tree.getroot()
-        return self._element_to_dict(root)
-
-    def _element_to_dict(self, element: Any) -> dict[str, Any]:
-        """Convert lxml element to dictionary."""
-        result: dict[str, Any] = {}
-
-        # Get tag without namespace
-        tag = element.tag.split("}")[-1] if "}" in element.tag else element.tag
-        result["_tag"] = tag
-
-        # Add attributes
-        if element.attrib:
-            result["_attrs"] = dict(element.attrib)
-
-        # Add text content
-        if element.text and element.text.strip():
-            result["_text"] = element.text.strip()
-
-        # Add children
-        children: dict[str, Any] = {}
-        for child in element:
-            child_dict = self._element_to_dict(child)
-            child_tag = child_dict["_tag"]
-
-            if child_tag in children:
-                if not isinstance(children[child_tag], list):
-                    children[child_tag] = [children[child_tag]]
-                children[child_tag].append(child_dict)
-            else:
-                children[child_tag] = child_dict
-
-        if children:
-            result["_children"] = children
-
-        return result
+def _get_metadata_files(path: Path) -> dict[str, Path]:
+    """Get all metadata XML files from a path, keyed by relative path."""
+    files: dict[str, Path] = {}
+    if path.is_file():
+        files[path.name] = path
+    else:
+        _walk_xml_files(str(path), "", files)
+    return files
+
+
+def _walk_xml_files(root: str, prefix: str, files: dict[str, Path]) -> None:
+    """Collect ``*.xml`` files below ``root`` with a single ``os.scandir`` pass."""
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return
+
+    for entry in entries:
+        relative = prefix + entry.name
+        # Like Path.rglob, do not descend into directory symlinks (they may loop)
+        if entry.is_dir(follow_symlinks=False):
+            _walk_xml_files(entry.path, relative + os.sep, files)
+        elif entry.name.endswith(".xml"):
+            files[relative] = Path(entry.path)
+
+
+def _compare_one(pair: tuple[Path, Path]) -> dict[str, Any] | None:
+    """Compare one expected/actual file pair.
+
+    Returns None when the files match, otherwise their (possibly empty) diff.
+    Runs on the comparison thread pool when there are many files.
+    """
+    expected, actual = pair
+    if _compare_xml_files(expected, actual):
+        return None
+    return _get_xml_diff(expected, actual)
+
+
+def _compare_xml_files(expected: Path, actual: Path) -> bool:
+    """Compare two XML files semantically."""
+    expected_key, actual_key = _file_key(expected), _file_key(actual)
+    # Byte-identical files (the common case for a matching retrieve) need no parsing
+    if expected_key[2] == actual_key[2] and _raw_digest(*expected_key) == _raw_digest(*actual_key):
+        return True
+    try:
+        # Cheap early exit on the first differing element; equality is then
+        # confirmed (and memoized) by the canonical digest
+        if not _xml_equal_streaming(_read_bytes(*expected_key), _read_bytes(*actual_key)):
+            return False
+        if expected_key[2] + actual_key[2] >= PARALLEL_PARSE_MIN_BYTES:
+            # lxml releases the GIL while parsing, so both files parse at once
+            future = _parse_pool().submit(_canon_digest_cached, *expected_key)
+            return _canon_digest_cached(*actual_key) == future.result()
+        return _canon_digest_cached(*expected_key) == _canon_digest_cached(*actual_key)
+    except Exception:
+        # Fall back to text comparison
+        return expected.read_text() == actual.read_text()
+
+
+def _xml_equal_streaming(expected: bytes, actual: bytes) -> bool:
+    """Walk two XML documents in lockstep, stopping at the first difference.
+
+    Compares local tag names, attributes and stripped text, and is never
+    stricter than the canonical digest. Elements are cleared once compared,
+    so memory stays bounded for large files.
+    """
+    pairs = zip_longest(
+        etree.iterparse(BytesIO(expected), events=("end",), **_PARSER_OPTIONS),
+        etree.iterparse(BytesIO(actual), events=("end",), **_PARSER_OPTIONS),
+    )
+    for left, right in pairs:
+        if left is None or right is None:
+            return False
+        a, b = left[1], right[1]
+        if (
+            etree.QName(a).localname != etree.QName(b).localname
+            or _local_attrib(a) != _local_attrib(b)
+            or (a.text or "").strip() != (b.text or "").strip()
+        ):
+            return False
+        a.clear()
+        b.clear()
+    return True
+
+
+def _local_attrib(element: Any) -> dict[str, str]:
+    if not element.attrib:
+        return {}
+    return {etree.QName(k).localname: v for k, v in element.attrib.items()}
+
+
+def _file_key(path: Path) -> tuple[str, int, int]:
+    """Cache key that changes whenever the file is rewritten."""
+    st = os.stat(path)
+    return str(path), st.st_mtime_ns, st.st_size
+
+
+@lru_cache(maxsize=128)
+def _read_bytes(path: str, mtime_ns: int, size: int) -> bytes:
+    """Read a file once per version; hashing and every parse share the bytes."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=4096)
+def _raw_digest(path: str, mtime_ns: int, size: int) -> bytes:
+    """Hash of a file's bytes, memoized while the file is unchanged."""
+    return _raw_hash(_read_bytes(path, mtime_ns, size))
+
+
+@lru_cache(maxsize=128)
+def _parse_xml(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse an XML file once per version (callers must not modify the tree)."""
+    return etree.parse(BytesIO(_read_bytes(path, mtime_ns, size)), _parser())
+
+
+def _parser() -> etree.XMLParser:
+    """Get this thread's shared metadata parser."""
+    parser = getattr(_parsers, "parser", None)
+    if parser is None:
+        parser = _parsers.parser = etree.XMLParser(**_PARSER_OPTIONS)
+    return parser
+
+
+def _parse_pool() -> ThreadPoolExecutor:
+    """Get the thread pool for parsing a second file concurrently."""
+    global _parse_pool_executor
+    if _parse_pool_executor is None:
+        with _parse_pool_lock:
+            if _parse_pool_executor is None:
+                _parse_pool_executor = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="xml-parse"
+                )
+    return _parse_pool_executor
+
+
+def _canon_digest(path: Path) -> bytes:
+    """Digest of a file's canonical XML, memoized while the file is unchanged."""
+    return _canon_digest_cached(*_file_key(path))
+
+
+@lru_cache(maxsize=4096)
+def _canon_digest_cached(path: str, mtime_ns: int, size: int) -> bytes:
+    # C14N 2.0 fixes attribute order and quoting; strip_text drops the
+    # indentation whitespace around text nodes
+    tree = _parse_xml(path, mtime_ns, size)
+    canonical = etree.tostring(tree, method="c14n2", strip_text=True)
+    # Remove xmlns declarations (they often vary)
+    canonical = _XMLNS_RE.sub(b"", canonical)
+    return hashlib.blake2b(canonical, digest_size=16).digest()
+
+
+def _get_xml_diff(expected: Path, actual: Path) -> dict[str, Any]:
+    """Get differences between two XML files.
+
+    Returns ``{path: (expected, actual)}`` for up to ``MAX_DIFFS_PER_FILE``
+    changed, missing (actual is None) or extra (expected is None) nodes.
+    """
+    try:
+        expected_root = _parse_xml(*_file_key(expected)).getroot()
+        actual_root = _parse_xml(*_file_key(actual)).getroot()
+
+        diffs: dict[str, Any] = {}
+        _structural_diff(expected_root, actual_root, "/" + _local_tag(expected_root), diffs)
+        return diffs
+
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _structural_diff(expected: Any, actual: Any, path: str, diffs: dict[str, Any]) -> None:
+    """Record differences between two elements and their descendants.
+
+    Children are paired by tag and position among siblings with that tag.
+    Walks with an explicit stack, so deeply nested metadata cannot hit the
+    recursion limit; differences are recorded in document order.
+    """
+    # Entries are (path, expected, actual) element pairs to compare, or
+    # (path, summary, summary) for a missing or extra child when ``leaf``
+    stack: list[tuple[str, Any, Any, bool]] = [(path, expected, actual, False)]
+    while stack and len(diffs) < MAX_DIFFS_PER_FILE:
+        path, expected, actual, leaf = stack.pop()
+        if leaf:
+            diffs[path] = (expected, actual)
+            continue
+
+        expected_tag, actual_tag = _local_tag(expected), _local_tag(actual)
+        if expected_tag != actual_tag:
+            diffs[path] = (expected_tag, actual_tag)
+            continue
+
+        expected_attrs, actual_attrs = _local_attrib(expected), _local_attrib(actual)
+        if expected_attrs != actual_attrs:
+            for name in sorted(expected_attrs.keys() | actual_attrs.keys()):
+                if expected_attrs.get(name) != actual_attrs.get(name):
+                    diffs[f"{path}/@{name}"] = (expected_attrs.get(name), actual_attrs.get(name))
+
+        expected_text = (expected.text or "").strip()
+        actual_text = (actual.text or "").strip()
+        if expected_text != actual_text:
+            diffs[path] = (expected_text, actual_text)
+
+        expected_children = _children_by_tag(expected)
+        actual_children = _children_by_tag(actual)
+        # Expected tags first, then any only present in actual, in document order
+        tags = list(expected_children) + [t for t in actual_children if t not in expected_children]
+        pending = []
+        for tag in tags:
+            left = expected_children.get(tag, [])
+            right = actual_children.get(tag, [])
+            repeated = max(len(left), len(right)) > 1
+            for i in range(max(len(left), len(right))):
+                child_path = f"{path}/{tag}[{i}]" if repeated else f"{path}/{tag}"
+                if i >= len(right):
+                    pending.append((child_path, _summarize(left[i]), None, True))
+                elif i >= len(left):
+                    pending.append((child_path, None, _summarize(right[i]), True))
+                else:
+                    pending.append((child_path, left[i], right[i], False))
+        # Reversed so the first child is compared next
+        stack.extend(reversed(pending))
+
+
+def _local_tag(element: Any) -> str:
+    return etree.QName(element).localname
+
+
+def _children_by_tag(element: Any) -> dict[str, list[Any]]:
+    children: dict[str, list[Any]] = {}
+    for child in element:
+        # Skip comments and processing instructions
+        if isinstance(child.tag, str):
+            children.setdefault(_local_tag(child), []).append(child)
+    return children
+
+
+def _summarize(element: Any) -> str:
+    """Short description of a missing or extra element."""
+    text = (element.text or "").strip()
+    if text and len(element) == 0:
+        return text
+    return f"<{_local_tag(element)}>"
@@ -1,5 +1,6 @@
 """Main evaluation pipeline orchestrating all evaluation layers."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from rich.console import Console
@@ -98,18 +99,31 @@ class EvaluationPipeline:
         result.apex_tests = test_result
         result.test_score = test_score
 
+        # Layers 3-5 only read the deployed solution and are independent of
+        # each other (local PMD, metadata retrieve, LLM call), so they may
+        # overlap; functional tests above need the org to themselves
+        if self.config.parallel_layers:
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                static_future = pool.submit(self.static_analysis.evaluate, task, work_dir)
+                diff_future = pool.submit(self.metadata_diff.evaluate, task, work_dir)
+                rubric_future = pool.submit(self.rubric.evaluate, task, work_dir)
+            static_result, static_score = static_future.result()
+            diff_result, diff_score = diff_future.result()
+            rubric_result, rubric_score = rubric_future.result()
+        else:
+            static_result, static_score = self.static_analysis.evaluate(task, work_dir)
+            diff_result, diff_score = self.metadata_diff.evaluate(task, work_dir)
+            rubric_result, rubric_score = self.rubric.evaluate(task, work_dir)
+
         # Layer 3: Static Analysis
-        static_result, static_score = self.static_analysis.evaluate(task, work_dir)
         result.static_analysis = static_result
         result.static_analysis_score = static_score
 
         # Layer 4: Metadata Diffing
-        diff_result, diff_score = self.metadata_diff.evaluate(task, work_dir)
         result.metadata_diff = diff_result
         result.metadata_score = diff_score
 
         # Layer 5: Rubric Evaluation
-        rubric_result, rubric_score = self.rubric.evaluate(task, work_dir)
         result.rubric = rubric_result
         result.rubric_score = rubric_score
 
@@ -1,18 +1,555 @@
 """Layer 5: LLM-as-a-Judge Rubric Evaluator."""
 
+import asyncio
+import hashlib
+import importlib.util
 import json
 import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Callable, Iterator
 
+import httpx
 from rich.console import Console
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # optional speedup
+    from json import loads as _json_loads
+
+try:
+    import ahocorasick
+except ImportError:  # optional speedup; a regex scan is used without it
+    ahocorasick = None
+
 from sf_agentbench.config import RubricConfig, BUILTIN_MODELS, ModelProvider
+from sf_agentbench.http import new_async_client, shared_client
 from sf_agentbench.models import RubricResult, RubricCriterion, Task
 
 console = Console()
 
+# Statuses worth retrying with backoff (rate limiting and server errors)
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+LLM_MAX_ATTEMPTS = 3
+LLM_MAX_RETRY_DELAY_SECONDS = 30.0
+
+# Default location of cached judge verdicts (RubricConfig.cache_enabled)
+DEFAULT_CACHE_DIR = Path.home() / ".sf-agentbench" / "cache" / "rubric"
+
+# Code files are read on a thread pool once this many fit in the budget
+PARALLEL_READ_MIN_FILES = 8
+_READ_WORKERS = 32
+
+# Providers whose Batch API evaluate_batch can use (RubricConfig.use_batch_api)
+BATCH_API_PROVIDERS = frozenset({"anthropic", "openai"})
+OPENAI_API_URL = "https://api.openai.com/v1"
+OPENAI_BATCH_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# A provider is skipped for the cooldown after this many failed calls in a row
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN_SECONDS = 60.0
+
+# Solutions judged per request by evaluate_batch; bounded so every verdict
+# fits in the configured max_tokens
+RUBRIC_BATCH_SIZE = 4
+
+# Estimated characters per token when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float | None:
+    """Get the backoff before retrying a response, or None if it is final."""
+    if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= LLM_MAX_ATTEMPTS - 1:
+        return None
+    try:
+        delay = float(response.headers.get("retry-after", ""))
+    except ValueError:
+        delay = 2.0 ** attempt  # 1s, 2s, ...
+    return min(max(delay, 0.0), LLM_MAX_RETRY_DELAY_SECONDS)
+
+
+def _get_json(client: httpx.Client, url: str, headers: dict[str, str]) -> dict[str, Any]:
+    response = client.get(url, headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+def _batch_index(item: dict[str, Any]) -> int:
+    """Get the request index from a Batch API result's ``task-<i>`` custom_id."""
+    return int(item["custom_id"].removeprefix("task-"))
+
+
+def _anthropic_delta(event: dict[str, Any]) -> str | None:
+    if event.get("type") == "error":
+        raise RuntimeError(event.get("error", {}).get("message", "Anthropic stream error"))
+    if event.get("type") == "content_block_delta":
+        # Text, or the forced verdict tool's input as it is generated
+        delta = event["delta"]
+        return delta.get("text") or delta.get("partial_json")
+    return None
+
+
+def _openai_delta(event: dict[str, Any]) -> str | None:
+    choices = event.get("choices")
+    if choices:
+        return (choices[0].get("delta") or {}).get("content")
+    return None
+
+
+# Providers whose replies are streamed (RubricConfig.stream), with the
+# function pulling text out of each server-sent event
+_STREAM_DELTAS: dict[str, Callable[[dict[str, Any]], str | None]] = {
+    "anthropic": _anthropic_delta,
+    "openai": _openai_delta,
+}
+
+
+def _sse_text(line: str, delta: Callable[[dict[str, Any]], str | None]) -> str | None:
+    """Get the text carried by one server-sent event line, if any."""
+    if not line.startswith("data:"):
+        return None
+    payload = line[5:].strip()
+    if not payload or payload == "[DONE]":
+        return None
+    return delta(json.loads(payload))
+
+
+def _read_stream(lines: Iterator[str], delta: Callable[[dict[str, Any]], str | None]) -> str:
+    """
+    Join streamed reply text, stopping as soon as the verdict JSON is complete.
+
+    The rest of the stream is left unread, so the caller's ``client.stream``
+    context closes the response instead of waiting out the generation.
+    """
+    parts: list[str] = []
+    for line in lines:
+        text = _sse_text(line, delta)
+        if text:
+            parts.append(text)
+            if "}" in text and _json_complete("".join(parts)):
+                break
+    return "".join(parts)
+
+
+async def _read_stream_async(
+    lines: AsyncIterator[str], delta: Callable[[dict[str, Any]], str | None]
+) -> str:
+    """Async variant of ``_read_stream``."""
+    parts: list[str] = []
+    async for line in lines:
+        text = _sse_text(line, delta)
+        if text:
+            parts.append(text)
+            if "}" in text and _json_complete("".join(parts)):
+                break
+    return "".join(parts)
+
+
+def _anthropic_text(data: dict[str, Any]) -> str:
+    block = data["content"][0]
+    if block.get("type") == "tool_use":
+        return json.dumps(block["input"])
+    return block["text"]
+
+
+def _google_text(data: dict[str, Any]) -> str:
+    candidates = data.get("candidates", [])
+    if candidates:
+        content = candidates[0].get("content", {})
+        parts = content.get("parts", [])
+        if parts:
+            return parts[0].get("text", "")
+
+    raise ValueError("No content in Gemini response")
+
+
+def _openai_text(data: dict[str, Any]) -> str:
+    return data["choices"][0]["message"]["content"]
+
+
+@lru_cache(maxsize=1)
+def _has_tiktoken() -> bool:
+    """Check once whether the optional tiktoken package is installed."""
+    return importlib.util.find_spec("tiktoken") is not None
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str) -> Any:
+    """Get the tiktoken encoding for an OpenAI model (built once per model)."""
+    # Imported on first use; tiktoken pulls in regex and requests
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def _estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _split_code(code: str, budget: int, count: Callable[[str], int]) -> list[tuple[str, int]]:
+    """
+    Split code into (chunk, tokens) pairs of at most ``budget`` tokens.
+
+    Chunks end at line breaks; a single line over the budget is a chunk of
+    its own.
+    """
+    chunks: list[tuple[str, int]] = []
+    lines: list[str] = []
+    size = 0
+    for line in code.splitlines(keepends=True):
+        tokens = count(line)
+        if lines and size + tokens > budget:
+            chunks.append(("".join(lines), size))
+            lines, size = [], 0
+        lines.append(line)
+        size += tokens
+    if lines:
+        chunks.append(("".join(lines), size))
+    return chunks
+
+
+def _merge_results(results: list[RubricResult], sizes: list[int]) -> RubricResult:
+    """Combine verdicts on code chunks, weighting each chunk by its token count."""
+    if len(results) == 1:
+        return results[0]
+
+    scores: dict[str, list[tuple[float, int]]] = {}
+    firsts: dict[str, RubricCriterion] = {}
+    reasoning: dict[str, list[str]] = {}
+    for result, size in zip(results, sizes):
+        for c in result.criteria:
+            firsts.setdefault(c.name, c)
+            scores.setdefault(c.name, []).append((c.score, size))
+            if c.reasoning:
+                reasoning.setdefault(c.name, []).append(c.reasoning)
+
+    criteria = [
+        RubricCriterion(
+            name=name,
+            weight=first.weight,
+            score=sum(s * n for s, n in scores[name]) / max(sum(n for _, n in scores[name]), 1),
+            reasoning=" ".join(reasoning.get(name, [])),
+        )
+        for name, first in firsts.items()
+    ]
+    total_weight = sum(c.weight for c in criteria)
+    if total_weight > 0:
+        overall = sum(c.score * c.weight for c in criteria) / total_weight
+    else:
+        overall = sum(r.overall_score * n for r, n in zip(results, sizes)) / max(sum(sizes), 1)
+
+    return RubricResult(
+        overall_score=overall,
+        criteria=criteria,
+        feedback="\n".join(r.feedback for r in results if r.feedback),
+    )
+
+
+# JSON Schemas of a verdict and of a batch of verdicts, which providers are
+# asked to conform to (RubricConfig.structured_output)
+_CRITERION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "score": {"type": "number"},
+        "reasoning": {"type": "string"},
+    },
+    "required": ["name", "score", "reasoning"],
+    "additionalProperties": False,
+}
+_VERDICT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "criteria": {"type": "array", "items": _CRITERION_SCHEMA},
+        "overall_feedback": {"type": "string"},
+    },
+    "required": ["criteria", "overall_feedback"],
+    "additionalProperties": False,
+}
+_BATCH_VERDICT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "evaluations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"task": {"type": "integer"}, **_VERDICT_SCHEMA["properties"]},
+                "required": ["task", "criteria", "overall_feedback"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["evaluations"],
+    "additionalProperties": False,
+}
+
+# Name of the tool Anthropic models are made to call with their verdict
+VERDICT_TOOL_NAME = "submit_rubric"
+
+
+# Comment header per collected code kind, in prompt order
+_CODE_HEADERS = (
+    "// File: {name}\n",  # Apex classes
+    "// File: {name}\n",  # Apex triggers
+    "<!-- File: {name} -->\n",  # Flows
+    "<!-- File: {name} -->\n",  # Validation Rules
+    "// File: {name}\n",  # LWC JavaScript
+)
+
+
+def _code_kind(dir_name: str, name: str) -> int | None:
+    """Get the ``_CODE_HEADERS`` index for a file, or None to skip it."""
+    if "-meta.xml" not in name:
+        if name.endswith(".cls"):
+            return 0
+        if name.endswith(".trigger"):
+            return 1
+    elif dir_name == "flows" and name.endswith(".flow-meta.xml"):
+        return 2
+    elif dir_name == "validationRules" and name.endswith(".validationRule-meta.xml"):
+        return 3
+    if name.endswith(".js"):
+        return 4
+    return None
+
+
+def _walk_code_files(root: str, files: list[tuple[int, str, str, int, int]]) -> None:
+    """Collect (kind, name, path, size, mtime_ns) for code files below ``root``."""
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return
+
+    dir_name = os.path.basename(root)
+    for entry in entries:
+        if entry.is_dir():
+            # Skip hidden directories such as .git or .sfdx caches
+            if not entry.name.startswith("."):
+                _walk_code_files(entry.path, files)
+            continue
+        kind = _code_kind(dir_name, entry.name)
+        if kind is not None:
+            st = entry.stat()
+            files.append((kind, entry.name, entry.path, st.st_size, st.st_mtime_ns))
+
+
+def _read_head(path: str, limit: int) -> str | None:
+    """Read up to ``limit`` bytes of a file, or None if it cannot be read."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(limit).decode("utf-8", errors="replace")
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=32)
+def _read_code(
+    files: tuple[tuple[int, str, str, int], ...], latest_mtime_ns: int, budget: int
+) -> str:
+    """
+    Read and join code files, stopping once ``budget`` characters are collected.
+
+    Cached until a file is added, removed or touched.
+    """
+    # Files sure to be needed, judging by size (a byte is at most one character)
+    needed = []
+    planned = 0
+    for kind, name, path, size in files:
+        if planned >= budget:
+            break
+        needed.append(path)
+        planned += len(_CODE_HEADERS[kind]) + len(name) + size + 2
+
+    contents: dict[str, str | None] = {}
+    if len(needed) >= PARALLEL_READ_MIN_FILES:
+        # Reads wait on I/O, not the GIL, so slow filesystems overlap them
+        with ThreadPoolExecutor(max_workers=min(_READ_WORKERS, len(needed))) as pool:
+            contents = dict(zip(needed, pool.map(lambda p: _read_head(p, budget), needed)))
+
+    code_parts = []
+    remaining = budget
+    for kind, name, path, _ in files:
+        if remaining <= 0:
+            break
+        # Never read more of a file than can still fit in the prompt
+        content = contents[path] if path in contents else _read_head(path, remaining)
+        if content is None:
+            continue
+        part = (_CODE_HEADERS[kind].format(name=name) + content)[:remaining]
+        code_parts.append(part)
+        remaining -= len(part) + 2  # "\n\n" separator
+    return "\n\n".join(code_parts)
+
+
+# Every substring the heuristic rubric looks for (matched case-insensitively)
+_HEURISTIC_TOKENS = (
+    ".cls", "public class", "@istest", "<flow ", "<recordupdates>", "flow-meta.xml",
+    "<validationrule", "errorformula", "for(", "for (", "for", "[select",
+    "insert ", "update ", "delete ", "upsert ", "list<", "map<", "set<",
+    "queueable", "batchable", "schedulable", "@future", "aftersave", "triggertype>update",
+    "system.assert", "testmethod", "200", "isdeletable", "iscreateable", "isupdateable",
+    "isaccessible", "stripfinal", "with security_enforced", "with user_mode",
+    "//", "/*", "<label>", "<description>",
+)
+
+# Zero-width lookahead so overlapping tokens are all seen in one pass; longer
+# tokens first so e.g. "for(" wins over its prefix "for" at the same position
+_HEURISTIC_RE = re.compile(
+    "(?=("
+    + "|".join(re.escape(t) for t in sorted(_HEURISTIC_TOKENS, key=len, reverse=True))
+    + "))",
+    re.IGNORECASE,
+)
+
+# 15/18-character record IDs with common key prefixes (Account, Contact,
+# User, Opportunity, Organization, Lead)
+_SALESFORCE_ID_RE = re.compile(r"\b(?:001|003|005|006|00D|00Q)[a-zA-Z0-9]{12}(?:[a-zA-Z0-9]{3})?\b")
+
+# Identifier-like words longer than 10 characters
+_DESCRIPTIVE_NAME_RE = re.compile(r"\b[a-z][a-zA-Z]{10,}\b")
+
+
+# Bit per token, also set for every shorter token it starts with, so that
+# e.g. finding "for(" counts as finding "for"
+_TOKEN_BITS = {
+    token: sum(1 << i for i, prefix in enumerate(_HEURISTIC_TOKENS) if token.startswith(prefix))
+    for token in _HEURISTIC_TOKENS
+}
+
+
+def _feature_mask(*tokens: str) -> int:
+    """Get the bits of the given tokens, any of which marks a feature as present."""
+    mask = 0
+    for token in tokens:
+        mask |= 1 << _HEURISTIC_TOKENS.index(token)
+    return mask
+
+
+_APEX_MASK = _feature_mask(".cls", "public class", "@istest")
+_FLOW_MASK = _feature_mask("<flow ", "<recordupdates>", "flow-meta.xml")
+_VALIDATION_MASK = _feature_mask("<validationrule", "errorformula")
+_FOR_LOOP_MASK = _feature_mask("for(", "for (")
+_COLLECTIONS_MASK = _feature_mask("list<", "map<", "set<")
+_SOQL_MASK = _feature_mask("[select")
+_DML_MASK = _feature_mask("insert ", "update ", "delete ", "upsert ")
+_ASYNC_MASK = _feature_mask("queueable", "batchable", "schedulable", "@future")
+_AFTER_SAVE_MASK = _feature_mask("aftersave", "triggertype>update")
+_ASSERT_MASK = _feature_mask("system.assert")
+_TEST_MASK = _feature_mask("@istest", "testmethod")
+_BULK_TEST_MASK = _feature_mask("200")
+_LIST_MASK = _feature_mask("list<")
+_FOR_MASK = _feature_mask("for")
+_CRUD_CHECK_MASK = _feature_mask(
+    "isdeletable", "iscreateable", "isupdateable", "isaccessible", "stripfinal"
+)
+_SECURITY_MODE_MASK = _feature_mask("with security_enforced", "with user_mode")
+_COMMENT_MASK = _feature_mask("//", "/*")
+_LABEL_MASK = _feature_mask("<label>")
+_DESCRIPTION_MASK = _feature_mask("<description>")
+
+
+def _heuristic_automaton() -> Any:
+    automaton = ahocorasick.Automaton()
+    for token in _HEURISTIC_TOKENS:
+        automaton.add_word(token, _TOKEN_BITS[token])
+    automaton.make_automaton()
+    return automaton
+
+
+# Aho-Corasick finds every token in one linear pass, independent of the
+# number of tokens; the regex alternation may retry alternatives per position
+_HEURISTIC_AUTOMATON = _heuristic_automaton() if ahocorasick is not None else None
+
+# The automaton needs lowercase input, which is made a chunk at a time
+# (overlapping by a token) rather than as one copy of the whole code
+_SCAN_CHUNK_CHARS = 1 << 16
+_SCAN_OVERLAP_CHARS = max(len(t) for t in _HEURISTIC_TOKENS) - 1
+
+
+def _scan_features(code: str) -> int:
+    """Get the ``_TOKEN_BITS`` of every heuristic token in ``code`` in a single pass."""
+    features = 0
+    if _HEURISTIC_AUTOMATON is not None:
+        for start in range(0, len(code), _SCAN_CHUNK_CHARS):
+            chunk = code[start:start + _SCAN_CHUNK_CHARS + _SCAN_OVERLAP_CHARS].lower()
+            for _, bits in _HEURISTIC_AUTOMATON.iter(chunk):
+                features |= bits
+        return features
+    for token in set(_HEURISTIC_RE.findall(code)):
+        features |= _TOKEN_BITS[token.lower()]
+    return features
+
+
+# Weight of a judged criterion that is not in the rubric
+DEFAULT_CRITERION_WEIGHT = 0.2
+
+
+def _rubric_weights(rubric: list[dict[str, Any]]) -> dict[str, float]:
+    """Map lowercased criterion names to weights (the first entry wins)."""
+    return {r["name"].lower(): r["weight"] for r in reversed(rubric)}
+
+
+def _rubric_text(rubric: list[dict[str, Any]]) -> str:
+    return "\n".join(
+        f"{i+1}. {r['name']} (weight: {r['weight']}): {r['description']}"
+        for i, r in enumerate(rubric)
+    )
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json(text: str) -> dict[str, Any] | None:
+    """Get the first JSON object in an LLM reply, preferring a ```json fence."""
+    fence = text.find("```json")
+    idx = text.find("{", fence if fence != -1 else 0)
+    if idx == -1 and fence != -1:
+        idx = text.find("{")
+
+    # Usual case: everything up to the last brace is the object, so it can be
+    # handed to the (optionally orjson) parser in one go
+    end = text.rfind("}") + 1
+    if idx != -1 and end > idx:
+        try:
+            data = _json_loads(text[idx:end])
+        except ValueError:
+            pass
+        else:
+            if isinstance(data, dict):
+                return data
+
+    while idx != -1:
+        try:
+            data, _ = _JSON_DECODER.raw_decode(text, idx)
+        except json.JSONDecodeError:
+            pass
+        else:
+            if isinstance(data, dict):
+                return data
+        idx = text.find("{", idx + 1)
+    return None
+
+
+def _json_complete(text: str) -> bool:
+    """Check whether the JSON object ``_extract_json`` would start at has fully arrived."""
+    fence = text.find("```json")
+    idx = text.find("{", fence if fence != -1 else 0)
+    if idx == -1:
+        return False
+    try:
+        data, _ = _JSON_DECODER.raw_decode(text, idx)
+    except json.JSONDecodeError:
+        return False
+    return isinstance(data, dict)
+
 
 def _get_api_key(provider: str) -> str | None:
     """Get API key for the given provider."""
@@ -28,14 +565,24 @@ def _get_api_key(provider: str) -> str | None:
         if key:
             return key
 
-    # Try to get from auth module
+    return _stored_api_key(provider.lower())
+
+
+@lru_cache(maxsize=4)
+def _stored_api_key(provider: str) -> str | None:
+    """
+    Get a provider's API key from the auth module's stored credentials.
+
+    The lookup may read credential files or the system keychain, so it is
+    done once per provider; the auth module is only imported when needed.
+    """
     try:
-        if provider.lower() == "anthropic":
+        if provider == "anthropic":
             from sf_agentbench.agents.auth import get_anthropic_credentials
             creds = get_anthropic_credentials()
             if creds:
                 return creds.get("api_key") if isinstance(creds, dict) else creds
-        elif provider.lower() == "google":
+        elif provider == "google":
             from sf_agentbench.agents.auth import get_google_credentials
             creds = get_google_credentials()
             if creds:
@@ -46,11 +593,17 @@ def _get_api_key(provider: str) -> str | None:
     return None
 
 
+def _supports_structured_output(model: str) -> bool:
+    """Check whether a model takes a reply schema; models not in the registry are assumed to."""
+    model_info = BUILTIN_MODELS.get(model)
+    return model_info is None or model_info.structured_output
+
+
 def _detect_provider(model: str) -> str:
     """Auto-detect provider from model name."""
     model_info = BUILTIN_MODELS.get(model)
     if model_info:
-        return model_info["provider"].value
+        return model_info.provider.value
 
     # Fallback to name-based detection
     model_lower = model.lower()
@@ -124,6 +677,10 @@ class RubricEvaluator:
         self.config = rubric_config or RubricConfig()
         self.rubric = rubric or DEFAULT_RUBRIC
         self.verbose = verbose
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        # provider -> (consecutive failures, monotonic time it stays skipped until)
+        self._breakers: dict[str, tuple[int, float]] = {}
 
     def evaluate(self, task: Task, work_dir: Path) -> tuple[RubricResult, float]:
         """
@@ -136,6 +693,294 @@ class RubricEvaluator:
         Returns:
             Tuple of (RubricResult, score)
         """
+        inputs = self._prepare(task, work_dir)
+        if isinstance(inputs[0], RubricResult):
+            return inputs
+
+        code_content, requirements = inputs
+        chunks = self._code_chunks(code_content)
+        try:
+            # Call LLM for evaluation, once per chunk of oversized code
+            results = [
+                self._evaluate_with_llm(code=chunk, requirements=requirements, rubric=self.rubric)
+                for chunk, _ in chunks
+            ]
+            result = _merge_results(results, [size for _, size in chunks])
+        except Exception as e:
+            return self._failed(e)
+        return self._report(result)
+
+    async def evaluate_async(self, task: Task, work_dir: Path) -> tuple[RubricResult, float]:
+        """
+        Evaluate solution using LLM-as-a-Judge without blocking the event loop.
+
+        Rubric calls for several tasks can be run together with
+        ``asyncio.gather``; call ``aclose`` when done.
+
+        Args:
+            task: The benchmark task
+            work_dir: Working directory with agent's solution
+
+        Returns:
+            Tuple of (RubricResult, score)
+        """
+        inputs = await asyncio.to_thread(self._prepare, task, work_dir)
+        if isinstance(inputs[0], RubricResult):
+            return inputs
+
+        code_content, requirements = inputs
+        chunks = self._code_chunks(code_content)
+        try:
+            results = await asyncio.gather(
+                *[
+                    self._evaluate_with_llm_async(
+                        code=chunk, requirements=requirements, rubric=self.rubric
+                    )
+                    for chunk, _ in chunks
+                ]
+            )
+            result = _merge_results(list(results), [size for _, size in chunks])
+        except Exception as e:
+            return self._failed(e)
+        return self._report(result)
+
+    def evaluate_batch(
+        self,
+        tasks: list[Task],
+        work_dirs: list[Path],
+        batch_size: int = RUBRIC_BATCH_SIZE,
+    ) -> list[tuple[RubricResult, float]]:
+        """
+        Evaluate several solutions, judging up to ``batch_size`` per LLM request.
+
+        The rubric and instructions are sent once per request as a system
+        prompt, which Anthropic caches across requests. With ``use_batch_api``
+        on Anthropic or OpenAI, each solution is instead submitted as its own
+        request to the provider's Batch API, and this blocks until it is done.
+
+        Args:
+            tasks: The benchmark tasks
+            work_dirs: Working directory with each task's solution
+            batch_size: Maximum solutions judged per request
+
+        Returns:
+            One (RubricResult, score) tuple per task, in order
+        """
+        results: list[tuple[RubricResult, float] | None] = []
+        pending: list[tuple[int, str, str]] = []
+        for index, (task, work_dir) in enumerate(zip(tasks, work_dirs)):
+            inputs = self._prepare(task, work_dir)
+            if isinstance(inputs[0], RubricResult):
+                results.append(inputs)
+            else:
+                results.append(None)
+                pending.append((index, *inputs))
+
+        use_batch_api = self._batch_api_provider() is not None
+        if use_batch_api:
+            # One Batch API job holds every solution
+            batch_size = max(len(pending), 1)
+
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            items = [(code, requirements) for _, code, requirements in batch]
+            try:
+                if use_batch_api:
+                    judged = self._evaluate_with_batch_api(items, self.rubric)
+                else:
+                    judged = self._evaluate_batch_with_llm(items, self.rubric)
+            except Exception as e:
+                judged = [e] * len(batch)
+            for (index, _, _), result in zip(batch, judged):
+                if isinstance(result, Exception):
+                    results[index] = self._failed(result)
+                else:
+                    results[index] = self._report(result)
+
+        return results
+
+    def _batch_api_provider(self) -> str | None:
+        """Get the provider to use the Batch API with, if it is enabled and supported."""
+        if not self.config.use_batch_api:
+            return None
+        provider = self._provider()
+        if provider not in BATCH_API_PROVIDERS:
+            console.print(f"    [dim]No Batch API for {provider}; batching prompts instead[/dim]")
+            return None
+        return provider
+
+    def _evaluate_with_batch_api(
+        self,
+        items: list[tuple[str, str]],
+        rubric: list[dict[str, Any]],
+    ) -> list[RubricResult]:
+        """Judge each (code, requirements) item as one request of a Batch API job."""
+        prompts = [self._build_evaluation_prompt(code, req, rubric) for code, req in items]
+
+        try:
+            texts = self._call_batch_api(prompts)
+        except Exception as e:
+            return [self._fallback(e, code, rubric) for code, _ in items]
+
+        return [
+            self._llm_result(text, rubric)
+            if text is not None
+            else self._fallback(RuntimeError("Batch API request failed"), code, rubric)
+            for (code, _), text in zip(items, texts)
+        ]
+
+    def _call_batch_api(self, prompts: list[str]) -> list[str | None]:
+        """Run prompts as a provider Batch API job; None marks a failed request."""
+        provider = self._provider()
+        url, headers, template, extract = self._build_request(
+            "", provider=provider, schema=_VERDICT_SCHEMA
+        )
+        bodies = [{**template, "messages": [{"role": "user", "content": p}]} for p in prompts]
+        console.print(f"    [dim]Submitted {len(prompts)} requests to the Batch API[/dim]")
+        if provider == "anthropic":
+            return self._anthropic_batch(url + "/batches", headers, bodies, extract)
+        return self._openai_batch(headers, bodies, extract)
+
+    def _anthropic_batch(
+        self,
+        url: str,
+        headers: dict[str, str],
+        bodies: list[dict[str, Any]],
+        extract: Callable[[dict[str, Any]], str],
+    ) -> list[str | None]:
+        client = shared_client()
+        requests = [{"custom_id": f"task-{i}", "params": body} for i, body in enumerate(bodies)]
+        response = client.post(url, headers=headers, json={"requests": requests})
+        response.raise_for_status()
+
+        batch = self._await_batch(
+            client, url, headers, response.json(), lambda b: b["processing_status"] == "ended"
+        )
+
+        response = client.get(batch["results_url"], headers=headers)
+        response.raise_for_status()
+        texts: list[str | None] = [None] * len(bodies)
+        for line in response.text.splitlines():
+            if line.strip():
+                item = json.loads(line)
+                result = item.get("result") or {}
+                if result.get("type") == "succeeded":
+                    texts[_batch_index(item)] = extract(result["message"])
+        return texts
+
+    def _await_batch(
+        self,
+        client: httpx.Client,
+        batches_url: str,
+        headers: dict[str, str],
+        batch: dict[str, Any],
+        done: Callable[[dict[str, Any]], bool],
+    ) -> dict[str, Any]:
+        """Poll a Batch API job until ``done``, cancelling it once it runs too long.
+
+        Raises TimeoutError after ``batch_timeout_seconds`` so the caller
+        falls back to heuristic scoring instead of waiting out the provider's
+        completion window.
+        """
+        timeout = self.config.batch_timeout_seconds
+        deadline = time.monotonic() + timeout
+        url = f"{batches_url}/{batch['id']}"
+        while not done(batch):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                try:
+                    client.post(f"{url}/cancel", headers=headers).raise_for_status()
+                except httpx.HTTPError as e:
+                    console.print(f"    [dim]Could not cancel batch {batch['id']}: {e}[/dim]")
+                raise TimeoutError(f"Batch {batch['id']} still running after {timeout:g}s")
+            time.sleep(min(self.config.batch_poll_seconds, remaining))
+            batch = _get_json(client, url, headers)
+        return batch
+
+    def _openai_batch(
+        self,
+        headers: dict[str, str],
+        bodies: list[dict[str, Any]],
+        extract: Callable[[dict[str, Any]], str],
+    ) -> list[str | None]:
+        client = shared_client()
+        auth = {"Authorization": headers["Authorization"]}
+        lines = "\n".join(
+            json.dumps(
+                {
+                    "custom_id": f"task-{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": body,
+                }
+            )
+            for i, body in enumerate(bodies)
+        )
+        response = client.post(
+            f"{OPENAI_API_URL}/files",
+            headers=auth,
+            data={"purpose": "batch"},
+            files={"file": ("rubric.jsonl", lines.encode(), "application/jsonl")},
+        )
+        response.raise_for_status()
+        response = client.post(
+            f"{OPENAI_API_URL}/batches",
+            headers=auth,
+            json={
+                "input_file_id": response.json()["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+            },
+        )
+        response.raise_for_status()
+
+        batch = self._await_batch(
+            client,
+            f"{OPENAI_API_URL}/batches",
+            auth,
+            response.json(),
+            lambda b: b["status"] in OPENAI_BATCH_FINAL_STATUSES,
+        )
+        if not batch.get("output_file_id"):
+            raise RuntimeError(f"OpenAI batch {batch['id']} {batch['status']}")
+
+        response = client.get(
+            f"{OPENAI_API_URL}/files/{batch['output_file_id']}/content", headers=auth
+        )
+        response.raise_for_status()
+        texts: list[str | None] = [None] * len(bodies)
+        for line in response.text.splitlines():
+            if line.strip():
+                item = json.loads(line)
+                result = item.get("response") or {}
+                if result.get("status_code") == 200:
+                    texts[_batch_index(item)] = extract(result["body"])
+        return texts
+
+    def _evaluate_batch_with_llm(
+        self,
+        items: list[tuple[str, str]],
+        rubric: list[dict[str, Any]],
+    ) -> list[RubricResult]:
+        """Judge several (code, requirements) items with a single LLM call."""
+        system = self._build_batch_system_prompt(rubric)
+        prompt = self._build_batch_prompt(items)
+
+        try:
+            response = self._call_llm(prompt, system=system, schema=_BATCH_VERDICT_SCHEMA)
+        except Exception as e:
+            return [self._fallback(e, code, rubric) for code, _ in items]
+
+        results = self._parse_batch_response(response, len(items), rubric)
+        for result in results:
+            result.feedback = f"Evaluated by LLM ({self.config.model}). {result.feedback}"
+        console.print(f"    [green]LLM evaluation successful ({len(items)} tasks)[/green]")
+        return results
+
+    def _prepare(
+        self, task: Task, work_dir: Path
+    ) -> tuple[str, str] | tuple[RubricResult, float]:
+        """Get (code, requirements), or a final result when there is nothing to judge."""
         console.print("  [dim]Layer 5: Rubric Evaluation (LLM-as-a-Judge)[/dim]")
 
         if not self.config.enabled:
@@ -150,74 +995,68 @@ class RubricEvaluator:
             return RubricResult(overall_score=0.5), 0.5
 
         # Get task requirements
-        requirements = self._get_requirements(task, work_dir)
-
-        try:
-            # Call LLM for evaluation
-            result = self._evaluate_with_llm(
-                code=code_content,
-                requirements=requirements,
-                rubric=self.rubric,
+        return code_content, self._get_requirements(task, work_dir)
+
+    def _report(self, result: RubricResult) -> tuple[RubricResult, float]:
+        console.print(f"    Rubric score: {result.overall_score*100:.1f}%")
+
+        if self.verbose and result.criteria:
+            console.print(
+                "\n".join(
+                    f"      - {criterion.name}: {criterion.score*100:.0f}%"
+                    for criterion in result.criteria
+                ),
+                markup=False,
+                highlight=False,
             )
 
-            console.print(f"    Rubric score: {result.overall_score*100:.1f}%")
+        return result, result.overall_score
 
-            if self.verbose:
-                for criterion in result.criteria:
-                    console.print(
-                        f"      - {criterion.name}: {criterion.score*100:.0f}%"
-                    )
-
-            return result, result.overall_score
-
-        except Exception as e:
-            console.print(f"    [yellow]LLM evaluation failed: {e}[/yellow]")
-            # Return neutral score on failure
-            return RubricResult(overall_score=0.5), 0.5
+    def _failed(self, error: Exception) -> tuple[RubricResult, float]:
+        console.print(f"    [yellow]LLM evaluation failed: {error}[/yellow]")
+        # Return neutral score on failure
+        return RubricResult(overall_score=0.5), 0.5
 
     def _collect_code(self, work_dir: Path) -> str:
-        """Collect all relevant code from work directory."""
-        code_parts = []
+        """Collect relevant code from work directory, up to ``max_prompt_chars``."""
         force_app = work_dir / "force-app"
 
         if not force_app.exists():
             return ""
 
-        # Collect Apex classes and triggers
-        for pattern in ["**/*.cls", "**/*.trigger"]:
-            for f in force_app.glob(pattern):
-                if "-meta.xml" not in f.name:
-                    try:
-                        content = f.read_text()
-                        code_parts.append(f"// File: {f.name}\n{content}")
-                    except Exception:
-                        pass
-
-        # Collect Flows
-        for f in force_app.glob("**/flows/*.flow-meta.xml"):
-            try:
-                content = f.read_text()
-                code_parts.append(f"<!-- File: {f.name} -->\n{content}")
-            except Exception:
-                pass
-
-        # Collect Validation Rules
-        for f in force_app.glob("**/validationRules/*.validationRule-meta.xml"):
-            try:
-                content = f.read_text()
-                code_parts.append(f"<!-- File: {f.name} -->\n{content}")
-            except Exception:
-                pass
-
-        # Collect LWC JavaScript
-        for f in force_app.glob("**/*.js"):
-            try:
-                content = f.read_text()
-                code_parts.append(f"// File: {f.name}\n{content}")
-            except Exception:
-                pass
-
-        return "\n\n".join(code_parts)
+        # One walk classifies Apex classes and triggers, Flows, Validation
+        # Rules and LWC JavaScript; reads are reused while nothing changed
+        files: list[tuple[int, str, str, int, int]] = []
+        _walk_code_files(str(force_app), files)
+        if not files:
+            return ""
+        files.sort(key=lambda f: f[0])
+
+        budget = self.config.max_prompt_chars
+        # Files are only read when one was added, removed or touched since the
+        # last run, here or (with caching on) in an earlier process
+        signature = [budget, [[f[2], f[3], f[4]] for f in files]]
+        cache_path = self._code_cache_path(work_dir)
+        code = self._cached_code(cache_path, signature)
+        if code is None:
+            latest_mtime_ns = max(f[4] for f in files)
+            code = _read_code(tuple(f[:4] for f in files), latest_mtime_ns, budget)
+            if cache_path is not None:
+                self._store_code(cache_path, signature, code)
+        return code
+
+    def _code_chunks(self, code: str) -> list[tuple[str, int]]:
+        """Split code into (chunk, tokens) pairs of at most ``chunk_tokens`` tokens."""
+        budget = self.config.chunk_tokens
+        if budget is None:
+            return [(code, 1)]
+        return _split_code(code, budget, self._count_tokens)
+
+    def _count_tokens(self, text: str) -> int:
+        # Exact for OpenAI models when tiktoken is installed, estimated otherwise
+        if self._provider() == "openai" and _has_tiktoken():
+            return len(_encoding(self.config.model).encode(text))
+        return _estimate_tokens(text)
 
     def _get_requirements(self, task: Task, work_dir: Path) -> str:
         """Get task requirements for context."""
@@ -239,28 +1078,120 @@ class RubricEvaluator:
         """
         # Build the prompt
         prompt = self._build_evaluation_prompt(code, requirements, rubric)
+        cache_path = self._cache_path(prompt)
+        cached = self._cached_result(cache_path)
+        if cached is not None:
+            return cached
 
         # Try to call LLM
         try:
-            response = self._call_llm(prompt)
-            result = self._parse_llm_response(response, rubric)
-            result.feedback = f"Evaluated by LLM ({self.config.model}). {result.feedback}"
-            console.print(f"    [green]LLM evaluation successful[/green]")
-            return result
-        except ValueError as e:
-            # API key not configured
-            console.print(f"    [yellow]LLM not configured: {e}[/yellow]")
-            if getattr(self.config, "fallback_to_heuristic", True):
-                console.print(f"    [dim]Falling back to heuristic evaluation[/dim]")
-                return self._heuristic_evaluation(code, rubric)
-            raise
+            response = self._call_llm(prompt, schema=_VERDICT_SCHEMA)
+        except Exception as e:
+            return self._fallback(e, code, rubric)
+        return self._llm_result(response, rubric, cache_path)
+
+    async def _evaluate_with_llm_async(
+        self,
+        code: str,
+        requirements: str,
+        rubric: list[dict[str, Any]],
+    ) -> RubricResult:
+        """Async variant of ``_evaluate_with_llm``."""
+        prompt = self._build_evaluation_prompt(code, requirements, rubric)
+        cache_path = self._cache_path(prompt)
+        cached = self._cached_result(cache_path)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self._call_llm_async(prompt, schema=_VERDICT_SCHEMA)
         except Exception as e:
+            return self._fallback(e, code, rubric)
+        return self._llm_result(response, rubric, cache_path)
+
+    def _llm_result(
+        self, response: str, rubric: list[dict[str, Any]], cache_path: Path | None = None
+    ) -> RubricResult:
+        result = self._parse_llm_response(response, rubric)
+        result.feedback = f"Evaluated by LLM ({self.config.model}). {result.feedback}"
+        if self.verbose:
+            console.print("    [green]LLM evaluation successful[/green]")
+        # Unparsable replies carry no criteria and are worth asking again
+        if cache_path is not None and result.criteria:
+            self._store_result(cache_path, result)
+        return result
+
+    def _cache_path(self, prompt: str) -> Path | None:
+        """Get the cache file for a prompt's verdict, or None if caching is off."""
+        if not self.config.cache_enabled:
+            return None
+        key = hashlib.sha256(
+            f"{self.config.model}\0{self.config.temperature}\0{prompt}".encode()
+        ).hexdigest()
+        return (self.config.cache_dir or DEFAULT_CACHE_DIR) / f"{key}.json"
+
+    def _cached_result(self, cache_path: Path | None) -> RubricResult | None:
+        if cache_path is None:
+            return None
+        try:
+            result = RubricResult.model_validate_json(cache_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        console.print("    [dim]Using cached LLM evaluation[/dim]")
+        return result
+
+    def _store_result(self, cache_path: Path, result: RubricResult) -> None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(result.model_dump_json())
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            console.print(f"    [dim]Could not cache LLM evaluation: {e}[/dim]")
+
+    def _code_cache_path(self, work_dir: Path) -> Path | None:
+        """Get the cache file for a solution's collected code, or None if caching is off."""
+        if not self.config.cache_enabled:
+            return None
+        key = hashlib.sha256(str(work_dir.resolve()).encode()).hexdigest()
+        return (self.config.cache_dir or DEFAULT_CACHE_DIR) / "code" / f"{key}.json"
+
+    def _cached_code(self, cache_path: Path | None, signature: list[Any]) -> str | None:
+        if cache_path is None:
+            return None
+        try:
+            data = json.loads(cache_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("signature") != signature:
+            return None
+        return data.get("code")
+
+    def _store_code(self, cache_path: Path, signature: list[Any], code: str) -> None:
+        # One entry per solution directory, replaced whenever its files change
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps({"signature": signature, "code": code}))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            console.print(f"    [dim]Could not cache collected code: {e}[/dim]")
+
+    def _fallback(
+        self, error: Exception, code: str, rubric: list[dict[str, Any]]
+    ) -> RubricResult:
+        """Fall back to heuristics after a failed LLM call, or re-raise."""
+        if isinstance(error, ValueError):
+            # API key not configured
+            console.print(f"    [yellow]LLM not configured: {error}[/yellow]")
+        else:
             # API call failed
-            console.print(f"    [yellow]LLM API call failed: {e}[/yellow]")
-            if getattr(self.config, "fallback_to_heuristic", True):
-                console.print(f"    [dim]Falling back to heuristic evaluation[/dim]")
-                return self._heuristic_evaluation(code, rubric)
-            raise
+            console.print(f"    [yellow]LLM API call failed: {error}[/yellow]")
+        if getattr(self.config, "fallback_to_heuristic", True):
+            console.print(f"    [dim]Falling back to heuristic evaluation[/dim]")
+            return self._heuristic_evaluation(code, rubric)
+        raise error
 
     def _build_evaluation_prompt(
         self,
@@ -269,10 +1200,7 @@ class RubricEvaluator:
         rubric: list[dict[str, Any]],
     ) -> str:
         """Build the evaluation prompt for the LLM."""
-        rubric_text = "\n".join(
-            f"{i+1}. {r['name']} (weight: {r['weight']}): {r['description']}"
-            for i, r in enumerate(rubric)
-        )
+        rubric_text = _rubric_text(rubric)
 
         return f"""You are an expert Salesforce developer evaluating code quality.
 
@@ -281,7 +1209,7 @@ class RubricEvaluator:
 
 ## Code to Evaluate:
 ```
-{code[:10000]}  # Truncate if too long
+{code}
 ```
 
 ## Evaluation Rubric:
@@ -305,7 +1233,56 @@ Return your evaluation as JSON in this format:
 }}
 """
 
-    def _call_llm(self, prompt: str) -> str:
+    def _build_batch_system_prompt(self, rubric: list[dict[str, Any]]) -> str:
+        """Build the part of a batch prompt shared by every request (cacheable)."""
+        return f"""You are an expert Salesforce developer evaluating code quality.
+
+## Evaluation Rubric:
+{_rubric_text(rubric)}
+
+## Instructions:
+You will be given several numbered tasks, each with its requirements and code.
+Evaluate each task's code independently against each criterion in the rubric.
+For each criterion:
+1. Assign a score from 0.0 to 1.0
+2. Provide brief reasoning
+
+Return your evaluations as JSON in this format, with one entry per task:
+{{
+    "evaluations": [
+        {{
+            "task": 1,
+            "criteria": [
+                {{
+                    "name": "Criterion Name",
+                    "score": 0.85,
+                    "reasoning": "Brief explanation"
+                }}
+            ],
+            "overall_feedback": "Summary of evaluation"
+        }}
+    ]
+}}
+"""
+
+    def _build_batch_prompt(self, items: list[tuple[str, str]]) -> str:
+        """Build the per-request part of a batch prompt from (code, requirements)."""
+        return "\n\n".join(
+            f"""## Task {i}
+
+### Requirements:
+{requirements}
+
+### Code to Evaluate:
+```
+{code}
+```"""
+            for i, (code, requirements) in enumerate(items, start=1)
+        )
+
+    def _call_llm(
+        self, prompt: str, system: str | None = None, schema: dict[str, Any] | None = None
+    ) -> str:
         """
         Call LLM API with support for multiple providers.
 
@@ -313,167 +1290,341 @@ Return your evaluation as JSON in this format:
         - Anthropic Claude
         - Google Gemini
         - OpenAI GPT
+
+        Rate limits and server errors are retried with backoff. If the
+        configured model still fails, each of ``fallback_models`` is tried in
+        turn, skipping providers whose circuit breaker is open. ``schema`` is
+        the JSON Schema the reply should conform to.
         """
-        import httpx
+        error: Exception | None = None
+        for provider, model in self._routes():
+            try:
+                text = self._send(prompt, system, provider, model, schema)
+            except Exception as e:
+                error = self._provider_failed(provider, e)
+                continue
+            self._breakers.pop(provider, None)
+            return text
+        raise error or RuntimeError("Every LLM provider is cooling down after repeated failures")
+
+    async def _call_llm_async(
+        self, prompt: str, system: str | None = None, schema: dict[str, Any] | None = None
+    ) -> str:
+        """Async variant of ``_call_llm`` on this evaluator's own client."""
+        error: Exception | None = None
+        for provider, model in self._routes():
+            try:
+                text = await self._send_async(prompt, system, provider, model, schema)
+            except Exception as e:
+                error = self._provider_failed(provider, e)
+                continue
+            self._breakers.pop(provider, None)
+            return text
+        raise error or RuntimeError("Every LLM provider is cooling down after repeated failures")
+
+    def _send(
+        self,
+        prompt: str,
+        system: str | None,
+        provider: str,
+        model: str,
+        schema: dict[str, Any] | None = None,
+    ) -> str:
+        url, headers, body, extract = self._build_request(prompt, system, provider, model, schema)
+        timeout = float(getattr(self.config, "timeout_seconds", 120))
+        client = shared_client()
+        delta = _STREAM_DELTAS.get(provider) if self.config.stream else None
+        if delta is not None:
+            body = {**body, "stream": True}
+
+        attempt = 0
+        while True:
+            with client.stream(
+                "POST", url, headers=headers, json=body, timeout=timeout
+            ) as response:
+                delay = _retry_delay(response, attempt)
+                if delay is None:
+                    if response.is_error:
+                        response.read()
+                        response.raise_for_status()
+                    if delta is None:
+                        response.read()
+                        return extract(response.json())
+                    return _read_stream(response.iter_lines(), delta)
+            time.sleep(delay)
+            attempt += 1
+
+    async def _send_async(
+        self,
+        prompt: str,
+        system: str | None,
+        provider: str,
+        model: str,
+        schema: dict[str, Any] | None = None,
+    ) -> str:
+        url, headers, body, extract = self._build_request(prompt, system, provider, model, schema)
+        timeout = float(getattr(self.config, "timeout_seconds", 120))
+        client = self._async_client()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        delta = _STREAM_DELTAS.get(provider) if self.config.stream else None
+        if delta is not None:
+            body = {**body, "stream": True}
+
+        attempt = 0
+        while True:
+            # Bound in-flight requests; backoff sleeps do not hold a slot
+            async with self._semaphore, client.stream(
+                "POST", url, headers=headers, json=body, timeout=timeout
+            ) as response:
+                delay = _retry_delay(response, attempt)
+                if delay is None:
+                    if response.is_error:
+                        await response.aread()
+                        response.raise_for_status()
+                    if delta is None:
+                        await response.aread()
+                        return extract(response.json())
+                    return await _read_stream_async(response.aiter_lines(), delta)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _provider(self) -> str:
+        """Get the configured judge model's provider."""
+        if self.config.provider == "auto":
+            return _detect_provider(self.config.model)
+        return self.config.provider
+
+    def _routes(self) -> list[tuple[str, str]]:
+        """Get (provider, model) pairs to try, configured model first."""
+        routes = [(self._provider(), self.config.model)]
+        for model in self.config.fallback_models:
+            provider = _detect_provider(model)
+            # Only fall back to providers that are set up
+            if _get_api_key(provider):
+                routes.append((provider, model))
+
+        now = time.monotonic()
+        return [r for r in routes if self._breakers.get(r[0], (0, 0.0))[1] <= now]
+
+    def _provider_failed(self, provider: str, error: Exception) -> Exception:
+        """Count a failed call against the provider's circuit breaker."""
+        # A missing API key is configuration, not an outage
+        if not isinstance(error, ValueError):
+            failures = self._breakers.get(provider, (0, 0.0))[0] + 1
+            open_until = 0.0
+            if failures >= BREAKER_FAILURE_THRESHOLD:
+                open_until = time.monotonic() + BREAKER_COOLDOWN_SECONDS
+            self._breakers[provider] = (failures, open_until)
+        if self.config.fallback_models:
+            console.print(f"    [yellow]{provider} call failed: {error}[/yellow]")
+        return error
+
+    def _async_client(self) -> httpx.AsyncClient:
+        # Async clients are bound to the loop that uses them, so each
+        # evaluator keeps its own rather than sharing a module-level one
+        if self._client is None:
+            self._client = new_async_client()
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client, if one was opened."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+    def _build_request(
+        self,
+        prompt: str,
+        system: str | None = None,
+        provider: str | None = None,
+        model: str | None = None,
+        schema: dict[str, Any] | None = None,
+    ) -> tuple[str, dict[str, str], dict[str, Any], Callable[[dict[str, Any]], str]]:
+        """
+        Build (url, headers, body, response text extractor) for the provider.
+
+        ``system`` is sent as the provider's system instruction; for Anthropic
+        it is marked for prompt caching, since it repeats across requests.
+        ``provider`` and ``model`` default to the configured ones. With
+        ``structured_output`` on, the reply is constrained to ``schema``
+        (Anthropic through a forced tool call, OpenAI through a JSON Schema
+        response format, Gemini to JSON output), unless the model is known
+        not to support it; such models are only prompted for the JSON.
+        """
+        model = model or self.config.model
+        if not (self.config.structured_output and _supports_structured_output(model)):
+            schema = None
 
         # Determine provider
-        provider = self.config.provider
+        provider = provider or self.config.provider
         if provider == "auto":
-            provider = _detect_provider(self.config.model)
+            provider = _detect_provider(model)
 
         # Get API key
         api_key = _get_api_key(provider)
         if not api_key:
             raise ValueError(f"No API key found for provider: {provider}")
 
-        timeout = getattr(self.config, "timeout_seconds", 120)
-
         if provider == "anthropic":
-            return self._call_anthropic(prompt, api_key, timeout)
-        elif provider == "google":
-            return self._call_google(prompt, api_key, timeout)
-        elif provider == "openai":
-            return self._call_openai(prompt, api_key, timeout)
-        else:
-            raise ValueError(f"Unsupported provider: {provider}")
-
-    def _call_anthropic(self, prompt: str, api_key: str, timeout: int) -> str:
-        """Call Anthropic Claude API."""
-        import httpx
-
-        console.print(f"    [dim]Calling Anthropic API ({self.config.model})...[/dim]")
-
-        response = httpx.post(
-            "https://api.anthropic.com/v1/messages",
-            headers={
-                "x-api-key": api_key,
-                "content-type": "application/json",
-                "anthropic-version": "2023-06-01",
-            },
-            json={
-                "model": self.config.model,
+            if self.verbose:
+                console.print(f"    [dim]Calling Anthropic API ({model})...[/dim]")
+            body = {
+                "model": model,
                 "max_tokens": self.config.max_tokens,
                 "temperature": self.config.temperature,
                 "messages": [{"role": "user", "content": prompt}],
-            },
-            timeout=float(timeout),
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data["content"][0]["text"]
-
-    def _call_google(self, prompt: str, api_key: str, timeout: int) -> str:
-        """Call Google Gemini API."""
-        import httpx
-
-        console.print(f"    [dim]Calling Google Gemini API ({self.config.model})...[/dim]")
-
-        # Map model name if needed
-        model = self.config.model
-        if not model.startswith("models/"):
-            model = f"models/{model}"
+            }
+            if system:
+                body["system"] = [
+                    {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+                ]
+            if schema:
+                body["tools"] = [
+                    {
+                        "name": VERDICT_TOOL_NAME,
+                        "description": "Submit the rubric evaluation",
+                        "input_schema": schema,
+                    }
+                ]
+                body["tool_choice"] = {"type": "tool", "name": VERDICT_TOOL_NAME}
+            return (
+                "https://api.anthropic.com/v1/messages",
+                {
+                    "x-api-key": api_key,
+                    "content-type": "application/json",
+                    "anthropic-version": "2023-06-01",
+                },
+                body,
+                _anthropic_text,
+            )
+        elif provider == "google":
+            if self.verbose:
+                console.print(f"    [dim]Calling Google Gemini API ({model})...[/dim]")
 
-        url = f"https://generativelanguage.googleapis.com/v1beta/{model}:generateContent"
+            # Map model name if needed
+            if not model.startswith("models/"):
+                model = f"models/{model}"
 
-        response = httpx.post(
-            url,
-            headers={
-                "Content-Type": "application/json",
-                "x-goog-api-key": api_key,
-            },
-            json={
+            body = {
                 "contents": [{"parts": [{"text": prompt}]}],
                 "generationConfig": {
                     "temperature": self.config.temperature,
                     "maxOutputTokens": self.config.max_tokens,
                 },
-            },
-            timeout=float(timeout),
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        # Extract text from response
-        candidates = data.get("candidates", [])
-        if candidates:
-            content = candidates[0].get("content", {})
-            parts = content.get("parts", [])
-            if parts:
-                return parts[0].get("text", "")
-
-        raise ValueError("No content in Gemini response")
-
-    def _call_openai(self, prompt: str, api_key: str, timeout: int) -> str:
-        """Call OpenAI API."""
-        import httpx
-
-        console.print(f"    [dim]Calling OpenAI API ({self.config.model})...[/dim]")
-
-        response = httpx.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": self.config.model,
+            }
+            if system:
+                body["systemInstruction"] = {"parts": [{"text": system}]}
+            if schema:
+                # Gemini takes an OpenAPI subset that cannot express the whole schema
+                body["generationConfig"]["responseMimeType"] = "application/json"
+            return (
+                f"https://generativelanguage.googleapis.com/v1beta/{model}:generateContent",
+                {
+                    "Content-Type": "application/json",
+                    "x-goog-api-key": api_key,
+                },
+                body,
+                _google_text,
+            )
+        elif provider == "openai":
+            if self.verbose:
+                console.print(f"    [dim]Calling OpenAI API ({model})...[/dim]")
+            messages = [{"role": "user", "content": prompt}]
+            if system:
+                messages.insert(0, {"role": "system", "content": system})
+            body = {
+                "model": model,
                 "max_tokens": self.config.max_tokens,
                 "temperature": self.config.temperature,
-                "messages": [{"role": "user", "content": prompt}],
-            },
-            timeout=float(timeout),
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data["choices"][0]["message"]["content"]
+                "messages": messages,
+            }
+            if schema:
+                body["response_format"] = {
+                    "type": "json_schema",
+                    "json_schema": {"name": "rubric", "strict": True, "schema": schema},
+                }
+            return (
+                f"{OPENAI_API_URL}/chat/completions",
+                {
+                    "Authorization": f"Bearer {api_key}",
+                    "Content-Type": "application/json",
+                },
+                body,
+                _openai_text,
+            )
+        else:
+            raise ValueError(f"Unsupported provider: {provider}")
 
     def _parse_llm_response(
         self, response: str, rubric: list[dict[str, Any]]
     ) -> RubricResult:
         """Parse LLM response into RubricResult."""
         try:
-            # Extract JSON from response
-            import re
-            json_match = re.search(r"\{.*\}", response, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
-            else:
+            data = _extract_json(response)
+            if data is None:
                 raise ValueError("No JSON found in response")
-
-            criteria = []
-            for item in data.get("criteria", []):
-                criteria.append(
-                    RubricCriterion(
-                        name=item.get("name", "Unknown"),
-                        weight=self._get_weight(item.get("name", ""), rubric),
-                        score=float(item.get("score", 0.5)),
-                        reasoning=item.get("reasoning", ""),
-                    )
-                )
-
-            # Calculate weighted overall score
-            if criteria:
-                total_weight = sum(c.weight for c in criteria)
-                overall = sum(c.score * c.weight for c in criteria) / total_weight
-            else:
-                overall = 0.5
-
-            return RubricResult(
-                overall_score=overall,
-                criteria=criteria,
-                feedback=data.get("overall_feedback", ""),
-            )
+            return self._result_from_data(data, rubric)
 
         except Exception as e:
             console.print(f"    [dim]Failed to parse LLM response: {e}[/dim]")
             return RubricResult(overall_score=0.5)
 
-    def _get_weight(self, name: str, rubric: list[dict[str, Any]]) -> float:
-        """Get weight for a criterion by name."""
-        for r in rubric:
-            if r["name"].lower() == name.lower():
-                return r["weight"]
-        return 0.2  # Default weight
+    def _parse_batch_response(
+        self, response: str, count: int, rubric: list[dict[str, Any]]
+    ) -> list[RubricResult]:
+        """Parse a batch LLM response into one RubricResult per task, in order."""
+        data = _extract_json(response) or {}
+        evaluations = data.get("evaluations")
+        by_task: dict[int, dict[str, Any]] = {}
+        for position, item in enumerate(evaluations if isinstance(evaluations, list) else []):
+            if not isinstance(item, dict):
+                continue
+            # Trust the task number if it is valid, else the position in the list
+            task = item.get("task")
+            index = task - 1 if isinstance(task, int) and 1 <= task <= count else position
+            by_task.setdefault(index, item)
+
+        results = []
+        for index in range(count):
+            try:
+                if index not in by_task:
+                    raise ValueError(f"No evaluation for task {index + 1}")
+                results.append(self._result_from_data(by_task[index], rubric))
+            except Exception as e:
+                console.print(f"    [dim]Failed to parse LLM response: {e}[/dim]")
+                results.append(RubricResult(overall_score=0.5))
+        return results
+
+    def _result_from_data(
+        self, data: dict[str, Any], rubric: list[dict[str, Any]]
+    ) -> RubricResult:
+        """Build a RubricResult from one decoded evaluation."""
+        weights = _rubric_weights(rubric)
+        criteria = []
+        for item in data.get("criteria", []):
+            criteria.append(
+                RubricCriterion(
+                    name=item.get("name", "Unknown"),
+                    weight=weights.get(item.get("name", "").lower(), DEFAULT_CRITERION_WEIGHT),
+                    score=float(item.get("score", 0.5)),
+                    reasoning=item.get("reasoning", ""),
+                )
+            )
+
+        # Calculate weighted overall score
+        if criteria:
+            total_weight = sum(c.weight for c in criteria)
+            overall = sum(c.score * c.weight for c in criteria) / total_weight
+        else:
+            overall = 0.5
+
+        return RubricResult(
+            overall_score=overall,
+            criteria=criteria,
+            feedback=data.get("overall_feedback", ""),
+        )
 
     def _heuristic_evaluation(
         self, code: str, rubric: list[dict[str, Any]]
@@ -485,177 +1636,177 @@ Return your evaluation as JSON in this format:
         - Apex code patterns
         - Flow metadata patterns
         - Validation rule patterns
+
+        Results are memoized, so re-runs and retries on the same code are free.
         """
-        criteria = []
-        code_lower = code.lower()
-
-        # Detect what type of code we're evaluating
-        has_apex = ".cls" in code or "public class" in code_lower or "@istest" in code_lower
-        has_flow = "<flow " in code_lower or "<recordupdates>" in code_lower or "flow-meta.xml" in code_lower
-        has_validation = "<validationrule" in code_lower or "errorformula" in code_lower
-
-        # Check for bulkification issues (Apex-specific)
-        bulkification_score = 0.8  # Start with good score
-        if has_apex:
-            soql_in_loop = (
-                "for(" in code_lower or "for (" in code_lower
-            ) and "[select" in code_lower
-            dml_in_loop = any(
-                op in code_lower
-                for op in ["insert ", "update ", "delete ", "upsert "]
-            ) and ("for(" in code_lower or "for (" in code_lower)
-
-            if soql_in_loop:
-                bulkification_score -= 0.4
-            if dml_in_loop:
-                bulkification_score -= 0.4
-            # Bonus for using collections
-            if "list<" in code_lower or "map<" in code_lower or "set<" in code_lower:
-                bulkification_score = min(1.0, bulkification_score + 0.2)
-
-        criteria.append(
-            RubricCriterion(
-                name="Bulkification",
-                weight=0.25,
-                score=max(0, bulkification_score),
-                reasoning="Heuristic check for SOQL/DML patterns and collections",
-            )
+        rubric_key = tuple((r["name"], r["weight"]) for r in rubric)
+        # Copied so callers cannot alter the cached result
+        return _heuristic_result(code, rubric_key).model_copy(deep=True)
+
+
+@lru_cache(maxsize=256)
+def _heuristic_result(code: str, rubric_key: tuple[tuple[str, float], ...]) -> RubricResult:
+    """Score ``code`` with rule-based checks (``rubric_key`` is part of the cache key)."""
+    criteria = []
+    # One scan sets a bit per token; each check below is a mask test
+    features = _scan_features(code)
+
+    # Detect what type of code we're evaluating
+    has_apex = bool(features & _APEX_MASK)
+    has_flow = bool(features & _FLOW_MASK)
+    has_validation = bool(features & _VALIDATION_MASK)
+    has_for_loop = bool(features & _FOR_LOOP_MASK)
+    has_collections = bool(features & _COLLECTIONS_MASK)
+
+    # Check for bulkification issues (Apex-specific)
+    bulkification_score = 0.8  # Start with good score
+    if has_apex:
+        soql_in_loop = has_for_loop and bool(features & _SOQL_MASK)
+        dml_in_loop = bool(features & _DML_MASK) and has_for_loop
+
+        if soql_in_loop:
+            bulkification_score -= 0.4
+        if dml_in_loop:
+            bulkification_score -= 0.4
+        # Bonus for using collections
+        if has_collections:
+            bulkification_score = min(1.0, bulkification_score + 0.2)
+
+    criteria.append(
+        RubricCriterion(
+            name="Bulkification",
+            weight=0.25,
+            score=max(0, bulkification_score),
+            reasoning="Heuristic check for SOQL/DML patterns and collections",
         )
-
-        # Check for async patterns (Apex-specific) or Flow patterns
-        async_score = 0.7  # Default neutral score
-        if has_apex:
-            has_async = any(
-                pattern in code_lower
-                for pattern in ["queueable", "batchable", "schedulable", "@future"]
-            )
-            async_score = 0.9 if has_async else 0.6
-        elif has_flow:
-            # Flows handle async through their execution mode
-            is_after_save = "aftersave" in code_lower or "triggertype>update" in code_lower
-            async_score = 0.85 if is_after_save else 0.7
-
-        criteria.append(
-            RubricCriterion(
-                name="Correct Use of Async Apex",
-                weight=0.20,
-                score=async_score,
-                reasoning="Checked for async patterns or Flow execution mode",
-            )
+    )
+
+    # Check for async patterns (Apex-specific) or Flow patterns
+    async_score = 0.7  # Default neutral score
+    if has_apex:
+        has_async = bool(features & _ASYNC_MASK)
+        async_score = 0.9 if has_async else 0.6
+    elif has_flow:
+        # Flows handle async through their execution mode
+        is_after_save = bool(features & _AFTER_SAVE_MASK)
+        async_score = 0.85 if is_after_save else 0.7
+
+    criteria.append(
+        RubricCriterion(
+            name="Correct Use of Async Apex",
+            weight=0.20,
+            score=async_score,
+            reasoning="Checked for async patterns or Flow execution mode",
         )
-
-        # Check for test quality
-        test_score = 0.5  # Default
-        if has_apex:
-            has_asserts = "system.assert" in code_lower
-            has_test_annotation = "@istest" in code_lower
-            has_testmethod = "testmethod" in code_lower
-            has_bulk_test = "200" in code or "list<" in code_lower and "for" in code_lower
-
-            test_score = 0.3
-            if has_test_annotation or has_testmethod:
-                test_score += 0.25
-            if has_asserts:
-                test_score += 0.25
-            if has_bulk_test:
-                test_score += 0.2  # Bonus for bulk testing
-
-        criteria.append(
-            RubricCriterion(
-                name="Test Quality",
-                weight=0.20,
-                score=min(1.0, test_score),
-                reasoning="Checked for test annotations, assertions, and bulk patterns",
-            )
+    )
+
+    # Check for test quality
+    test_score = 0.5  # Default
+    if has_apex:
+        has_asserts = bool(features & _ASSERT_MASK)
+        has_test_annotation = bool(features & _TEST_MASK)
+        has_bulk_test = bool(
+            features & _BULK_TEST_MASK
+            or features & _LIST_MASK and features & _FOR_MASK
         )
 
-        # Check for security
-        security_score = 0.7  # Default neutral
-        if has_apex:
-            has_crud_check = any(
-                pattern in code_lower
-                for pattern in ["isdeletable", "iscreateable", "isupdateable", "isaccessible", "stripfinal"]
-            )
-            # Check for hardcoded IDs (common Salesforce ID prefixes)
-            has_hardcoded_id = any(
-                prefix in code for prefix in ["001", "003", "005", "006", "00D", "00Q"]
-            )
-            has_with_security = "with security_enforced" in code_lower or "with user_mode" in code_lower
-
-            security_score = 0.6
-            if has_crud_check or has_with_security:
-                security_score += 0.3
-            if has_hardcoded_id:
-                security_score -= 0.2
-        elif has_validation:
-            # Validation rules inherently respect security model
-            security_score = 0.85
-        elif has_flow:
-            # Flows run in system context by default, check for user mode
-            security_score = 0.75
-
-        criteria.append(
-            RubricCriterion(
-                name="Security Best Practices",
-                weight=0.20,
-                score=max(0, min(1, security_score)),
-                reasoning="Checked for security patterns and hardcoded values",
-            )
+        test_score = 0.3
+        if has_test_annotation:
+            test_score += 0.25
+        if has_asserts:
+            test_score += 0.25
+        if has_bulk_test:
+            test_score += 0.2  # Bonus for bulk testing
+
+    criteria.append(
+        RubricCriterion(
+            name="Test Quality",
+            weight=0.20,
+            score=min(1.0, test_score),
+            reasoning="Checked for test annotations, assertions, and bulk patterns",
         )
-
-        # Code readability
-        readability_score = 0.6  # Default
-        if has_apex:
-            has_comments = "//" in code or "/*" in code
-            lines = code.split("\n")
-            avg_line_length = sum(len(line) for line in lines) / max(1, len(lines))
-            has_descriptive_names = any(
-                len(name) > 10 for name in re.findall(r'\b[a-z][a-zA-Z]+\b', code)
-            )
-
-            readability_score = 0.5
-            if has_comments:
-                readability_score += 0.15
-            if avg_line_length < 100:
-                readability_score += 0.15
-            if has_descriptive_names:
-                readability_score += 0.2
-        elif has_flow:
-            # Check Flow has descriptive labels
-            has_labels = "<label>" in code_lower
-            has_descriptions = "<description>" in code_lower
-            readability_score = 0.6
-            if has_labels:
-                readability_score += 0.2
-            if has_descriptions:
-                readability_score += 0.2
-
-        criteria.append(
-            RubricCriterion(
-                name="Code Readability",
-                weight=0.15,
-                score=min(1, readability_score),
-                reasoning="Checked for comments, naming, and structure",
-            )
+    )
+
+    # Check for security
+    security_score = 0.7  # Default neutral
+    if has_apex:
+        has_crud_check = bool(features & _CRUD_CHECK_MASK)
+        # Check for hardcoded IDs (15/18-char IDs with common key prefixes)
+        has_hardcoded_id = _SALESFORCE_ID_RE.search(code) is not None
+        has_with_security = bool(features & _SECURITY_MODE_MASK)
+
+        security_score = 0.6
+        if has_crud_check or has_with_security:
+            security_score += 0.3
+        if has_hardcoded_id:
+            security_score -= 0.2
+    elif has_validation:
+        # Validation rules inherently respect security model
+        security_score = 0.85
+    elif has_flow:
+        # Flows run in system context by default, check for user mode
+        security_score = 0.75
+
+    criteria.append(
+        RubricCriterion(
+            name="Security Best Practices",
+            weight=0.20,
+            score=max(0, min(1, security_score)),
+            reasoning="Checked for security patterns and hardcoded values",
         )
-
-        # Calculate overall weighted score
-        total_weight = sum(c.weight for c in criteria)
-        overall = sum(c.score * c.weight for c in criteria) / total_weight if total_weight > 0 else 0.5
-
-        # Determine code type for feedback
-        code_types = []
-        if has_apex:
-            code_types.append("Apex")
-        if has_flow:
-            code_types.append("Flow")
-        if has_validation:
-            code_types.append("Validation Rule")
-        code_type_str = ", ".join(code_types) if code_types else "Code"
-
-        return RubricResult(
-            overall_score=overall,
-            criteria=criteria,
-            feedback=f"Evaluated {code_type_str} using enhanced heuristic rules (LLM not available). "
-                     f"For more accurate evaluation, configure an LLM API key.",
+    )
+
+    # Code readability
+    readability_score = 0.6  # Default
+    if has_apex:
+        has_comments = bool(features & _COMMENT_MASK)
+        newlines = code.count("\n")
+        avg_line_length = (len(code) - newlines) / (newlines + 1)
+        has_descriptive_names = _DESCRIPTIVE_NAME_RE.search(code) is not None
+
+        readability_score = 0.5
+        if has_comments:
+            readability_score += 0.15
+        if avg_line_length < 100:
+            readability_score += 0.15
+        if has_descriptive_names:
+            readability_score += 0.2
+    elif has_flow:
+        # Check Flow has descriptive labels
+        has_labels = bool(features & _LABEL_MASK)
+        has_descriptions = bool(features & _DESCRIPTION_MASK)
+        readability_score = 0.6
+        if has_labels:
+            readability_score += 0.2
+        if has_descriptions:
+            readability_score += 0.2
+
+    criteria.append(
+        RubricCriterion(
+            name="Code Readability",
+            weight=0.15,
+            score=min(1, readability_score),
+            reasoning="Checked for comments, naming, and structure",
         )
+    )
+
+    # Calculate overall weighted score
+    total_weight = sum(c.weight for c in criteria)
+    overall = sum(c.score * c.weight for c in criteria) / total_weight if total_weight > 0 else 0.5
+
+    # Determine code type for feedback
+    code_types = []
+    if has_apex:
+        code_types.append("Apex")
+    if has_flow:
+        code_types.append("Flow")
+    if has_validation:
+        code_types.append("Validation Rule")
+    code_type_str = ", ".join(code_types) if code_types else "Code"
+
+    return RubricResult(
+        overall_score=overall,
+        criteria=criteria,
+        feedback=f"Evaluated {code_type_str} using enhanced heuristic rules (LLM not available). "
+                 f"For more accurate evaluation, configure an LLM API key.",
+    )
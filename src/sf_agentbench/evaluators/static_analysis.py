@@ -1,6 +1,7 @@
 """Layer 3: Static Code Analysis Evaluator."""
 
 from pathlib import Path
+from typing import Iterator
 
 from rich.console import Console
 
@@ -15,6 +16,19 @@ from sf_agentbench.models import (
 console = Console()
 
 
+def _iter_violations(raw: list[dict]) -> Iterator[PMDViolation]:
+    """Build PMDViolation models from scanner records as they are consumed."""
+    for v in raw:
+        yield PMDViolation(
+            rule=v.get("rule", "Unknown"),
+            severity=v.get("severity", "medium"),
+            file=v.get("file", "Unknown"),
+            line=v.get("line", 0),
+            column=v.get("column"),
+            message=v.get("message", ""),
+        )
+
+
 class StaticAnalysisEvaluator:
     """Evaluates code quality using PMD/Salesforce Code Analyzer."""
 
@@ -25,12 +39,16 @@ class StaticAnalysisEvaluator:
         project_dir: Path | None = None,
         pmd_config: PMDConfig | None = None,
         verbose: bool = False,
+        keep_violations: bool = True,
     ):
         self.sf_cli_path = sf_cli_path
         self.target_org = target_org
         self.project_dir = project_dir
         self.pmd_config = pmd_config or PMDConfig()
         self.verbose = verbose
+        # Scoring only needs the counts; without this the per-violation
+        # list is left empty on the result
+        self.keep_violations = keep_violations
 
     def evaluate(self, task: Task, work_dir: Path) -> tuple[StaticAnalysisResult, float]:
         """
@@ -63,17 +81,8 @@ class StaticAnalysisEvaluator:
 
         if result.data:
             data = result.data
-            violations = [
-                PMDViolation(
-                    rule=v.get("rule", "Unknown"),
-                    severity=v.get("severity", "medium"),
-                    file=v.get("file", "Unknown"),
-                    line=v.get("line", 0),
-                    column=v.get("column"),
-                    message=v.get("message", ""),
-                )
-                for v in data.get("violations", [])
-            ]
+            raw_violations = data.get("violations", [])
+            violations = list(_iter_violations(raw_violations)) if self.keep_violations else []
 
             analysis_result = StaticAnalysisResult(
                 total_violations=data.get("total_violations", 0),
@@ -99,11 +108,18 @@ class StaticAnalysisEvaluator:
 
                 if self.verbose:
                     # Show critical/high violations
-                    for v in violations:
-                        if v.severity in ("critical", "high"):
-                            console.print(
-                                f"      [dim]{v.severity}: {v.rule} at {v.file}:{v.line}[/dim]"
-                            )
+                    shown = (
+                        violations if self.keep_violations else _iter_violations(raw_violations)
+                    )
+                    lines = [
+                        f"      {v.severity}: {v.rule} at {v.file}:{v.line}"
+                        for v in shown
+                        if v.severity in ("critical", "high")
+                    ]
+                    if lines:
+                        console.print(
+                            "\n".join(lines), style="dim", markup=False, highlight=False
+                        )
 
         else:
             # Scanner not available or error
@@ -5,7 +5,7 @@ Provides the central communication hub between workers and REPL.
 
 import queue
 import threading
-from collections import defaultdict
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Callable, Any
@@ -25,6 +25,23 @@ from sf_agentbench.events.types import (
 # Type alias for event handlers
 EventHandler = Callable[[Event], None]
 
+# Most queued events the async processor publishes together
+ASYNC_BATCH_SIZE = 64
+
+# Log levels from least to most severe
+_LEVEL_ORDER = {LogLevel.DEBUG: 0, LogLevel.INFO: 1, LogLevel.WARN: 2, LogLevel.ERROR: 3}
+
+
+def _without(
+    handlers: tuple[EventHandler, ...], handler: EventHandler
+) -> tuple[EventHandler, ...] | None:
+    """Get a copy of ``handlers`` without the first ``handler``, or None if absent."""
+    try:
+        i = handlers.index(handler)
+    except ValueError:
+        return None
+    return handlers[:i] + handlers[i + 1:]
+
 
 class EventBus:
     """Thread-safe pub/sub event bus.
@@ -40,27 +57,43 @@ class EventBus:
         self,
         history_size: int = 1000,
         logger: logging.Logger | None = None,
+        queue_size: int = 0,
+        min_log_level: LogLevel = LogLevel.DEBUG,
     ):
         """Initialize the event bus.
         
         Args:
             history_size: Number of events to keep in history buffer
             logger: Optional logger for debugging
+            queue_size: Maximum queued async events; publish_async blocks
+                while the queue is full (0 for no limit)
+            min_log_level: Least severe level log() publishes; less severe
+                messages are dropped before an event is built
         """
         self._lock = threading.RLock()
-        self._subscribers: dict[type, list[EventHandler]] = defaultdict(list)
-        self._wildcard_subscribers: list[EventHandler] = []
+        # Copy-on-write: (un)subscribing swaps in new tuples under the lock,
+        # so publish can read them without taking it
+        self._subscribers: dict[type, tuple[EventHandler, ...]] = {}
+        self._wildcard_subscribers: tuple[EventHandler, ...] = ()
+        # Wildcard + typed handlers per event type, filled in by publish.
+        # Replaced (not cleared) after the subscribers change, so a publish
+        # racing with the change can only store into the discarded dict
+        self._dispatch_cache: dict[type, tuple[EventHandler, ...]] = {}
         
-        # Event history buffer (circular)
-        self._history: list[Event] = []
-        self._history_size = history_size
+        # Event history buffer (circular; the oldest event drops off when full)
+        self._history: deque[Event] = deque(maxlen=history_size)
+        # The same events by concrete type, numbered in publish order; an
+        # event leaves its type's deque when it leaves the history
+        self._recorded = 0
+        self._by_type: dict[type, deque[tuple[int, Event]]] = {}
         
-        # Event queue for async processing
-        self._queue: queue.Queue[Event] = queue.Queue()
+        # Event queue for async processing; None tells the processor to stop
+        self._queue: queue.Queue[Event | None] = queue.Queue(maxsize=queue_size)
         self._processing = False
         self._processor_thread: threading.Thread | None = None
         
         self._logger = logger or logging.getLogger(__name__)
+        self._min_level = _LEVEL_ORDER[min_log_level]
     
     def subscribe(
         self,
@@ -81,9 +114,13 @@ class EventBus:
         def decorator(fn: EventHandler) -> EventHandler:
             with self._lock:
                 if event_type is None:
-                    self._wildcard_subscribers.append(fn)
+                    self._wildcard_subscribers = self._wildcard_subscribers + (fn,)
                 else:
-                    self._subscribers[event_type].append(fn)
+                    self._subscribers = {
+                        **self._subscribers,
+                        event_type: self._subscribers.get(event_type, ()) + (fn,),
+                    }
+                self._dispatch_cache = {}
             return fn
         
         if handler is not None:
@@ -105,13 +142,23 @@ class EventBus:
             True if handler was found and removed
         """
         with self._lock:
+            # One scan both finds the handler and builds the replacement
             if event_type is None:
-                if handler in self._wildcard_subscribers:
-                    self._wildcard_subscribers.remove(handler)
+                remaining = _without(self._wildcard_subscribers, handler)
+                if remaining is not None:
+                    self._wildcard_subscribers = remaining
+                    self._dispatch_cache = {}
                     return True
             else:
-                if handler in self._subscribers[event_type]:
-                    self._subscribers[event_type].remove(handler)
+                remaining = _without(self._subscribers.get(event_type, ()), handler)
+                if remaining is not None:
+                    subscribers = dict(self._subscribers)
+                    if remaining:
+                        subscribers[event_type] = remaining
+                    else:
+                        del subscribers[event_type]
+                    self._subscribers = subscribers
+                    self._dispatch_cache = {}
                     return True
         return False
     
@@ -124,15 +171,48 @@ class EventBus:
             event: The event to publish
         """
         with self._lock:
-            # Add to history
-            self._history.append(event)
-            if len(self._history) > self._history_size:
-                self._history = self._history[-self._history_size:]
-            
-            # Get relevant handlers
-            handlers: list[EventHandler] = []
-            handlers.extend(self._wildcard_subscribers)
-            handlers.extend(self._subscribers.get(type(event), []))
+            self._record(event)
+        
+        self._dispatch(event)
+    
+    def publish_many(self, events: list[Event]) -> None:
+        """Publish several events in order, recording them in history at once.
+        
+        Args:
+            events: The events to publish
+        """
+        with self._lock:
+            for event in events:
+                self._record(event)
+        
+        for event in events:
+            self._dispatch(event)
+    
+    def _record(self, event: Event) -> None:
+        """Add an event to history and the type index (call with the lock held)."""
+        if not self._history.maxlen:
+            return  # history disabled
+        if len(self._history) == self._history.maxlen:
+            # The event about to drop off history is the oldest of its type
+            evicted = self._history[0]
+            evicted_index = self._by_type[type(evicted)]
+            evicted_index.popleft()
+            if not evicted_index:
+                del self._by_type[type(evicted)]
+        
+        self._recorded += 1
+        self._history.append(event)
+        index = self._by_type.get(type(event))
+        if index is None:
+            index = self._by_type[type(event)] = deque()
+        index.append((self._recorded, event))
+    
+    def _dispatch(self, event: Event) -> None:
+        """Call the handlers subscribed to an event."""
+        handlers = self._handlers(type(event))
+        if not handlers:
+            # Nobody is listening; the event is only kept in history
+            return
         
         # Call handlers outside lock to prevent deadlocks
         for handler in handlers:
@@ -141,6 +221,26 @@ class EventBus:
             except Exception as e:
                 self._logger.error(f"Event handler error: {e}", exc_info=True)
     
+    def is_subscribed(self, event_type: type[Event]) -> bool:
+        """Check whether events of a type would reach any handler.
+        
+        Args:
+            event_type: Type of events to check
+        
+        Returns:
+            True if a wildcard or type-specific handler is subscribed
+        """
+        return bool(self._handlers(event_type))
+    
+    def _handlers(self, event_type: type[Event]) -> tuple[EventHandler, ...]:
+        """Get the handlers for an event type from the current subscriber snapshot."""
+        cache = self._dispatch_cache
+        handlers = cache.get(event_type)
+        if handlers is None:
+            handlers = self._wildcard_subscribers + self._subscribers.get(event_type, ())
+            cache[event_type] = handlers
+        return handlers
+    
     def publish_async(self, event: Event) -> None:
         """Queue an event for async processing.
         
@@ -171,21 +271,37 @@ class EventBus:
         Args:
             timeout: Seconds to wait for processing to complete
         """
+        if not self._processing:
+            return
+        
         self._processing = False
         if self._processor_thread and self._processor_thread.is_alive():
+            # Events queued before the sentinel are still published
+            self._queue.put(None)
             self._processor_thread.join(timeout=timeout)
     
     def _process_queue(self) -> None:
         """Background thread for processing async events."""
-        while self._processing:
+        while True:
+            # Block until there is work rather than polling, then take
+            # whatever else is already queued (up to the sentinel)
+            batch = [self._queue.get()]
+            while batch[-1] is not None and len(batch) < ASYNC_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = batch[-1] is None
             try:
-                event = self._queue.get(timeout=0.1)
-                self.publish(event)
-                self._queue.task_done()
-            except queue.Empty:
-                continue
+                self.publish_many(batch[:-1] if stop else batch)
             except Exception as e:
                 self._logger.error(f"Queue processing error: {e}", exc_info=True)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                break
     
     def get_history(
         self,
@@ -208,12 +324,23 @@ class EventBus:
             List of matching events (newest first)
         """
         with self._lock:
-            events = list(reversed(self._history))
+            if event_type is None:
+                events = list(reversed(self._history))
+            else:
+                # Only the indexed types that match are scanned
+                entries = [
+                    entry
+                    for t, index in self._by_type.items()
+                    if issubclass(t, event_type)
+                    for entry in index
+                ]
         
-        # Apply filters
-        if event_type:
-            events = [e for e in events if isinstance(e, event_type)]
+        if event_type is not None:
+            # Newest first, across the matching types
+            entries.sort(key=lambda entry: entry[0], reverse=True)
+            events = [e for _, e in entries]
         
+        # Apply filters
         if since:
             events = [e for e in events if e.timestamp >= since]
         
@@ -261,6 +388,7 @@ class EventBus:
         """Clear the event history buffer."""
         with self._lock:
             self._history.clear()
+            self._by_type.clear()
     
     # Convenience methods for common events
     
@@ -273,6 +401,8 @@ class EventBus:
         **details,
     ) -> None:
         """Publish a log event."""
+        if _LEVEL_ORDER[level] < self._min_level:
+            return
         event = LogEvent(
             level=level,
             source=source,
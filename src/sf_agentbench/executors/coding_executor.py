@@ -236,7 +236,8 @@ class CodingExecutor(Executor):
             )
             
             phase_results[phase] = phase_result
-            total_cost = total_cost.add(phase_result.get("cost", Cost()))
+            if "cost" in phase_result:
+                total_cost.iadd(phase_result["cost"])
             total_duration += phase_result.get("duration", 0.0)
             
             if not phase_result.get("success", False):
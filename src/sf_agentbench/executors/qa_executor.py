@@ -157,7 +157,7 @@ class QAExecutor(Executor):
             if result["is_correct"]:
                 correct += 1
             
-            total_cost = total_cost.add(result["cost"])
+            total_cost.iadd(result["cost"])
             total_duration += result["duration"]
             
             # Track by domain
@@ -1,10 +1,9 @@
 """Task loading and discovery."""
 
+import os
 from pathlib import Path
 from typing import Iterator
 
-import yaml
-
 from sf_agentbench.models import Task, TaskTier, TaskCategory
 
 
@@ -14,27 +13,36 @@ class TaskLoader:
     def __init__(self, tasks_dir: Path):
         self.tasks_dir = tasks_dir
         self._tasks: dict[str, Task] = {}
+        self._readmes: dict[tuple[str, int | None], str] = {}
 
     def discover_tasks(self) -> list[Task]:
         """Discover all tasks in the tasks directory."""
-        tasks = []
+        return sorted(self.iter_tasks(), key=lambda t: (t.tier, t.id))
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """Yield tasks as they are found on disk.
 
+        Unlike ``discover_tasks`` nothing is buffered or sorted, so callers
+        can start rendering before the whole directory has been walked.
+        """
         if not self.tasks_dir.exists():
-            return tasks
+            return
 
         # Look for task directories with task.yaml files
-        for task_dir in self.tasks_dir.rglob("task.yaml"):
+        for task_yaml in _walk_task_files(str(self.tasks_dir)):
             try:
-                task = self._load_task(task_dir)
-                tasks.append(task)
-                self._tasks[task.id] = task
+                task = self._load_task(Path(task_yaml))
             except Exception as e:
-                print(f"Warning: Failed to load task from {task_dir}: {e}")
-
-        return sorted(tasks, key=lambda t: (t.tier, t.id))
+                print(f"Warning: Failed to load task from {task_yaml}: {e}")
+                continue
+            self._tasks[task.id] = task
+            yield task
 
     def _load_task(self, task_yaml_path: Path) -> Task:
         """Load a single task from its YAML definition."""
+        # Imported here so that importing the package does not load yaml
+        import yaml
+
         task_dir = task_yaml_path.parent
 
         with open(task_yaml_path) as f:
@@ -101,16 +109,46 @@ class TaskLoader:
 
         return [t for t in self._tasks.values() if category in t.categories]
 
-    def iter_tasks(self) -> Iterator[Task]:
-        """Iterate over all discovered tasks."""
-        if not self._tasks:
-            self.discover_tasks()
+    def get_task_readme(self, task: Task, max_chars: int | None = None) -> str:
+        """Get the README content for a task.
 
-        yield from self._tasks.values()
+        Results are cached per task for the lifetime of the loader. When
+        ``max_chars`` is given only that many characters are read from disk.
+        """
+        key = (task.id, max_chars)
+        if key in self._readmes:
+            return self._readmes[key]
 
-    def get_task_readme(self, task: Task) -> str:
-        """Get the README content for a task."""
         readme_path = task.path / "README.md"
-        if readme_path.exists():
-            return readme_path.read_text()
-        return task.description
+        try:
+            with open(readme_path, encoding="utf-8", errors="replace") as f:
+                readme = f.read(-1 if max_chars is None else max_chars)
+        except FileNotFoundError:
+            readme = task.description if max_chars is None else task.description[:max_chars]
+
+        self._readmes[key] = readme
+        return readme
+
+
+def _walk_task_files(root: str) -> Iterator[str]:
+    """Yield paths of ``task.yaml`` files below ``root``.
+
+    Uses ``os.scandir`` rather than ``Path.rglob`` so no ``Path`` objects are
+    built for the (potentially large) force-app trees inside each task. A
+    directory holding a ``task.yaml`` is treated as a task and not descended
+    into any further.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return
+
+    for entry in entries:
+        if entry.name == "task.yaml" and entry.is_file():
+            yield entry.path
+            return
+
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk_task_files(entry.path)
@@ -0,0 +1,33 @@
+"""Shared HTTP clients for LLM API calls."""
+
+import importlib.util
+import threading
+
+import httpx
+
+# HTTP/2 multiplexing needs the optional h2 package
+HTTP2 = importlib.util.find_spec("h2") is not None
+LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+
+# Keep-alive pool shared by all synchronous judge and rubric calls
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+
+def shared_client() -> httpx.Client:
+    """Get the process-wide HTTP client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(http2=HTTP2, limits=LIMITS)
+    return _client
+
+
+def new_async_client() -> httpx.AsyncClient:
+    """Create an async client with the shared pool settings.
+
+    Async clients are bound to the event loop that uses them, so callers
+    keep their own rather than sharing one process-wide.
+    """
+    return httpx.AsyncClient(http2=HTTP2, limits=LIMITS)
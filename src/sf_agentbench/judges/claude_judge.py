@@ -12,6 +12,7 @@ from rich.console import Console
 
 from sf_agentbench.judges.base import Judge, JudgeResult, Rubric
 from sf_agentbench.domain.costs import get_cost_profile, estimate_tokens
+from sf_agentbench.http import shared_client
 
 console = Console()
 
@@ -128,9 +129,7 @@ class ClaudeJudge(Judge):
         Returns:
             Tuple of (response_text, input_tokens, output_tokens)
         """
-        import httpx
-        
-        response = httpx.post(
+        response = shared_client().post(
             "https://api.anthropic.com/v1/messages",
             headers={
                 "x-api-key": self.api_key,
@@ -12,6 +12,7 @@ from rich.console import Console
 
 from sf_agentbench.judges.base import Judge, JudgeResult, Rubric
 from sf_agentbench.domain.costs import get_cost_profile, estimate_tokens
+from sf_agentbench.http import shared_client
 
 console = Console()
 
@@ -171,11 +172,9 @@ class GeminiJudge(Judge):
         Returns:
             Tuple of (response_text, input_tokens, output_tokens)
         """
-        import httpx
-        
         url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:generateContent"
         
-        response = httpx.post(
+        response = shared_client().post(
             url,
             params={"key": self.api_key},
             json={
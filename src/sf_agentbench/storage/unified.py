@@ -6,7 +6,6 @@ Provides a single storage layer for all test types and results.
 import json
 import sqlite3
 from dataclasses import dataclass, asdict
-from datetime import datetime
 from pathlib import Path
 from typing import Any, Iterator
 import uuid
@@ -22,6 +21,8 @@ from sf_agentbench.domain.models import (
     WorkUnitStatus,
     Result,
     Cost,
+    iso_to_timestamp,
+    timestamp_to_iso,
 )
 from sf_agentbench.domain.metrics import PerformanceMetrics
 
@@ -178,7 +179,7 @@ class UnifiedStore:
                     benchmark.name,
                     benchmark.version,
                     benchmark.description,
-                    benchmark.created_at.isoformat(),
+                    timestamp_to_iso(benchmark.created_at),
                 ),
             )
             
@@ -209,7 +210,7 @@ class UnifiedStore:
                 version=row["version"],
                 description=row["description"] or "",
                 tests=tests,
-                created_at=datetime.fromisoformat(row["created_at"]),
+                created_at=iso_to_timestamp(row["created_at"]),
             )
     
     def list_benchmarks(self) -> list[Benchmark]:
@@ -402,9 +403,9 @@ class UnifiedStore:
                     work_unit.max_retries,
                     work_unit.scratch_org,
                     str(work_unit.work_dir) if work_unit.work_dir else None,
-                    work_unit.created_at.isoformat(),
-                    work_unit.started_at.isoformat() if work_unit.started_at else None,
-                    work_unit.completed_at.isoformat() if work_unit.completed_at else None,
+                    timestamp_to_iso(work_unit.created_at),
+                    timestamp_to_iso(work_unit.started_at) if work_unit.started_at else None,
+                    timestamp_to_iso(work_unit.completed_at) if work_unit.completed_at else None,
                 ),
             )
             
@@ -475,9 +476,9 @@ class UnifiedStore:
                 agent=agent,
                 status=WorkUnitStatus(row["status"]),
                 result=result,
-                created_at=datetime.fromisoformat(row["created_at"]),
-                started_at=datetime.fromisoformat(row["started_at"]) if row["started_at"] else None,
-                completed_at=datetime.fromisoformat(row["completed_at"]) if row["completed_at"] else None,
+                created_at=iso_to_timestamp(row["created_at"]),
+                started_at=iso_to_timestamp(row["started_at"]) if row["started_at"] else None,
+                completed_at=iso_to_timestamp(row["completed_at"]) if row["completed_at"] else None,
                 scratch_org=row["scratch_org"],
                 work_dir=Path(row["work_dir"]) if row["work_dir"] else None,
                 priority=row["priority"],
@@ -121,27 +121,27 @@ async def list_models(
 ):
     """List all supported AI models."""
     import os
-    from sf_agentbench.config import MODEL_REGISTRY, ModelProvider
+    from sf_agentbench.config import ModelProvider, get_model_registry
 
     models = []
-    all_models = MODEL_REGISTRY.all_models
+    all_models = get_model_registry().all_models
 
     for model_id, meta in all_models.items():
         # Filter by provider if specified
-        if provider and meta["provider"].value != provider:
+        if provider and meta.provider.value != provider:
             continue
 
         # Check if API key is available
-        api_key_env = meta.get("api_key_env", "")
+        api_key_env = meta.api_key_env or ""
         is_available = bool(os.getenv(api_key_env)) if api_key_env else False
 
         models.append(
             ModelResponse(
                 id=model_id,
-                name=meta.get("name", model_id),
-                provider=meta["provider"].value,
+                name=meta.name or model_id,
+                provider=meta.provider.value,
                 api_key_env=api_key_env,
-                context_window=meta.get("context_window", 0),
+                context_window=meta.context_window,
                 is_available=is_available,
             )
         )
@@ -153,22 +153,22 @@ async def list_models(
 async def get_model(model_id: str):
     """Get details of a specific AI model."""
     import os
-    from sf_agentbench.config import MODEL_REGISTRY
+    from sf_agentbench.config import get_model_registry
 
-    all_models = MODEL_REGISTRY.all_models
+    all_models = get_model_registry().all_models
     if model_id not in all_models:
         raise HTTPException(status_code=404, detail=f"Model not found: {model_id}")
 
     meta = all_models[model_id]
-    api_key_env = meta.get("api_key_env", "")
+    api_key_env = meta.api_key_env or ""
     is_available = bool(os.getenv(api_key_env)) if api_key_env else False
 
     return ModelResponse(
         id=model_id,
-        name=meta.get("name", model_id),
-        provider=meta["provider"].value,
+        name=meta.name or model_id,
+        provider=meta.provider.value,
         api_key_env=api_key_env,
-        context_window=meta.get("context_window", 0),
+        context_window=meta.context_window,
         is_available=is_available,
     )
 
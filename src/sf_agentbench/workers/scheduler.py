@@ -7,12 +7,14 @@ import threading
 import queue
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import count
 from typing import Iterator, Callable
 import logging
 
 from sf_agentbench.domain.models import (
     WorkUnit,
     WorkUnitStatus,
+    WorkQueue,
     Test,
     TestType,
     Benchmark,
@@ -211,7 +213,11 @@ class Scheduler:
         self.scratch_org_pool = scratch_org_pool
         self.logger = logger or logging.getLogger("scheduler")
         
-        self._pending: list[WorkUnit] = []
+        # Pending units per resource class; the shared counter keeps
+        # FIFO order on equal priority across both queues
+        sequence = count()
+        self._pending_qa = WorkQueue(counter=sequence)
+        self._pending_coding = WorkQueue(counter=sequence)
         self._running_qa: list[WorkUnit] = []
         self._running_coding: list[WorkUnit] = []
         
@@ -232,10 +238,7 @@ class Scheduler:
                     else:
                         work_unit.priority = self.config.priority_coding
                 
-                self._pending.append(work_unit)
-            
-            # Sort by priority (descending)
-            self._pending.sort(key=lambda w: -w.priority)
+                self._pending_for(work_unit).push(work_unit)
     
     def get_next(self) -> WorkUnit | None:
         """Get the next work unit to execute.
@@ -244,18 +247,19 @@ class Scheduler:
             Next work unit, or None if none available
         """
         with self._lock:
-            if not self._pending:
+            # Highest-priority head among the queues with a free resource
+            candidates = [
+                pending
+                for pending in (self._pending_qa, self._pending_coding)
+                if pending and self._can_run(pending.peek())
+            ]
+            if not candidates:
                 return None
             
-            # Check resource constraints
-            for i, work_unit in enumerate(self._pending):
-                if self._can_run(work_unit):
-                    # Remove from pending and mark as running
-                    self._pending.pop(i)
-                    self._mark_running(work_unit)
-                    return work_unit
-            
-            return None
+            # Remove from pending and mark as running
+            work_unit = min(candidates, key=WorkQueue.head_key).pop()
+            self._mark_running(work_unit)
+            return work_unit
     
     def mark_complete(self, work_unit: WorkUnit) -> None:
         """Mark a work unit as complete and free resources.
@@ -271,6 +275,12 @@ class Scheduler:
                 if work_unit in self._running_coding:
                     self._running_coding.remove(work_unit)
     
+    def _pending_for(self, work_unit: WorkUnit) -> WorkQueue:
+        """Get the pending queue for a work unit's resource class."""
+        if work_unit.test.type == TestType.QA:
+            return self._pending_qa
+        return self._pending_coding
+    
     def _can_run(self, work_unit: WorkUnit) -> bool:
         """Check if a work unit can be run given current resources."""
         if work_unit.test.type == TestType.QA:
@@ -295,7 +305,7 @@ class Scheduler:
         """Get scheduler status."""
         with self._lock:
             return {
-                "pending": len(self._pending),
+                "pending": len(self._pending_qa) + len(self._pending_coding),
                 "running_qa": len(self._running_qa),
                 "running_coding": len(self._running_coding),
                 "qa_slots": f"{len(self._running_qa)}/{self.config.qa_slots}",
@@ -1,5 +1,8 @@
 """Tests for SF-AgentBench configuration."""
 
+import subprocess
+import sys
+
 import pytest
 from pathlib import Path
 
@@ -10,6 +13,8 @@ from sf_agentbench.config import (
     PMDConfig,
     RubricConfig,
     load_config,
+    ModelProvider,
+    ModelRegistry,
 )
 
 
@@ -21,6 +26,16 @@ class TestEvaluationWeights:
         weights = EvaluationWeights()
         assert weights.validate_sum()
 
+    def test_validate_sum_after_copy(self):
+        """Test that the sum check sees fields changed without validation."""
+        weights = EvaluationWeights().model_copy(
+            update={"static_analysis": 0.5, "deployment": 0.0}
+        )
+        assert not weights.validate_sum()
+
+        weights.static_analysis = 0.30
+        assert weights.validate_sum()
+
     def test_custom_weights_validation(self):
         """Test weight validation."""
         # Valid weights
@@ -43,6 +58,15 @@ class TestEvaluationWeights:
         )
         assert not weights.validate_sum()
 
+    def test_validate_sum_tracks_assignment(self):
+        """Test that editing a weight updates validation."""
+        weights = EvaluationWeights()
+        weights.rubric = 0.5
+        assert not weights.validate_sum()
+
+        weights.rubric = 0.15
+        assert weights.validate_sum()
+
 
 class TestBenchmarkConfig:
     """Tests for BenchmarkConfig."""
@@ -87,6 +111,18 @@ parallel_runs: 3
         assert config.verbose is True
         assert config.parallel_runs == 3
 
+    def test_config_yaml_round_trip(self, tmp_path):
+        """Test that a saved config can be loaded back."""
+        config = BenchmarkConfig(tasks_dir=Path("my_tasks"), parallel_runs=4)
+        yaml_path = tmp_path / "config.yaml"
+
+        config.to_yaml(yaml_path)
+        loaded = BenchmarkConfig.from_yaml(yaml_path)
+
+        assert loaded.tasks_dir == Path("my_tasks")
+        assert loaded.parallel_runs == 4
+        assert loaded.agent.model == config.agent.model
+
 
 class TestScratchOrgConfig:
     """Tests for ScratchOrgConfig."""
@@ -148,3 +184,33 @@ verbose: true
 
         assert config.tasks_dir == Path("my_tasks")
         assert config.verbose is True
+
+
+class TestModelRegistry:
+    """Tests for ModelRegistry."""
+
+    def test_list_by_provider_tracks_custom_models(self):
+        """Test that provider listings follow custom model registration."""
+        registry = ModelRegistry()
+        assert "gpt-4o" in registry.list_by_provider(ModelProvider.OPENAI)
+
+        registry.add_custom_model("my-model", "My Model", provider=ModelProvider.OPENAI)
+        assert registry.list_by_provider(ModelProvider.OPENAI)[-1] == "my-model"
+
+        # Re-registering under a different provider moves it
+        registry.add_custom_model("my-model", "My Model", provider=ModelProvider.CUSTOM)
+        assert "my-model" not in registry.list_by_provider(ModelProvider.OPENAI)
+        assert registry.list_by_provider(ModelProvider.CUSTOM) == ["my-model"]
+        assert registry.get_model("my-model").provider == ModelProvider.CUSTOM
+
+    def test_cli_import_is_lazy(self):
+        """Test that importing the CLI neither builds the registry nor loads yaml."""
+        code = (
+            "import sys, sf_agentbench.cli, sf_agentbench.config as config; "
+            "print('yaml' in sys.modules, config._registry is None)"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+
+        assert out.split() == ["False", "True"]
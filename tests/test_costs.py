@@ -0,0 +1,55 @@
+"""Tests for SF-AgentBench cost tracking."""
+
+import pytest
+
+from sf_agentbench.domain.costs import CostSummary, CostTracker, get_cost_profile
+from sf_agentbench.domain.models import Cost
+
+
+class TestCostTracker:
+    """Tests for CostTracker."""
+
+    def test_totals(self):
+        """Test that totals accumulate across entries."""
+        tracker = CostTracker(model="gpt-4o")
+        tracker.add(input_tokens=1000, output_tokens=500)
+        tracker.add(input_text="x" * 400, output_text="y" * 80)
+
+        profile = get_cost_profile("gpt-4o")
+        expected_usd = profile.estimate(1000, 500) + profile.estimate(100, 20)
+
+        assert tracker.entry_count == 2
+        assert tracker.total_input_tokens == 1100
+        assert tracker.total_output_tokens == 520
+        assert tracker.total_usd == pytest.approx(expected_usd)
+        assert tracker.total.total_tokens == 1620
+        assert tracker.to_dict()["total_usd"] == pytest.approx(expected_usd)
+
+    def test_costs_materialized_on_read(self):
+        """Test that individual entries are available as Cost objects."""
+        tracker = CostTracker(model="unknown-model")
+        usd = tracker.add(input_tokens=10, output_tokens=5)
+
+        assert tracker.costs == [Cost(input_tokens=10, output_tokens=5, estimated_usd=usd)]
+
+
+class TestCostSummary:
+    """Tests for CostSummary."""
+
+    def test_total_and_breakdown(self):
+        """Test totals and breakdown formatting across models."""
+        summary = CostSummary()
+        summary.add("gpt-4o", Cost(input_tokens=1000, output_tokens=100, estimated_usd=0.25))
+        summary.add("sonnet", Cost(input_tokens=2000, output_tokens=200, estimated_usd=1.0))
+        summary.add("gpt-4o", Cost(input_tokens=1000, output_tokens=100, estimated_usd=0.25))
+
+        assert summary.total.input_tokens == 4000
+        assert summary.total_usd == pytest.approx(1.5)
+
+        breakdown = summary.format_breakdown()
+        assert breakdown.splitlines() == [
+            "Cost Breakdown:",
+            "  sonnet: $1.0000 (2,000 in / 200 out)",
+            "  gpt-4o: $0.5000 (2,000 in / 200 out)",
+            "  Total: $1.5000",
+        ]
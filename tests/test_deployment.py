@@ -0,0 +1,65 @@
+"""Tests for SF-AgentBench deployment evaluation."""
+
+from sf_agentbench.aci import SFDeploy
+from sf_agentbench.aci.base import ACIToolResult
+from sf_agentbench.evaluators import deployment
+from sf_agentbench.evaluators.deployment import DeploymentEvaluator
+from sf_agentbench.models import DeploymentStatus
+
+
+def _flaky_deploy(monkeypatch, failures: int, message: str = "socket hang up"):
+    """Make SFDeploy fail ``failures`` times before succeeding."""
+    calls = []
+
+    def execute(self, **kwargs):
+        calls.append(kwargs)
+        if len(calls) <= failures:
+            return ACIToolResult(success=False, errors=[{"message": message}])
+        return ACIToolResult(success=True, data={"deployed_count": 2})
+
+    monkeypatch.setattr(SFDeploy, "execute", execute)
+    return calls
+
+
+class TestDeploymentEvaluator:
+    """Tests for DeploymentEvaluator."""
+
+    def test_retries_transient_errors(self, monkeypatch, sample_task):
+        """Test that transient errors are retried until success."""
+        calls = _flaky_deploy(monkeypatch, failures=2)
+        monkeypatch.setattr(deployment.time, "sleep", lambda seconds: None)
+
+        result, score = DeploymentEvaluator().evaluate(sample_task, sample_task.path)
+
+        assert len(calls) == 3
+        assert score == 1.0
+        assert result.deployed_count == 2
+
+    def test_real_error_is_not_retried(self, monkeypatch, sample_task):
+        """Test that a non-transient error fails on the first attempt."""
+        calls = _flaky_deploy(monkeypatch, failures=5, message="Invalid field")
+
+        result, score = DeploymentEvaluator().evaluate(sample_task, sample_task.path)
+
+        assert len(calls) == 1
+        assert score == 0.0
+        assert result.status == DeploymentStatus.FAILURE
+        assert result.errors[0].message == "Invalid field"
+
+    async def test_evaluate_async_matches_sync(self, monkeypatch, sample_task):
+        """Test the async evaluation path with backoff."""
+        calls = _flaky_deploy(monkeypatch, failures=1)
+        waits = []
+
+        async def sleep(seconds):
+            waits.append(seconds)
+
+        monkeypatch.setattr(deployment.asyncio, "sleep", sleep)
+
+        result, score = await DeploymentEvaluator().evaluate_async(
+            sample_task, sample_task.path
+        )
+
+        assert len(calls) == 2
+        assert waits == [2]
+        assert score == 1.0
@@ -0,0 +1,102 @@
+"""Tests for SF-AgentBench domain models."""
+
+from sf_agentbench.domain import models
+from sf_agentbench.domain.models import (
+    Agent,
+    Benchmark,
+    CodingTest,
+    Cost,
+    QATest,
+    Result,
+    WorkQueue,
+    WorkUnit,
+)
+
+
+class TestCost:
+    """Tests for Cost."""
+
+    def test_iadd_matches_add(self):
+        """Test that in-place addition agrees with ``add``."""
+        total = Cost(10, 20, 0.5)
+        other = Cost(1, 2, 0.25)
+        expected = total.add(other)
+
+        total.iadd(other)
+
+        assert total == expected
+
+
+class TestBenchmark:
+    """Tests for Benchmark."""
+
+    def test_tests_by_type(self):
+        """Test type buckets for added and constructor-supplied tests."""
+        qa = QATest(id="qa-1", type=models.TestType.QA, name="QA")
+        benchmark = Benchmark(id="bench", name="Bench", tests=[qa])
+        coding = CodingTest(id="code-1", type=models.TestType.CODING, name="Coding")
+        benchmark.add_test(coding)
+
+        assert benchmark.qa_tests == [qa]
+        assert benchmark.coding_tests == [coding]
+        assert benchmark.get_tests_by_type(models.TestType.CODING) == [coding]
+
+    def test_direct_mutation_resyncs(self):
+        """Test that appending to ``tests`` directly is still picked up."""
+        benchmark = Benchmark(id="bench", name="Bench")
+        assert benchmark.qa_tests == []
+
+        qa = QATest(id="qa-1", type=models.TestType.QA, name="QA")
+        benchmark.tests.append(qa)
+
+        assert benchmark.qa_tests == [qa]
+
+
+class TestWorkUnit:
+    """Tests for WorkUnit."""
+
+    def test_to_records_matches_to_dict(self):
+        """Test that columnar records agree with per-unit dicts."""
+        agent = Agent.from_cli("gemini-cli", "gemini-2.0-flash")
+        test = QATest(id="qa-1", type=models.TestType.QA, name="QA")
+        units = [WorkUnit(id=f"wu-{i}", test=test, agent=agent) for i in range(3)]
+        units[0].start()
+        units[0].complete(Result(score=0.5))
+
+        records = WorkUnit.to_records(units)
+
+        assert records["id"] == ["wu-0", "wu-1", "wu-2"]
+        for i, unit in enumerate(units):
+            assert {k: v[i] for k, v in records.items()} == unit.to_dict()
+
+    def test_cost_totals(self):
+        """Test that costs are totalled over units with results only."""
+        agent = Agent.from_cli("gemini-cli", "gemini-2.0-flash")
+        test = QATest(id="qa-1", type=models.TestType.QA, name="QA")
+        units = [WorkUnit(id=f"wu-{i}", test=test, agent=agent) for i in range(3)]
+        units[0].complete(Result(cost=Cost(100, 10, 0.5)))
+        units[1].complete(Result(cost=Cost(50, 5, 0.25)))
+
+        assert WorkUnit.cost_totals(units) == Cost(150, 15, 0.75)
+
+    def test_to_records_empty(self):
+        """Test that no work units still yield every column."""
+        assert WorkUnit.to_records([]) == {c: [] for c in models.WORK_UNIT_COLUMNS}
+
+
+class TestWorkQueue:
+    """Tests for WorkQueue."""
+
+    def test_pops_by_priority_then_insertion_order(self):
+        """Test highest priority first with FIFO ties."""
+        agent = Agent.from_cli("gemini-cli", "gemini-2.0-flash")
+        test = QATest(id="qa-1", type=models.TestType.QA, name="QA")
+        units = [WorkUnit(id=f"wu-{i}", test=test, agent=agent) for i in range(4)]
+        units[2].priority = 10
+
+        queue = WorkQueue(units)
+
+        assert len(queue) == 4
+        assert queue.peek() is units[2]
+        assert [queue.pop().id for _ in range(4)] == ["wu-2", "wu-0", "wu-1", "wu-3"]
+        assert len(queue) == 0
@@ -0,0 +1,108 @@
+"""Tests for the SF-AgentBench event bus."""
+
+from sf_agentbench.events import EventBus, LogEvent, LogLevel, StatusEvent
+
+
+class TestEventBus:
+    """Tests for EventBus."""
+
+    def test_history_keeps_newest_events(self):
+        """Test that the history is capped, dropping the oldest events first."""
+        bus = EventBus(history_size=3)
+        for i in range(5):
+            bus.log_info("worker", f"message {i}")
+
+        assert [e.message for e in bus.get_history()] == ["message 4", "message 3", "message 2"]
+
+        bus.clear_history()
+        assert bus.get_history() == []
+
+    def test_subscribe_and_unsubscribe(self):
+        """Test typed and wildcard dispatch as handlers come and go."""
+        bus = EventBus()
+        logs, everything = [], []
+        assert not bus.is_subscribed(LogEvent)
+        bus.subscribe(LogEvent, logs.append)
+        assert bus.is_subscribed(LogEvent) and not bus.is_subscribed(StatusEvent)
+        bus.subscribe(handler=everything.append)
+        assert bus.is_subscribed(StatusEvent)
+
+        bus.log_info("worker", "started")
+        bus.update_status("unit-1", "running")
+
+        assert [e.message for e in logs] == ["started"]
+        assert [type(e) for e in everything] == [LogEvent, StatusEvent]
+
+        assert bus.unsubscribe(LogEvent, logs.append)
+        assert not bus.unsubscribe(LogEvent, logs.append)
+        assert not bus.unsubscribe(StatusEvent, logs.append)
+        assert bus.unsubscribe(None, everything.append)
+        bus.log_info("worker", "finished")
+
+        assert len(logs) == 1 and len(everything) == 2
+        # Unheard events are still kept in history
+        assert bus.get_history(limit=1)[0].message == "finished"
+
+    def test_async_processing(self):
+        """Test that queued events are published in order and flushed on stop."""
+        bus = EventBus(queue_size=200)
+        seen = []
+        bus.subscribe(LogEvent, lambda e: seen.append(e.message))
+
+        # Queued before the processor starts, so it drains them in batches
+        for i in range(150):
+            bus.publish_async(LogEvent(source="worker", message=str(i)))
+        bus.start_async()
+        bus.stop_async()
+
+        assert seen == [str(i) for i in range(150)]
+        assert len(bus.get_history()) == 150
+        assert not bus._processor_thread.is_alive()
+        bus.stop_async()  # stopping twice is harmless
+
+    def test_unsubscribe_removes_one_registration(self):
+        """Test that a handler subscribed twice is removed one registration at a time."""
+        bus = EventBus()
+        seen = []
+        bus.subscribe(LogEvent, seen.append)
+        bus.subscribe(LogEvent, seen.append)
+
+        assert bus.unsubscribe(LogEvent, seen.append)
+        bus.log_info("worker", "once")
+        assert len(seen) == 1
+
+        assert bus.unsubscribe(LogEvent, seen.append)
+        assert not bus.is_subscribed(LogEvent)
+
+    def test_history_by_type(self):
+        """Test that type-filtered history matches a scan of the full history."""
+        bus = EventBus(history_size=5)
+        for i in range(4):
+            bus.log_info("worker", f"message {i}")
+            bus.update_status(f"unit-{i}", "running")
+
+        logs = bus.get_history(event_type=LogEvent)
+        assert [e.message for e in logs] == ["message 3", "message 2"]
+        assert logs == [e for e in bus.get_history() if isinstance(e, LogEvent)]
+        assert len(bus.get_history(event_type=StatusEvent)) == 3
+        # The index holds no more events than the history itself
+        assert sum(len(index) for index in bus._by_type.values()) == 5
+
+        for i in range(5):
+            bus.update_status(f"unit-{i}", "done")
+        assert LogEvent not in bus._by_type
+        assert bus.get_history(event_type=LogEvent) == []
+
+        bus.clear_history()
+        bus.log_info("worker", "after clear")
+        assert [e.message for e in bus.get_log_history()] == ["after clear"]
+
+    def test_min_log_level(self):
+        """Test that log messages below the minimum level are dropped."""
+        bus = EventBus(min_log_level=LogLevel.WARN)
+        bus.log_debug("worker", "noise")
+        bus.log_info("worker", "progress")
+        bus.log_warn("worker", "slow")
+        bus.log_error("worker", "failed")
+
+        assert [e.message for e in bus.get_log_history()] == ["failed", "slow"]
@@ -0,0 +1,67 @@
+"""Tests for SF-AgentBench functional testing evaluation."""
+
+import pytest
+
+from sf_agentbench.aci import SFRunApexTests
+from sf_agentbench.aci.base import ACIToolResult
+from sf_agentbench.evaluators.functional import FunctionalTestEvaluator
+from sf_agentbench import models
+
+RUNNER_DATA = {
+    "total_tests": 3,
+    "passed": 1,
+    "failed": 2,
+    "pass_rate": 1 / 3,
+    "code_coverage_percent": 82.5,
+    "test_results": [
+        {"class_name": "LeadTest", "method_name": "scores", "status": "pass", "duration_ms": 12},
+        {"class_name": "LeadTest", "method_name": "bulk", "status": "fail", "message": "boom"},
+        {"class_name": "LeadTest", "method_name": "broken", "status": "compilefail"},
+    ],
+}
+
+
+class TestFunctionalTestEvaluator:
+    """Tests for FunctionalTestEvaluator."""
+
+    @pytest.mark.parametrize("trusted", [True, False])
+    def test_test_results(self, trusted, monkeypatch, sample_task):
+        """Test that trusted and validated construction give the same results."""
+        monkeypatch.setattr(
+            SFRunApexTests,
+            "execute",
+            lambda self, **kwargs: ACIToolResult(success=True, data=RUNNER_DATA),
+        )
+        evaluator = FunctionalTestEvaluator(trust_runner_output=trusted)
+
+        result, score = evaluator.evaluate(sample_task, sample_task.path)
+
+        assert score == pytest.approx(1 / 3)
+        assert result.code_coverage == 82.5
+        assert result.test_results == [
+            models.TestMethodResult(
+                class_name="LeadTest", method_name="scores", status="pass", duration_ms=12.0
+            ),
+            models.TestMethodResult(
+                class_name="LeadTest", method_name="bulk", status="fail", message="boom"
+            ),
+            models.TestMethodResult(
+                class_name="LeadTest", method_name="broken", status=models.TestStatus.FAIL
+            ),
+        ]
+
+    def test_verbose_errors_printed_literally(self, monkeypatch, sample_task, capsys):
+        """Test that runner errors are printed as-is, not as markup."""
+        monkeypatch.setattr(
+            SFRunApexTests,
+            "execute",
+            lambda self, **kwargs: ACIToolResult(
+                success=False, errors=["[bold]No such column[/bold]", "Second error"]
+            ),
+        )
+
+        FunctionalTestEvaluator(verbose=True).evaluate(sample_task, sample_task.path)
+
+        out = capsys.readouterr().out
+        assert "[bold]No such column[/bold]" in out
+        assert "Second error" in out
@@ -0,0 +1,156 @@
+"""Tests for SF-AgentBench metadata diffing."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from sf_agentbench.evaluators import metadata_diff
+from sf_agentbench.evaluators.metadata_diff import MetadataDiffEvaluator
+
+FIELD_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<CustomField xmlns="http://soap.sforce.com/2006/04/metadata">
+    <fullName>{name}</fullName>
+    <label>{label}</label>
+    <type>Text</type>
+</CustomField>
+"""
+
+
+def _write_field(root: Path, name: str, label: str) -> None:
+    path = root / "objects" / "Lead" / "fields" / f"{name}.field-meta.xml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(FIELD_XML.format(name=name, label=label))
+
+
+@pytest.fixture
+def metadata_dirs(tmp_path):
+    """Expected and actual trees with one match, one change, one missing."""
+    expected = tmp_path / "expected"
+    actual = tmp_path / "actual"
+    _write_field(expected, "Score__c", "Score")
+    _write_field(actual, "Score__c", "Score")
+    _write_field(expected, "Rating__c", "Rating")
+    _write_field(actual, "Rating__c", "Stars")
+    _write_field(expected, "Missing__c", "Missing")
+    _write_field(actual, "Extra__c", "Extra")
+    return expected, actual
+
+
+class TestMetadataDiffEvaluator:
+    """Tests for MetadataDiffEvaluator."""
+
+    def test_compare_metadata(self, metadata_dirs):
+        """Test matches, differences, missing and extra components."""
+        expected, actual = metadata_dirs
+
+        result = MetadataDiffEvaluator()._compare_metadata(expected, actual)
+
+        prefix = os.path.join("objects", "Lead", "fields", "")
+        assert not result.is_match
+        assert result.accuracy_score == pytest.approx(1 / 3)
+        assert result.missing_components == [prefix + "Missing__c.field-meta.xml"]
+        assert result.extra_components == [prefix + "Extra__c.field-meta.xml"]
+        assert list(result.differences) == [prefix + "Rating__c.field-meta.xml"]
+        assert result.differences[prefix + "Rating__c.field-meta.xml"] == {
+            "/CustomField/label": ("Rating", "Stars")
+        }
+
+    def test_thread_pool_matches_serial(self, metadata_dirs, monkeypatch):
+        """Test that the parallel comparison gives the same result."""
+        expected, actual = metadata_dirs
+        serial = MetadataDiffEvaluator()._compare_metadata(expected, actual)
+
+        monkeypatch.setattr(metadata_diff, "PARALLEL_COMPARE_MIN_FILES", 1)
+        parallel = MetadataDiffEvaluator()._compare_metadata(expected, actual)
+
+        assert parallel == serial
+
+    def test_formatting_and_namespace_are_ignored(self, tmp_path):
+        """Test that indentation, attribute order and xmlns do not matter."""
+        expected = tmp_path / "a.xml"
+        actual = tmp_path / "b.xml"
+        expected.write_text(
+            '<Flow xmlns="http://soap.sforce.com/2006/04/metadata">\n'
+            '    <label b="1" a="2">Score</label>\n'
+            "</Flow>\n"
+        )
+        actual.write_text('<Flow><label a="2" b="1">Score</label></Flow>')
+
+        assert metadata_diff._compare_xml_files(expected, actual)
+
+        actual.write_text('<Flow><label a="2" b="1">Rating</label></Flow>')
+        assert not metadata_diff._compare_xml_files(expected, actual)
+
+    def test_streaming_detects_extra_elements(self, tmp_path):
+        """Test that a trailing extra element is a difference."""
+        expected = tmp_path / "a.xml"
+        actual = tmp_path / "b.xml"
+        expected.write_text("<Flow><label>Score</label></Flow>")
+        actual.write_text("<Flow><label>Score</label><active>true</active></Flow>")
+
+        assert not metadata_diff._xml_equal_streaming(expected.read_bytes(), actual.read_bytes())
+        assert not metadata_diff._compare_xml_files(expected, actual)
+
+    def test_deep_nesting_diff(self, tmp_path):
+        """Test a difference at the deepest level the parser allows."""
+        depth = 250
+        expected = tmp_path / "a.xml"
+        actual = tmp_path / "b.xml"
+        expected.write_text("<a>" * depth + "old" + "</a>" * depth)
+        actual.write_text("<a>" * depth + "new" + "</a>" * depth)
+
+        diffs = metadata_diff._get_xml_diff(expected, actual)
+
+        assert list(diffs.values()) == [("old", "new")]
+        assert next(iter(diffs)).count("/a") == depth
+
+    def test_parallel_parse_matches_serial(self, metadata_dirs, monkeypatch):
+        """Test that parsing a pair on two threads gives the same answers."""
+        expected, actual = metadata_dirs
+        # Reformat a matching file so it is not byte-identical
+        score = actual / "objects" / "Lead" / "fields" / "Score__c.field-meta.xml"
+        score.write_text(score.read_text().replace("    ", "  "))
+        serial = MetadataDiffEvaluator()._compare_metadata(expected, actual)
+
+        monkeypatch.setattr(metadata_diff, "PARALLEL_PARSE_MIN_BYTES", 0)
+        metadata_diff._canon_digest_cached.cache_clear()
+        parallel = MetadataDiffEvaluator()._compare_metadata(expected, actual)
+
+        assert parallel == serial
+        assert metadata_diff._parse_pool_executor is not None
+
+    def test_identical_bytes_skip_parsing(self, tmp_path, monkeypatch):
+        """Test that byte-identical files match without being parsed."""
+        expected = tmp_path / "a.xml"
+        actual = tmp_path / "b.xml"
+        expected.write_text("<Flow><label>Score</label></Flow>")
+        actual.write_text("<Flow><label>Score</label></Flow>")
+
+        def fail(*args):
+            raise AssertionError("parsed")
+
+        monkeypatch.setattr(metadata_diff, "_xml_equal_streaming", fail)
+
+        assert metadata_diff._compare_xml_files(expected, actual)
+
+    def test_directory_symlink_loop(self, tmp_path):
+        """Test that a symlink back up the tree is not followed."""
+        sub = tmp_path / "a" / "sub"
+        sub.mkdir(parents=True)
+        (sub / "Lead.object-meta.xml").write_text("<CustomObject/>")
+        (sub / "loop").symlink_to("..", target_is_directory=True)
+
+        files = metadata_diff._get_metadata_files(tmp_path)
+
+        assert list(files) == [os.path.join("a", "sub", "Lead.object-meta.xml")]
+
+    def test_single_expected_file(self, tmp_path):
+        """Test an expected file against a missing retrieve directory."""
+        expected = tmp_path / "Lead.object-meta.xml"
+        expected.write_text("<CustomObject/>")
+
+        result = MetadataDiffEvaluator()._compare_metadata(expected, tmp_path / "retrieved")
+
+        assert result.missing_components == ["Lead.object-meta.xml"]
+        assert result.accuracy_score == 0.0
@@ -0,0 +1,87 @@
+"""Tests for SF-AgentBench performance metrics."""
+
+import statistics
+
+import pytest
+
+from sf_agentbench.domain.metrics import LatencyMetrics, PerformanceMetrics
+
+
+class TestLatencyMetrics:
+    """Tests for LatencyMetrics."""
+
+    def test_empty(self):
+        """Test that an empty tracker reports zeros."""
+        latency = LatencyMetrics()
+        assert latency.to_dict() == {
+            "count": 0,
+            "total": 0,
+            "mean": 0.0,
+            "median": 0.0,
+            "min": 0.0,
+            "max": 0.0,
+            "stdev": 0.0,
+            "p95": 0.0,
+            "p99": 0.0,
+        }
+
+    def test_statistics(self):
+        """Test summary statistics against the statistics module."""
+        samples = [3.0, 1.0, 4.0, 1.5, 5.0, 9.0, 2.0, 6.0]
+        latency = LatencyMetrics()
+        for sample in samples:
+            latency.add(sample)
+
+        assert latency.count == len(samples)
+        assert latency.total == pytest.approx(sum(samples))
+        assert latency.mean == pytest.approx(statistics.mean(samples))
+        assert latency.median == pytest.approx(statistics.median(samples))
+        assert latency.stdev == pytest.approx(statistics.stdev(samples))
+        assert latency.min == 1.0
+        assert latency.max == 9.0
+
+    def test_stdev_with_large_offset(self):
+        """Test that stdev stays accurate when samples share a large offset."""
+        samples = [1e9 + x for x in (1799.0, 1800.0, 1801.0)]
+        latency = LatencyMetrics()
+        for sample in samples:
+            latency.add(sample)
+
+        assert latency.stdev == pytest.approx(statistics.stdev(samples))
+
+        # Resync after direct edits recomputes the same result
+        latency.samples.append(1e9 + 1800.0)
+        assert latency.stdev == pytest.approx(statistics.stdev(latency.samples))
+
+    def test_percentiles_track_new_samples(self):
+        """Test that percentiles reflect samples added after a read."""
+        latency = LatencyMetrics()
+        for i in range(100):
+            latency.add(float(i))
+
+        assert latency.p95 == 95.0
+        assert latency.p99 == 99.0
+
+        latency.add(1000.0)
+        assert latency.max == 1000.0
+        assert latency.p99 == 99.0
+
+
+class TestPerformanceMetrics:
+    """Tests for PerformanceMetrics."""
+
+    def test_add_result_breakdowns(self):
+        """Test domain and tier breakdowns."""
+        metrics = PerformanceMetrics()
+        metrics.add_result(True, 1.0, domain="apex", tier="tier-1")
+        metrics.add_result(False, 2.0, domain="apex", tier="tier-2")
+        metrics.add_result(True, 3.0, domain="flow")
+
+        assert metrics.accuracy.correct == 2
+        assert metrics.accuracy.incorrect == 1
+        assert metrics.by_domain["apex"].correct == 1
+        assert metrics.by_domain["apex"].incorrect == 1
+        assert metrics.by_domain["flow"].correct == 1
+        assert set(metrics.by_tier) == {"tier-1", "tier-2"}
+        assert metrics.throughput.items_processed == 3
+        assert metrics.latency.count == 3
@@ -0,0 +1,89 @@
+"""Tests for the SF-AgentBench evaluation pipeline."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from sf_agentbench.config import BenchmarkConfig
+from sf_agentbench.evaluators import metadata_diff
+from sf_agentbench.evaluators.pipeline import EvaluationPipeline
+from sf_agentbench.models import (
+    ApexTestResult,
+    DeploymentResult,
+    DeploymentStatus,
+    MetadataDiffResult,
+    RubricResult,
+    StaticAnalysisResult,
+)
+
+
+def _stub_layers(pipeline: EvaluationPipeline, monkeypatch) -> dict[str, str]:
+    """Replace every layer with a canned result, recording each layer's thread."""
+    threads: dict[str, str] = {}
+
+    def layer(result, score):
+        def evaluate(task, work_dir):
+            threads[type(result).__name__] = threading.current_thread().name
+            return result, score
+        return evaluate
+
+    monkeypatch.setattr(
+        pipeline.deployment,
+        "evaluate",
+        lambda task, work_dir: (DeploymentResult(status=DeploymentStatus.SUCCESS), 1.0),
+    )
+    monkeypatch.setattr(pipeline.functional, "evaluate", layer(ApexTestResult(), 0.9))
+    monkeypatch.setattr(pipeline.static_analysis, "evaluate", layer(StaticAnalysisResult(), 0.8))
+    monkeypatch.setattr(pipeline.metadata_diff, "evaluate", layer(MetadataDiffResult(), 0.7))
+    monkeypatch.setattr(pipeline.rubric, "evaluate", layer(RubricResult(), 0.6))
+    return threads
+
+
+class TestEvaluationPipeline:
+    """Tests for EvaluationPipeline."""
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    def test_layer_scores(self, parallel, monkeypatch, sample_task):
+        """Test that layer results land in the same fields either way."""
+        pipeline = EvaluationPipeline(BenchmarkConfig(parallel_layers=parallel))
+        threads = _stub_layers(pipeline, monkeypatch)
+
+        result = pipeline.evaluate(sample_task, sample_task.path)
+
+        assert result.deployment_score == 1.0
+        assert result.test_score == 0.9
+        assert result.static_analysis_score == 0.8
+        assert result.metadata_score == 0.7
+        assert result.rubric_score == 0.6
+        main = threading.current_thread().name
+        assert threads["ApexTestResult"] == main
+        assert (threads["RubricResult"] == main) is not parallel
+
+    def test_parallel_metadata_comparison(self, monkeypatch, sample_task, tmp_path):
+        """Test that the pooled metadata comparison runs inside a layer thread."""
+        expected, actual = tmp_path / "expected", tmp_path / "actual"
+        for root in (expected, actual):
+            for i in range(4):
+                path = root / "objects" / f"Field{i}__c.field-meta.xml"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(f"<CustomField><fullName>Field{i}__c</fullName></CustomField>")
+        (actual / "objects" / "Field0__c.field-meta.xml").write_text(
+            "<CustomField><fullName>Changed__c</fullName></CustomField>"
+        )
+        monkeypatch.setattr(metadata_diff, "PARALLEL_COMPARE_MIN_FILES", 1)
+        pipeline = EvaluationPipeline(BenchmarkConfig(parallel_layers=True))
+        _stub_layers(pipeline, monkeypatch)
+
+        def evaluate(task, work_dir):
+            diff = pipeline.metadata_diff._compare_metadata(expected, actual)
+            return diff, diff.accuracy_score
+
+        monkeypatch.setattr(pipeline.metadata_diff, "evaluate", evaluate)
+
+        result = pipeline.evaluate(sample_task, sample_task.path)
+
+        assert result.metadata_score == pytest.approx(0.75)
+        assert list(result.metadata_diff.differences) == [
+            str(Path("objects") / "Field0__c.field-meta.xml")
+        ]
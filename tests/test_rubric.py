@@ -0,0 +1,533 @@
+"""Tests for SF-AgentBench rubric evaluation."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from sf_agentbench import http
+from sf_agentbench.config import RubricConfig
+from sf_agentbench.evaluators import rubric
+from sf_agentbench.evaluators.rubric import RubricEvaluator
+
+LLM_REPLY = {
+    "criteria": [
+        {"name": "Bulkification", "score": 1.0, "reasoning": "Uses collections"},
+        {"name": "Test Quality", "score": 0.5, "reasoning": "Few asserts"},
+    ],
+    "overall_feedback": "Solid",
+}
+
+
+def _anthropic_stream(text: str) -> httpx.Response:
+    """A streamed Anthropic reply carrying ``text`` in two deltas."""
+    half = len(text) // 2
+    events = [{"type": "message_start"}] + [
+        {"type": "content_block_delta", "delta": {"type": "text_delta", "text": part}}
+        for part in (text[:half], text[half:])
+    ]
+    body = "".join(f"event: {e['type']}\ndata: {json.dumps(e)}\n\n" for e in events)
+    return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+
+def _openai_stream(text: str) -> httpx.Response:
+    """A streamed OpenAI reply carrying ``text`` in one delta."""
+    chunk = {"choices": [{"delta": {"content": text}}]}
+    body = f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n"
+    return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+
+def _anthropic_handler(statuses: list[int]):
+    """Reply with the given statuses in turn, then a successful message."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) <= len(statuses):
+            return httpx.Response(statuses[len(calls) - 1], headers={"retry-after": "0"})
+        return _anthropic_stream(json.dumps(LLM_REPLY))
+
+    return handler, calls
+
+
+@pytest.fixture
+def solution(temp_project):
+    """A project with one Apex class to judge."""
+    classes = temp_project / "force-app" / "main" / "default" / "classes"
+    classes.mkdir()
+    (classes / "LeadScorer.cls").write_text("public class LeadScorer {}")
+    return temp_project
+
+
+@pytest.fixture
+def evaluator(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    return RubricEvaluator(RubricConfig(provider="anthropic"))
+
+
+class TestRubricEvaluator:
+    """Tests for RubricEvaluator."""
+
+    def test_retries_rate_limits(self, evaluator, solution, sample_task, monkeypatch):
+        """Test that 429 and 5xx replies are retried on the shared client."""
+        handler, calls = _anthropic_handler([429, 503])
+        monkeypatch.setattr(http, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+
+        result, score = evaluator.evaluate(sample_task, solution)
+
+        assert len(calls) == 3
+        assert calls[0].headers["x-api-key"] == "test-key"
+        assert [c.name for c in result.criteria] == ["Bulkification", "Test Quality"]
+        assert score == pytest.approx((1.0 * 0.25 + 0.5 * 0.20) / 0.45)
+
+    def test_client_error_falls_back_to_heuristics(
+        self, evaluator, solution, sample_task, monkeypatch
+    ):
+        """Test that a non-retryable error is not retried."""
+        handler, calls = _anthropic_handler([400])
+        monkeypatch.setattr(http, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+
+        result, _ = evaluator.evaluate(sample_task, solution)
+
+        assert len(calls) == 1
+        assert "heuristic" in result.feedback
+
+    async def test_evaluate_async(self, evaluator, solution, sample_task):
+        """Test the async path on the evaluator's own client."""
+        handler, calls = _anthropic_handler([502])
+        evaluator._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        result, score = await evaluator.evaluate_async(sample_task, solution)
+        await evaluator.aclose()
+
+        assert len(calls) == 2
+        assert len(result.criteria) == 2
+        assert evaluator._client is None
+
+    def test_collect_code_single_walk(self, solution):
+        """Test code ordering, metadata skipping and cache refresh on change."""
+        default = solution / "force-app" / "main" / "default"
+        (default / "classes" / "LeadScorer.cls-meta.xml").write_text("<ApexClass/>")
+        flows = default / "flows"
+        flows.mkdir()
+        (flows / "Lead_Scoring.flow-meta.xml").write_text("<Flow/>")
+        trigger = default / "triggers" / "LeadTrigger.trigger"
+        trigger.parent.mkdir()
+        trigger.write_text("trigger LeadTrigger on Lead (before insert) {}")
+
+        code = RubricEvaluator()._collect_code(solution)
+
+        assert code.index("LeadScorer.cls") < code.index("LeadTrigger") < code.index("<Flow/>")
+        assert "<ApexClass/>" not in code
+
+        trigger.unlink()
+        assert "LeadTrigger" not in RubricEvaluator()._collect_code(solution)
+
+    def test_collect_code_skips_hidden_dirs(self, solution):
+        """Test that hidden directories are not walked."""
+        hidden = solution / "force-app" / "main" / "default" / "lwc" / ".cache"
+        hidden.mkdir(parents=True)
+        (hidden / "bundle.js").write_text("cached()")
+
+        assert "cached()" not in RubricEvaluator()._collect_code(solution)
+
+    def test_collect_code_persistent_cache(self, solution, tmp_path, monkeypatch):
+        """Test that unchanged files are not read again in a later run."""
+        config = RubricConfig(cache_enabled=True, cache_dir=tmp_path / "code-cache")
+        first = RubricEvaluator(config)._collect_code(solution)
+
+        rubric._read_code.cache_clear()
+        monkeypatch.setattr(rubric, "_read_head", lambda path, limit: pytest.fail("read"))
+        assert RubricEvaluator(config)._collect_code(solution) == first
+        assert len(list((tmp_path / "code-cache" / "code").glob("*.json"))) == 1
+
+        monkeypatch.undo()
+        scorer = solution / "force-app" / "main" / "default" / "classes" / "LeadScorer.cls"
+        scorer.write_text("public class LeadScorer { void score() {} }")
+        assert "score()" in RubricEvaluator(config)._collect_code(solution)
+
+    def test_heuristic_token_scan(self, monkeypatch):
+        """Test overlapping tokens and the record ID shape check."""
+        code = (
+            "public class LeadScorer {\n"
+            "    // Score leads in bulk\n"
+            "    for(Lead lead : [SELECT Id FROM Lead]) { update lead; }\n"
+            "}\n"
+        )
+        features = rubric._scan_features(code)
+
+        expected = rubric._feature_mask("public class", "for(", "for", "[select", "update ", "//")
+        assert features & expected == expected
+        assert not features & rubric._feature_mask("for (", "@istest")
+        assert rubric._SALESFORCE_ID_RE.search(code) is None
+        assert rubric._SALESFORCE_ID_RE.search("Id ownerId = '005000000000001AAA';")
+
+        # The optional Aho-Corasick scan agrees with the regex scan, which
+        # reports only the longest token at each position
+        monkeypatch.setattr(rubric, "_HEURISTIC_AUTOMATON", None)
+        assert rubric._scan_features(code) == features
+
+        result = RubricEvaluator()._heuristic_evaluation(code, [])
+        scores = {c.name: c.score for c in result.criteria}
+        assert scores["Bulkification"] == 0.0
+        assert scores["Security Best Practices"] == pytest.approx(0.6)
+
+    def test_collect_code_budget(self, solution):
+        """Test that collection stops at ``max_prompt_chars``."""
+        classes = solution / "force-app" / "main" / "default" / "classes"
+        (classes / "Big.cls").write_text("x" * 5000)
+
+        unbounded = RubricEvaluator(RubricConfig(max_prompt_chars=100_000))._collect_code(solution)
+        code = RubricEvaluator(RubricConfig(max_prompt_chars=100))._collect_code(solution)
+
+        assert len(code) == 100
+        assert code == unbounded[:100]
+
+    def test_heuristic_results_are_memoized(self):
+        """Test that repeated heuristic runs reuse the cached result."""
+        rubric._heuristic_result.cache_clear()
+        evaluator = RubricEvaluator()
+        code = "public class LeadScorer { // scores\n}"
+
+        first = evaluator._heuristic_evaluation(code, rubric.DEFAULT_RUBRIC)
+        first.feedback = "changed"
+        second = evaluator._heuristic_evaluation(code, rubric.DEFAULT_RUBRIC)
+
+        assert rubric._heuristic_result.cache_info().hits == 1
+        assert second.feedback != "changed"
+        assert second.criteria == first.criteria
+
+    def test_scan_tokens_across_chunks(self, monkeypatch):
+        """Test that a token split by a scan chunk boundary is still found."""
+        monkeypatch.setattr(rubric, "_SCAN_CHUNK_CHARS", 8)
+        code = "x" * 5 + "System.assertEquals(1, 1);"
+
+        assert rubric._scan_features(code) & rubric._feature_mask("system.assert")
+
+    def test_chunked_evaluation(self, monkeypatch, solution, sample_task):
+        """Test that oversized code is judged in chunks and scores averaged by size."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        classes = solution / "force-app" / "main" / "default" / "classes"
+        (classes / "LeadScorer.cls").write_text("x" * 36 + "\n" + "y" * 116 + "\n")
+        replies = iter([1.0, 0.0])
+        prompts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            prompts.append(json.loads(request.content)["messages"][0]["content"])
+            reply = {"criteria": [{"name": "Bulkification", "score": next(replies)}]}
+            return _anthropic_stream(json.dumps(reply))
+
+        monkeypatch.setattr(http, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+        config = RubricConfig(provider="anthropic", chunk_tokens=32)
+
+        result, score = RubricEvaluator(config).evaluate(sample_task, solution)
+
+        # Header and first line estimated at 6 + 10 tokens, the second at 30
+        assert len(prompts) == 2
+        assert "x" * 36 in prompts[0] and "y" * 116 in prompts[1]
+        assert [c.name for c in result.criteria] == ["Bulkification"]
+        assert score == pytest.approx(16 / 46)
+
+    def test_stored_api_key_looked_up_once(self, monkeypatch):
+        """Test that stored credentials are read once, after the environment."""
+        from sf_agentbench.agents import auth
+
+        calls = []
+        monkeypatch.setattr(auth, "get_anthropic_credentials", lambda: calls.append(1) or "stored")
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        rubric._stored_api_key.cache_clear()
+
+        assert rubric._get_api_key("anthropic") == "stored"
+        assert rubric._get_api_key("Anthropic") == "stored"
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "env-key")
+        assert rubric._get_api_key("anthropic") == "env-key"
+        assert len(calls) == 1
+        rubric._stored_api_key.cache_clear()
+
+    def test_criterion_weights(self):
+        """Test case-insensitive weight lookup with a default for unknown names."""
+        data = {
+            "criteria": [
+                {"name": "bulkification", "score": 1.0},
+                {"name": "Style", "score": 0.0},
+            ]
+        }
+
+        result = RubricEvaluator()._result_from_data(data, rubric.DEFAULT_RUBRIC)
+
+        assert [c.weight for c in result.criteria] == [0.25, rubric.DEFAULT_CRITERION_WEIGHT]
+
+    def test_stream_stops_once_verdict_is_complete(self):
+        """Test that the stream is not read past the end of the verdict JSON."""
+        reply = json.dumps(LLM_REPLY)
+        deltas = ["Here you go:\n", reply[:20], reply[20:], " Anything else?", " More."]
+        lines = iter(
+            f"data: {json.dumps({'choices': [{'delta': {'content': d}}]})}" for d in deltas
+        )
+
+        text = rubric._read_stream(lines, rubric._openai_delta)
+
+        assert rubric._extract_json(text) == LLM_REPLY
+        assert "Anything else" not in text
+        assert len(list(lines)) == 2
+
+    def test_stream_disabled(self, monkeypatch, solution, sample_task):
+        """Test that with streaming off the reply is read as one JSON body."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        bodies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append(json.loads(request.content))
+            return httpx.Response(
+                200, json={"content": [{"type": "text", "text": json.dumps(LLM_REPLY)}]}
+            )
+
+        monkeypatch.setattr(http, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+        evaluator = RubricEvaluator(RubricConfig(provider="anthropic", stream=False))
+
+        result, _ = evaluator.evaluate(sample_task, solution)
+
+        assert "stream" not in bodies[0]
+        assert len(result.criteria) == 2
+
+    def test_structured_output(self, monkeypatch, solution, sample_task):
+        """Test that Anthropic is made to call the verdict tool and its input is used."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        bodies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append(json.loads(request.content))
+            return httpx.Response(
+                200, json={"content": [{"type": "tool_use", "name": "x", "input": LLM_REPLY}]}
+            )
+
+        monkeypatch.setattr(http, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+        evaluator = RubricEvaluator(RubricConfig(provider="anthropic", stream=False))
+
+        result, _ = evaluator.evaluate(sample_task, solution)
+
+        assert bodies[0]["tool_choice"] == {"type": "tool", "name": rubric.VERDICT_TOOL_NAME}
+        assert bodies[0]["tools"][0]["input_schema"] == rubric._VERDICT_SCHEMA
+        assert [c.name for c in result.criteria] == ["Bulkification", "Test Quality"]
+
+        event = {"type": "content_block_delta", "delta": {"partial_json": '{"criteria": []}'}}
+        assert rubric._read_stream(iter([f"data: {json.dumps(event)}"]), rubric._anthropic_delta)
+
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        openai = RubricEvaluator(RubricConfig(provider="openai", model="gpt-4o"))
+        _, _, body, _ = openai._build_request("Judge this", schema=rubric._VERDICT_SCHEMA)
+        assert body["response_format"]["json_schema"]["schema"] == rubric._VERDICT_SCHEMA
+
+        # gpt-4-turbo rejects strict JSON Schema response formats
+        _, _, body, _ = openai._build_request(
+            "Judge this", model="gpt-4-turbo", schema=rubric._VERDICT_SCHEMA
+        )
+        assert "response_format" not in body
+
+        openai.config.structured_output = False
+        _, _, body, _ = openai._build_request("Judge this", schema=rubric._VERDICT_SCHEMA)
+        assert "response_format" not in body
+
+    def test_extract_json(self):
+        """Test JSON extraction from prose, fences and stray braces."""
+        reply = json.dumps(LLM_REPLY)
+
+        assert rubric._extract_json(reply) == LLM_REPLY
+        assert rubric._extract_json(f"Use {{braces}} wisely.\n{reply}\nDone {{}}") == LLM_REPLY
+        assert rubric._extract_json(f'Example: {{"a": 1}}\n```json\n{reply}\n```') == LLM_REPLY
+        assert rubric._extract_json("No verdict {" + "x" * 10_000) is None
+        assert rubric._extract_json(f"{reply} and then {{}}") == LLM_REPLY
+
+    def test_evaluate_batch(self, evaluator, solution, sample_task, monkeypatch):
+        """Test one request for several solutions with a cached system prompt."""
+        reply = {
+            "evaluations": [
+                {"task": 2, "criteria": [{"name": "Bulkification", "score": 0.2}]},
+                {"task": 1, "criteria": [{"name": "Bulkification", "score": 0.8}]},
+            ]
+        }
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(json.loads(request.content))
+            return _anthropic_stream(json.dumps(reply))
+
+        monkeypatch.setattr(http, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+
+        results = evaluator.evaluate_batch([sample_task] * 3, [solution] * 3, batch_size=2)
+
+        assert len(calls) == 2
+        assert calls[0]["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert "## Task 2" in calls[0]["messages"][0]["content"]
+        # Matched by task number; out-of-range numbers fall back to list position
+        assert [score for _, score in results] == [0.8, 0.2, 0.2]
+
+    def test_collect_code_parallel_reads(self, solution, monkeypatch):
+        """Test that reading on a thread pool gives the same code."""
+        classes = solution / "force-app" / "main" / "default" / "classes"
+        for i in range(10):
+            (classes / f"Helper{i}.cls").write_text(f"public class Helper{i} {{}}")
+        serial = RubricEvaluator()._collect_code(solution)
+
+        monkeypatch.setattr(rubric, "PARALLEL_READ_MIN_FILES", 1)
+        rubric._read_code.cache_clear()
+
+        assert RubricEvaluator()._collect_code(solution) == serial
+        assert RubricEvaluator(RubricConfig(max_prompt_chars=50))._collect_code(solution) == (
+            serial[:50]
+        )
+
+    async def test_evaluate_async_concurrency_limit(self, monkeypatch, solution, sample_task):
+        """Test that gathered evaluations respect ``max_concurrency``."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        evaluator = RubricEvaluator(RubricConfig(provider="anthropic", max_concurrency=2))
+        in_flight = []
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal peak
+            in_flight.append(request)
+            peak = max(peak, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return _anthropic_stream(json.dumps(LLM_REPLY))
+
+        evaluator._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        results = await asyncio.gather(
+            *[evaluator.evaluate_async(sample_task, solution) for _ in range(6)]
+        )
+        await evaluator.aclose()
+
+        assert len(results) == 6
+        assert peak == 2
+
+    def test_response_cache(self, monkeypatch, solution, sample_task, tmp_path):
+        """Test that an identical prompt is answered from the cache."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        handler, calls = _anthropic_handler([])
+        monkeypatch.setattr(http, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+        cache_dir = tmp_path / "rubric-cache"
+        config = RubricConfig(provider="anthropic", cache_enabled=True, cache_dir=cache_dir)
+
+        first, _ = RubricEvaluator(config).evaluate(sample_task, solution)
+        second, _ = RubricEvaluator(config).evaluate(sample_task, solution)
+
+        assert len(calls) == 1
+        assert second == first
+        assert len(list(cache_dir.glob("*.json"))) == 1
+
+        config.model = "claude-opus-4-20250514"
+        RubricEvaluator(config).evaluate(sample_task, solution)
+        assert len(calls) == 2
+
+    def test_provider_fallback_and_circuit_breaker(self, monkeypatch, solution, sample_task):
+        """Test that a failing provider falls back, then is skipped once its breaker opens."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.setattr(rubric, "LLM_MAX_ATTEMPTS", 1)
+        hosts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            hosts.append(request.url.host)
+            if request.url.host == "api.anthropic.com":
+                return httpx.Response(503)
+            return _openai_stream(json.dumps(LLM_REPLY))
+
+        monkeypatch.setattr(http, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+        evaluator = RubricEvaluator(RubricConfig(provider="anthropic", fallback_models=["gpt-4o"]))
+
+        for _ in range(rubric.BREAKER_FAILURE_THRESHOLD + 1):
+            result, _ = evaluator.evaluate(sample_task, solution)
+            assert len(result.criteria) == 2
+
+        threshold = rubric.BREAKER_FAILURE_THRESHOLD
+        assert hosts.count("api.anthropic.com") == threshold
+        assert hosts.count("api.openai.com") == threshold + 1
+
+    def test_anthropic_batch_api(self, evaluator, monkeypatch, solution, sample_task):
+        """Test submit, poll and result mapping for an Anthropic message batch."""
+        batches = "https://api.anthropic.com/v1/messages/batches"
+        evaluator.config.use_batch_api = True
+        evaluator.config.batch_poll_seconds = 0
+        polls = []
+        submitted = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            url = str(request.url)
+            if request.method == "POST":
+                submitted.update(json.loads(request.content))
+                return httpx.Response(200, json={"id": "b1", "processing_status": "in_progress"})
+            if url == f"{batches}/b1":
+                polls.append(url)
+                status = "ended" if len(polls) > 1 else "in_progress"
+                return httpx.Response(
+                    200,
+                    json={"id": "b1", "processing_status": status, "results_url": f"{url}/results"},
+                )
+            message = {"content": [{"type": "text", "text": json.dumps(LLM_REPLY)}]}
+            lines = [
+                {"custom_id": "task-1", "result": {"type": "succeeded", "message": message}},
+                {"custom_id": "task-0", "result": {"type": "errored"}},
+            ]
+            return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+
+        monkeypatch.setattr(http, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+
+        results = evaluator.evaluate_batch([sample_task] * 2, [solution] * 2)
+
+        assert [r["custom_id"] for r in submitted["requests"]] == ["task-0", "task-1"]
+        assert len(polls) == 2
+        assert "heuristic" in results[0][0].feedback
+        assert len(results[1][0].criteria) == 2
+
+    def test_openai_batch_api(self, monkeypatch, solution, sample_task):
+        """Test file upload, batch creation and output download for OpenAI."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        config = RubricConfig(model="gpt-4o", use_batch_api=True, batch_poll_seconds=0)
+        paths = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            paths.append((request.method, request.url.path))
+            if request.url.path == "/v1/files":
+                assert b'"custom_id": "task-0"' in request.content
+                return httpx.Response(200, json={"id": "file-in"})
+            if request.method == "POST":
+                assert json.loads(request.content)["input_file_id"] == "file-in"
+                return httpx.Response(200, json={"id": "batch-1", "status": "validating"})
+            if request.url.path == "/v1/batches/batch-1":
+                return httpx.Response(
+                    200, json={"id": "batch-1", "status": "completed", "output_file_id": "file-out"}
+                )
+            body = {"choices": [{"message": {"content": json.dumps(LLM_REPLY)}}]}
+            line = {"custom_id": "task-0", "response": {"status_code": 200, "body": body}}
+            return httpx.Response(200, text=json.dumps(line))
+
+        monkeypatch.setattr(http, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+
+        [(result, _)] = RubricEvaluator(config).evaluate_batch([sample_task], [solution])
+
+        assert len(result.criteria) == 2
+        assert paths[-1] == ("GET", "/v1/files/file-out/content")
+
+    def test_batch_api_timeout_cancels_and_falls_back(self, monkeypatch, solution, sample_task):
+        """Test that a batch past the timeout is cancelled and scored heuristically."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        config = RubricConfig(
+            model="gpt-4o", use_batch_api=True, batch_poll_seconds=0, batch_timeout_seconds=0
+        )
+        paths = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            paths.append((request.method, request.url.path))
+            if request.url.path == "/v1/files":
+                return httpx.Response(200, json={"id": "file-in"})
+            return httpx.Response(200, json={"id": "batch-1", "status": "in_progress"})
+
+        monkeypatch.setattr(http, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+
+        [(result, _)] = RubricEvaluator(config).evaluate_batch([sample_task], [solution])
+
+        assert paths[-1] == ("POST", "/v1/batches/batch-1/cancel")
+        assert "heuristic" in result.feedback
@@ -0,0 +1,43 @@
+"""Tests for SF-AgentBench static analysis evaluation."""
+
+import pytest
+
+from sf_agentbench.aci import SFScanCode
+from sf_agentbench.aci.base import ACIToolResult
+from sf_agentbench.evaluators.static_analysis import StaticAnalysisEvaluator
+
+SCANNER_DATA = {
+    "total_violations": 2,
+    "critical_count": 1,
+    "low_count": 1,
+    "penalty_score": 0.08,
+    "violations": [
+        {"rule": "ApexCRUDViolation", "severity": "critical", "file": "Lead.cls", "line": 4},
+        {"rule": "ApexDoc", "severity": "low", "file": "Lead.cls", "line": 1},
+    ],
+}
+
+
+class TestStaticAnalysisEvaluator:
+    """Tests for StaticAnalysisEvaluator."""
+
+    @pytest.mark.parametrize("keep", [True, False])
+    def test_violations_kept_on_request(self, keep, monkeypatch, sample_task, capsys):
+        """Test that counts and verbose output do not depend on keeping violations."""
+        monkeypatch.setattr(
+            SFScanCode,
+            "execute",
+            lambda self, **kwargs: ACIToolResult(success=True, data=SCANNER_DATA),
+        )
+        evaluator = StaticAnalysisEvaluator(verbose=True, keep_violations=keep)
+
+        result, score = evaluator.evaluate(sample_task, sample_task.path)
+
+        assert score == pytest.approx(0.92)
+        assert result.total_violations == 2
+        assert [v.rule for v in result.violations] == (
+            ["ApexCRUDViolation", "ApexDoc"] if keep else []
+        )
+        out = capsys.readouterr().out
+        assert "critical: ApexCRUDViolation at Lead.cls:4" in out
+        assert "ApexDoc" not in out
@@ -0,0 +1,77 @@
+"""Tests for SF-AgentBench task discovery."""
+
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from sf_agentbench.cli import list_tasks
+from sf_agentbench.config import BenchmarkConfig
+from sf_agentbench.harness import TaskLoader
+from sf_agentbench.models import TaskTier
+
+
+def _write_task(tasks_dir: Path, tier: str, task_id: str) -> Path:
+    task_dir = tasks_dir / tier / task_id
+    task_dir.mkdir(parents=True)
+    (task_dir / "task.yaml").write_text(f"id: {task_id}\nname: {task_id}\ntier: {tier}\n")
+    return task_dir
+
+
+class TestTaskLoader:
+    """Tests for TaskLoader."""
+
+    def test_discover_tasks_sorted_by_tier(self, tmp_path):
+        """Test that discovered tasks are sorted by tier then id."""
+        _write_task(tmp_path, "tier-2", "b-task")
+        _write_task(tmp_path, "tier-1", "z-task")
+        _write_task(tmp_path, "tier-2", "a-task")
+
+        loader = TaskLoader(tmp_path)
+        tasks = loader.discover_tasks()
+
+        assert [t.id for t in tasks] == ["z-task", "a-task", "b-task"]
+        assert tasks[0].tier == TaskTier.TIER_1
+
+    def test_list_tasks_command_sorted_by_tier(self, tmp_path):
+        """Test that the list-tasks table is ordered by tier then id."""
+        # Directory names disagree with the declared tiers, so walk order
+        # alone would list a-task first
+        for folder, tier, task_id in (("a", "tier-2", "a-task"), ("b", "tier-1", "b-task")):
+            task_dir = tmp_path / folder / task_id
+            task_dir.mkdir(parents=True)
+            (task_dir / "task.yaml").write_text(
+                f"id: {task_id}\nname: {task_id}\ntier: {tier}\n"
+            )
+
+        config = BenchmarkConfig(tasks_dir=tmp_path)
+        result = CliRunner().invoke(list_tasks, obj={"config": config})
+
+        assert result.exit_code == 0, result.output
+        positions = [result.output.index(t) for t in ("b-task", "a-task")]
+        assert positions == sorted(positions)
+
+    def test_nested_task_yaml_is_ignored(self, tmp_path):
+        """Test that task directories are not searched for further tasks."""
+        task_dir = _write_task(tmp_path, "tier-1", "outer")
+        _write_task(task_dir, "tier-1", "inner")
+
+        loader = TaskLoader(tmp_path)
+
+        assert [t.id for t in loader.iter_tasks()] == ["outer"]
+
+    def test_missing_tasks_dir(self, tmp_path):
+        """Test discovery on a directory that does not exist."""
+        loader = TaskLoader(tmp_path / "missing")
+        assert loader.discover_tasks() == []
+        assert loader.get_task("anything") is None
+
+    def test_get_task_readme_truncates_and_caches(self, sample_task):
+        """Test README truncation and per-loader caching."""
+        loader = TaskLoader(sample_task.path.parent)
+
+        full = loader.get_task_readme(sample_task)
+        assert "This is a test task" in full
+        assert loader.get_task_readme(sample_task, max_chars=10) == full[:10]
+
+        (sample_task.path / "README.md").unlink()
+        assert loader.get_task_readme(sample_task) == full